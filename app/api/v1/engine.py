@@ -1,5 +1,9 @@
 from fastapi import APIRouter, HTTPException, Request
 
+from app.services.spotify.cache import CachedSpotifyService
+from app.services.strategy_cache import CachedStrategyManager
+from app.strategies.chain import StrategyChain
+
 router = APIRouter(prefix="/v1/engine", tags=["Engine"])
 
 @router.get("/status", summary="Get the current status of the SyncStream Engine")
@@ -7,12 +11,20 @@ async def get_engine_status(request: Request):
     """Retrieve the current status of the SyncStream Engine."""
     engine = request.app.state.engine
     try:
+        strategy = getattr(getattr(engine, 'strategy_resolver', None), 'strategy', None)
         active_strategy = await engine.strategy_manager.get_active_strategy()
         return {
             "active_strategy_id": active_strategy.id,
             "is_running": not engine._stop_event.is_set(),
             "last_evaluation": engine.last_evaluation if hasattr(engine, 'last_evaluation') else None,
             "current_track": engine.current_track if hasattr(engine, 'current_track') else None,
+            "polls_avoided": engine.polls_avoided if hasattr(engine, 'polls_avoided') else None,
+            "features_cache": engine.spotify.stats.as_dict() if isinstance(getattr(engine, 'spotify', None), CachedSpotifyService) else None,
+            "strategy_chain": strategy.as_dict() if isinstance(strategy, StrategyChain) else None,
+            "skips": engine.skip_stats.as_dict() if hasattr(engine, 'skip_stats') else None,
+            "decisions": engine.decision_cache.stats.as_dict() if getattr(engine, 'decision_cache', None) else None,
+            "decision_log": engine.decision_log.stats.as_dict() if getattr(engine, 'decision_log', None) else None,
+            "strategy_cache": engine.strategy_manager.stats.as_dict() if isinstance(engine.strategy_manager, CachedStrategyManager) else None,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2,11 +2,15 @@ from typing import List
 
 from fastapi import APIRouter, HTTPException
 
+from app.core.config import settings
 from app.models.strategy import StrategyConfig, ActiveStrategyUpdate
+from app.services.strategy_cache import CachedStrategyManager
 from app.services.strategy_manager import StrategyManager
 
 router = APIRouter(prefix="/v1/strategies", tags=["strategies"])
-manager = StrategyManager()
+# Shared with the engine; the app lifespan keeps the cached snapshot subscribed to changes
+manager = (CachedStrategyManager(settings.STRATEGY_CACHE_RECONNECT_INTERVAL) if settings.STRATEGY_CACHE_ENABLED
+           else StrategyManager())
 
 @router.get("/", response_model=List[StrategyConfig], summary="Get all strategies")
 async def get_strategies():
@@ -31,7 +35,7 @@ async def set_active_strategy(payload: ActiveStrategyUpdate):
         await manager.set_active_strategy(payload.id)
         return await manager.get_active_strategy()
     except ValueError as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.put("/{strategy_id}", response_model=StrategyConfig, summary="Update a strategy")
 async def update_strategy(strategy_id: str, payload: StrategyConfig):
@@ -41,6 +45,11 @@ async def update_strategy(strategy_id: str, payload: StrategyConfig):
             raise HTTPException(status_code=400, detail="Strategy ID in path and payload do not match")
         await manager.upsert_strategy(payload)
         return payload
+    except HTTPException:
+        raise
+    except ValueError as e:
+        # e.g. a chain whose members do not exist
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,74 @@
+import asyncio
+import heapq
+import itertools
+from typing import Awaitable, Callable, Coroutine, Iterable
+
+Clock = Callable[[], float]
+Sleep = Callable[[float], Awaitable[None]]
+
+
+class VirtualClock:
+    """
+    Simulated monotonic time for replays and load tests.
+    Tasks started with `run` sleep through `sleep`; once every one of them is asleep, time
+    jumps straight to the earliest wake-up, so hours of polling run as fast as the code
+    between sleeps. Sleepers due at the same time wake in the order they went to sleep,
+    which makes runs deterministic.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self._sleepers: list[tuple[float, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._running = 0
+        self._idle = asyncio.Event()
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + max(delay, 0.0), next(self._order), future))
+        self._check_idle()
+        await future
+
+    def _check_idle(self):
+        if len(self._sleepers) >= self._running:
+            self._idle.set()
+
+    def _task_done(self, _: asyncio.Task):
+        self._running -= 1
+        self._check_idle()
+
+    async def run(self, coroutines: Iterable[Coroutine], until: float):
+        """
+        Runs the coroutines on virtual time until they all return or the clock reaches `until`,
+        then cancels the ones still sleeping
+        """
+        tasks = [asyncio.create_task(coroutine) for coroutine in coroutines]
+        self._running += len(tasks)
+        self._idle.clear()
+        for task in tasks:
+            task.add_done_callback(self._task_done)
+        try:
+            while self._running:
+                # Every task is asleep (or done): nothing else can happen before the next wake-up
+                await self._idle.wait()
+                self._idle.clear()
+                if not self._running:
+                    break
+                if not self._sleepers or self._sleepers[0][0] > until:
+                    self.now = max(self.now, until)
+                    break
+                self.now = max(self.now, self._sleepers[0][0])
+                while self._sleepers and self._sleepers[0][0] <= self.now:
+                    heapq.heappop(self._sleepers)[2].set_result(None)
+        finally:
+            for task in tasks:
+                task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            self._sleepers = [sleeper for sleeper in self._sleepers if not sleeper[2].done()]
+            heapq.heapify(self._sleepers)
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            raise errors[0]
@@ -8,18 +8,79 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Spotify SyncStream Architect"
     DEBUG: bool = False
     LOG_LEVEL: str = "INFO"
+    LOG_MODE: str = "dev"  # "dev" or "production" (background writer, event sampling, cached callsites)
+    LOG_CALLSITE: Optional[str] = None  # "full", "cached" or "off", defaults to "full" in dev and "cached" in production
+    LOG_EVENT_RATE: float = 5.0  # in events/second per event at INFO and below, production mode only, 0 disables
+    LOG_QUEUE_SIZE: int = 10_000  # lines buffered by the production writer, further lines are dropped
+
+    # Metrics Settings
+    METRICS_ENABLED: bool = True  # engine/Spotify/Redis instrumentation, rendered at /metrics
+    METRICS_LOOP_LAG_INTERVAL: float = 0.5  # in seconds, event loop lag sampling period
+
+    # Storage Settings
+    STORAGE_BACKEND: str = "redis"  # "redis", or "memory" for a single node without a Redis server
+    STORAGE_SNAPSHOT_PATH: Optional[str] = None  # memory backend only, persist the state to this file
+    STORAGE_SNAPSHOT_INTERVAL: float = 30.0  # in seconds, memory backend only
 
     # Redis Settings
     REDIS_URL: RedisDsn = "redis://localhost:6379/0"
+    REDIS_BINARY_CODECS: bool = True  # write strategies/features as msgpack/struct, False keeps JSON/text (both stay readable)
 
     # Spotify Settings
     SPOTIFY_CLIENT_ID: Optional[str] = None
     SPOTIFY_CLIENT_SECRET: Optional[str] = None
     SPOTIFY_REFRESH_TOKEN: Optional[str] = None
     SPOTIFY_MOCK_MODE: bool = True
+    SPOTIFY_TOKEN_REFRESH_MARGIN: float = 60.0  # in seconds, refresh this long before the token expires
+    SPOTIFY_HTTP_MAX_CONNECTIONS: int = 100
+    SPOTIFY_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    SPOTIFY_HTTP_KEEPALIVE_EXPIRY: float = 30.0  # in seconds
+    SPOTIFY_HTTP2: bool = False  # requires the 'h2' package (httpx[http2])
+    SPOTIFY_HTTP_TIMEOUT: float = 10.0  # in seconds
+    SPOTIFY_RATE_LIMIT_PER_SECOND: float = 10.0  # client-side request budget, 0 disables the limiter
+    SPOTIFY_RATE_LIMIT_BURST: int = 20
+    SPOTIFY_RATE_LIMIT_SHARED: bool = True  # share the budget between workers through Redis
+    SPOTIFY_MAX_RETRIES: int = 3  # retries of a rate limited (429) request
+    SPOTIFY_FEATURES_BATCHING: bool = True  # coalesce concurrent audio features lookups
+    SPOTIFY_FEATURES_BATCH_WINDOW_MS: float = 5.0  # max latency added to a lone lookup
+    SPOTIFY_RECORDING_PATH: Optional[str] = None  # append playback/features to this file, for benchmarks.replay
+
+    # Audio Features Cache Settings
+    FEATURES_CACHE_SIZE: int = 10_000  # in-process LRU entries, 0 disables the cache
+    FEATURES_CACHE_REDIS: bool = True  # share cached features between workers through the storage backend
+    FEATURES_CACHE_TTL: int = 30 * 24 * 3600  # in seconds
+    FEATURES_CACHE_NEGATIVE_TTL: int = 3600  # in seconds, for tracks without audio features
+
+    # Decision Cache Settings (keep/skip verdicts by track and strategy config)
+    DECISION_CACHE_SIZE: int = 50_000  # in-process LRU entries, 0 disables the cache
+    DECISION_CACHE_REDIS: bool = True  # share verdicts between workers through the storage backend
+    DECISION_CACHE_TTL: int = 7 * 24 * 3600  # in seconds
+
+    # Decision Log Settings (Redis Stream of every evaluation, read through consumer groups)
+    DECISION_LOG_ENABLED: bool = True  # redis storage backend only
+    DECISION_LOG_MAX_LENGTH: int = 1_000_000  # approximate (MAXLEN ~) cap on the stream entries
+    DECISION_LOG_BATCH_SIZE: int = 256  # entries written per pipelined round trip
+    DECISION_LOG_FLUSH_INTERVAL: float = 0.5  # in seconds, max time an entry waits in the buffer
+    DECISION_LOG_BUFFER_SIZE: int = 10_000  # entries held while Redis is slow or down, further ones are dropped
+
+    # Strategy Catalog Cache (in-process snapshot, kept coherent through strategies:changes)
+    STRATEGY_CACHE_ENABLED: bool = True
+    STRATEGY_CACHE_RECONNECT_INTERVAL: float = 1.0  # in seconds, between resubscription attempts
 
     # Engine Settings
     ENGINE_POLL_INTERVAL: int = 5  # in seconds
+    ENGINE_POLL_MODE: str = "fixed"  # "fixed" or "adaptive" (track-boundary aware)
+    ENGINE_MIN_POLL_INTERVAL: float = 1.0  # in seconds, used right after a skip
+    ENGINE_MAX_POLL_INTERVAL: float = 60.0  # in seconds, cap while a track is playing
+    ENGINE_MAX_IDLE_INTERVAL: float = 60.0  # in seconds, cap of the idle back-off
+    ENGINE_TRACK_BOUNDARY_MARGIN: float = 0.5  # in seconds, slack after the expected track change
+    ENGINE_LOOKAHEAD_DEPTH: int = 5  # queued tracks pre-evaluated for preemptive skips, 0 disables
+
+    # Sharding Settings (splitting user sessions between replicas)
+    SHARD_COUNT: int = 64
+    SHARD_LEASE_TTL: float = 10.0  # in seconds
+    SHARD_RENEW_INTERVAL: float = 3.0  # in seconds
+    REPLICA_ID: Optional[str] = None  # defaults to "<hostname>-<pid>"
 
     model_config = SettingsConfigDict(env_file="../.env", extra="ignore")
 
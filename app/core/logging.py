@@ -1,29 +1,221 @@
-import structlog
+import atexit
+import json
+import queue
 import sys
+import threading
+import time
+from typing import Any, Callable, TextIO
 
-def setup_logging():
-    structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.add_log_level,
-            structlog.processors.StackInfoRenderer(),
-            structlog.dev.set_exc_info,
-            structlog.processors.CallsiteParameterAdder(
-                {
-                    structlog.processors.CallsiteParameter.FILENAME,
-                    structlog.processors.CallsiteParameter.FUNC_NAME,
-                    structlog.processors.CallsiteParameter.LINENO,
-                    structlog.processors.CallsiteParameter.MODULE,
-                }
-            ),
+import structlog
+
+from app.core.config import settings
+
+CALLSITE_PARAMETERS = {
+    structlog.processors.CallsiteParameter.FILENAME,
+    structlog.processors.CallsiteParameter.FUNC_NAME,
+    structlog.processors.CallsiteParameter.LINENO,
+    structlog.processors.CallsiteParameter.MODULE,
+}
+
+
+class CachedCallsiteAdder:
+    """
+    Same fields as CallsiteParameterAdder, but resolved once per call site.
+    Finding the calling frame is a short walk; deriving the fields from it is what costs,
+    so they are cached by code object and line number.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._cache: dict[tuple[Any, int], dict[str, Any]] = {}
+
+    def __call__(self, logger, method_name: str, event_dict: dict) -> dict:
+        frame = sys._getframe(1)
+        while frame.f_globals.get("__name__", "").startswith(("structlog", "logging", __name__)):
+            if frame.f_back is None:
+                break
+            frame = frame.f_back
+        key = (frame.f_code, frame.f_lineno)
+        callsite = self._cache.get(key)
+        if callsite is None:
+            if len(self._cache) >= self.max_entries:
+                self._cache.clear()
+            filename = frame.f_code.co_filename.rsplit("/", 1)[-1]
+            callsite = self._cache[key] = {
+                "filename": filename,
+                "func_name": frame.f_code.co_name,
+                "lineno": frame.f_lineno,
+                "module": filename.rsplit(".", 1)[0],
+            }
+        event_dict.update(callsite)
+        return event_dict
+
+
+class EventSampler:
+    """
+    Rate limits log events per event name (the message), at most `rate` per second each.
+    Only levels up to `max_level` are sampled; warnings and errors always pass. The next
+    event let through carries the number dropped since the previous one as `sampled_out`.
+    """
+    LEVELS = ("debug", "info", "warning", "error", "critical")
+
+    def __init__(self, rate: float, max_level: str = "info", clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.sampled_levels = set(self.LEVELS[:self.LEVELS.index(max_level) + 1])
+        self.clock = clock
+        self.dropped = 0
+        self._buckets: dict[str, list[float]] = {}  # event -> [tokens, updated, dropped]
+
+    def __call__(self, logger, method_name: str, event_dict: dict) -> dict:
+        if method_name not in self.sampled_levels:
+            return event_dict
+        now = self.clock()
+        event = event_dict.get("event")
+        bucket = self._buckets.get(event)
+        if bucket is None:
+            bucket = self._buckets[event] = [self.rate, now, 0]
+        bucket[0] = min(self.rate, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if bucket[0] < 1:
+            bucket[2] += 1
+            self.dropped += 1
+            raise structlog.DropEvent
+        bucket[0] -= 1
+        if bucket[2]:
+            event_dict["sampled_out"] = int(bucket[2])
+            bucket[2] = 0
+        return event_dict
+
+
+class QueueLogWriter:
+    """
+    Writes log lines from a background thread, so logging never blocks the event loop on
+    the output stream. Lines are written in batches; when the queue is full new lines are
+    dropped and counted rather than waited for.
+    """
+
+    def __init__(self, stream: TextIO | None = None, max_size: int = 10_000, batch_size: int = 256):
+        self.stream = stream or sys.stdout
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._closed = False
+        self._queue: queue.Queue[str | None] = queue.Queue(max_size)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: str):
+        if self._closed:
+            # Late lines (e.g. during interpreter shutdown) are written directly
+            self.stream.write(line + "\n")
+            return
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0):
+        """Writes out the queued lines and stops the thread"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _run(self):
+        running = True
+        while running:
+            lines = [self._queue.get()]
+            while len(lines) < self.batch_size:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in lines:
+                running = False
+                lines = [line for line in lines if line is not None]
+            if self.dropped != self._reported_dropped:
+                lines.append(json.dumps({"event": "Log lines dropped, writer queue full", "level": "warning",
+                                         "count": self.dropped - self._reported_dropped}))
+                self._reported_dropped = self.dropped
+            if lines:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+
+
+class QueueLogger:
+    """structlog output logger handing rendered lines to a QueueLogWriter"""
+
+    def __init__(self, writer: QueueLogWriter):
+        self._writer = writer
+
+    def msg(self, message: str):
+        self._writer.write(message)
+
+    log = debug = info = warn = warning = error = critical = exception = fatal = msg
+
+
+_writer: QueueLogWriter | None = None
+
+
+def setup_logging(mode: str | None = None, callsite: str | None = None, event_rate: float | None = None,
+                  stream: TextIO | None = None):
+    """
+    Configures structlog.
+    "dev" mode prints every event synchronously with full callsite info and ISO timestamps.
+    "production" mode renders JSON with epoch timestamps, rate limits frequent INFO events,
+    caches callsite lookups and writes from a background thread.
+    Arguments default to the LOG_* settings.
+    """
+    global _writer
+    mode = mode or settings.LOG_MODE
+    if mode not in ("dev", "production"):
+        raise ValueError(f"Unknown log mode: {mode}")
+    production = mode == "production"
+    callsite = callsite or settings.LOG_CALLSITE or ("cached" if production else "full")
+    event_rate = settings.LOG_EVENT_RATE if event_rate is None else event_rate
+
+    processors = [structlog.contextvars.merge_contextvars, structlog.processors.add_log_level]
+    if production and event_rate > 0:
+        # Before anything else that costs, so dropped events are cheap
+        processors.insert(0, EventSampler(event_rate))
+    processors += [structlog.processors.StackInfoRenderer(), structlog.dev.set_exc_info]
+    if callsite == "full":
+        processors.append(structlog.processors.CallsiteParameterAdder(CALLSITE_PARAMETERS))
+    elif callsite == "cached":
+        processors.append(CachedCallsiteAdder())
+    elif callsite != "off":
+        raise ValueError(f"Unknown callsite mode: {callsite}")
+
+    shutdown_logging()
+    if production:
+        writer = _writer = QueueLogWriter(stream, max_size=settings.LOG_QUEUE_SIZE)
+        processors += [structlog.processors.TimeStamper(), structlog.processors.JSONRenderer()]
+        logger_factory = lambda *args: QueueLogger(writer)
+    else:
+        processors += [
             structlog.processors.TimeStamper(fmt="iso"),
             # If in a real terminal, make it pretty. In Docker logs, keep it clean.
             structlog.dev.ConsoleRenderer() if sys.stderr.isatty() else structlog.processors.JSONRenderer(),
-        ],
+        ]
+        logger_factory = structlog.PrintLoggerFactory(stream)
+
+    structlog.configure(
+        processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(20), # 20 = INFO
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
-logger = structlog.get_logger()
\ No newline at end of file
+
+def shutdown_logging():
+    """Flushes and stops the production mode writer, if any"""
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+
+atexit.register(shutdown_logging)
+
+logger = structlog.get_logger()
@@ -1,14 +1,44 @@
+import time
 from collections import deque
 
 import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
 
 from app.core.config import settings
 from app.core.logging import logger
+from app.core.metrics import REDIS_COMMAND_SECONDS, metrics
+
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline recording the round trip of each execute as one MULTI/PIPELINE command"""
+
+    async def execute(self, raise_on_error: bool = True):
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            REDIS_COMMAND_SECONDS.labels("MULTI" if self.is_transaction else "PIPELINE").observe(
+                time.perf_counter() - started)
+
+
+class InstrumentedRedis(redis.Redis):
+    """Redis client recording the latency of every command, scripts included (EVALSHA)"""
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_SECONDS.labels(str(args[0]).upper()).observe(time.perf_counter() - started)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
 
 
 class RedisManager:
     def __init__(self):
         self.pool: redis.ConnectionPool | None = None
+        self.binary_pool: redis.ConnectionPool | None = None
 
     async def connect(self):
         """Initialize the Connection Pool and the primary client"""
@@ -18,6 +48,8 @@ class RedisManager:
                                                       encoding="utf-8",
                                                       decode_responses=True,
                                                       max_connections=20)
+            # Replies left as bytes, for values written by app.services.codec
+            self.binary_pool = redis.ConnectionPool.from_url(str(settings.REDIS_URL), max_connections=20)
 
             # Perform a health check
             client = redis.Redis(connection_pool=self.pool)
@@ -31,6 +63,7 @@ class RedisManager:
         """Close the Connection Pool and all associated connections"""
         try:
             await self.pool.disconnect()
+            await self.binary_pool.disconnect()
             logger.info("Redis connection pool disconnected successfully")
         except Exception as e:
             logger.error("Failed to disconnect Redis connection pool", error=str(e))
@@ -40,7 +73,15 @@ class RedisManager:
         """Returns a Redis client instance"""
         if not self.pool:
             raise RuntimeError("Redis connection pool is not initialized. Call connect() first.")
-        return redis.Redis(connection_pool=self.pool)
+        client_class = InstrumentedRedis if metrics.enabled else redis.Redis
+        return client_class(connection_pool=self.pool)
+
+    def get_binary_client(self) -> redis.Redis:
+        """Returns a Redis client instance that does not decode replies"""
+        if not self.binary_pool:
+            raise RuntimeError("Redis connection pool is not initialized. Call connect() first.")
+        client_class = InstrumentedRedis if metrics.enabled else redis.Redis
+        return client_class(connection_pool=self.binary_pool)
 
 
 redis_manager = RedisManager()
@@ -31,7 +31,6 @@ async def seed_strategies():
     ]
 
     logger.info("Populating strategies in Redis")
-    for strategy in strategies:
-        await manager.upsert_strategy(strategy)
+    await manager.upsert_strategies(strategies)
     await manager.set_active_strategy("focus")
     logger.info("Strategy seeding completed")
\ No newline at end of file
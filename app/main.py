@@ -1,17 +1,29 @@
 import asyncio
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from app.api.v1 import strategies, engine
 from app.core.config import settings
-from app.core.logging import setup_logging, logger
-from app.core.redis import redis_manager
+from app.core.logging import setup_logging, shutdown_logging, logger
+from app.core.metrics import metrics, monitor_event_loop_lag
 from app.core.seeding import seed_strategies
+from app.services.codec import AudioFeaturesCodec
+from app.services.decision_cache import DecisionCache
+from app.services.decision_log import DecisionLog
 from app.services.engine import SyncStreamEngine
+from app.services.lookahead import QueueLookahead
+from app.services.polling import build_poll_scheduler
+from app.services.refresh_token_task import refresh_token_task
+from app.services.spotify.cache import CachedSpotifyService
 from app.services.spotify.mock import MockSpotifyService
 from app.services.spotify.prod import ProdSpotifyService
-from app.services.strategy_manager import StrategyManager
+from app.services.spotify.rate_limit import LocalTokenBucket, RedisTokenBucket, SpotifyRateLimiter
+from app.services.spotify.recording import RecordingSpotifyService, RecordingWriter
+from app.services.storage import storage
+from app.services.strategy_cache import CachedStrategyManager
+from app.services.strategy_resolver import ActiveStrategyResolver
 
 setup_logging()
 
@@ -21,31 +33,96 @@ async def lifespan(app: FastAPI):
     Manages the startup and shutdown sequence of SyncStream Architect.
     """
 
-    # Initialize the Redis connection pool
-    await redis_manager.connect()
-    logger.info("Redis connection pool initialized")
+    metrics.enabled = settings.METRICS_ENABLED
+    lag_task = asyncio.create_task(monitor_event_loop_lag(settings.METRICS_LOOP_LAG_INTERVAL)) if metrics.enabled else None
 
-    # Seed strategies in Redis
+    # Connect to Redis, or load the in-memory state of a single-node deployment
+    await storage.open()
+    logger.info("Storage initialized", backend=settings.STORAGE_BACKEND)
+    # Without Redis, the rate limit budget and the decision log are not available across processes
+    shared = settings.STORAGE_BACKEND == "redis"
+
+    # Seed strategies
     await seed_strategies()
 
     # Initialize Spotify service
+    prod_spotify_service = None
     if settings.SPOTIFY_MOCK_MODE:
         spotify_service = MockSpotifyService()
     else:
         if not all([settings.SPOTIFY_CLIENT_ID, settings.SPOTIFY_CLIENT_SECRET, settings.SPOTIFY_REFRESH_TOKEN]):
             raise ValueError("Spotify credentials are not properly configured in settings")
+        rate_limiter = None
+        if settings.SPOTIFY_RATE_LIMIT_PER_SECOND > 0:
+            bucket_class = RedisTokenBucket if shared and settings.SPOTIFY_RATE_LIMIT_SHARED else LocalTokenBucket
+            rate_limiter = SpotifyRateLimiter(bucket_class(settings.SPOTIFY_RATE_LIMIT_PER_SECOND, settings.SPOTIFY_RATE_LIMIT_BURST))
         spotify_service = ProdSpotifyService(
             client_id=settings.SPOTIFY_CLIENT_ID,
             client_secret=settings.SPOTIFY_CLIENT_SECRET,
-            refresh_token=settings.SPOTIFY_REFRESH_TOKEN
+            refresh_token=settings.SPOTIFY_REFRESH_TOKEN,
+            features_batch_window=settings.SPOTIFY_FEATURES_BATCH_WINDOW_MS / 1000 if settings.SPOTIFY_FEATURES_BATCHING else None,
+            token_refresh_margin=settings.SPOTIFY_TOKEN_REFRESH_MARGIN,
+            rate_limiter=rate_limiter,
+            max_retries=settings.SPOTIFY_MAX_RETRIES,
+        )
+        # One pooled, keep-alive client for the lifetime of the app
+        await spotify_service.open(
+            max_connections=settings.SPOTIFY_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SPOTIFY_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.SPOTIFY_HTTP_KEEPALIVE_EXPIRY,
+            http2=settings.SPOTIFY_HTTP2,
+            timeout=settings.SPOTIFY_HTTP_TIMEOUT,
         )
+        prod_spotify_service = spotify_service
+        token_task = asyncio.create_task(refresh_token_task(prod_spotify_service))
     if not spotify_service:
         raise RuntimeError("Spotify service initialization failed")
-    logger.info("Spotify service initialized", mode="Mock" if settings.SPOTIFY_MOCK_MODE else "PROD")
+    if settings.FEATURES_CACHE_SIZE > 0:
+        spotify_service = CachedSpotifyService(
+            spotify_service,
+            max_entries=settings.FEATURES_CACHE_SIZE,
+            use_redis=settings.FEATURES_CACHE_REDIS,
+            ttl=settings.FEATURES_CACHE_TTL,
+            negative_ttl=settings.FEATURES_CACHE_NEGATIVE_TTL,
+            codec=AudioFeaturesCodec(settings.REDIS_BINARY_CODECS),
+        )
+    recording_writer = None
+    if settings.SPOTIFY_RECORDING_PATH:
+        recording_writer = RecordingWriter(settings.SPOTIFY_RECORDING_PATH)
+        spotify_service = RecordingSpotifyService(spotify_service, recording_writer)
+    logger.info("Spotify service initialized", mode="Mock" if settings.SPOTIFY_MOCK_MODE else "PROD",
+                features_cache=settings.FEATURES_CACHE_SIZE > 0, recording=settings.SPOTIFY_RECORDING_PATH)
 
     # Initialize the engine
-    strategy_manager = StrategyManager()
-    engine = SyncStreamEngine(spotify=spotify_service, strategy_manager=strategy_manager, poll_interval=settings.ENGINE_POLL_INTERVAL)
+    strategy_manager = strategies.manager
+    manager_task = None
+    if isinstance(strategy_manager, CachedStrategyManager):
+        manager_task = asyncio.create_task(strategy_manager.run())
+    poll_scheduler = build_poll_scheduler(settings)
+    # Caches the compiled active strategy until a strategy change is published
+    strategy_resolver = ActiveStrategyResolver(strategy_manager)
+    resolver_task = asyncio.create_task(strategy_resolver.run())
+    lookahead = None
+    if settings.ENGINE_LOOKAHEAD_DEPTH > 0:
+        lookahead = QueueLookahead(spotify_service, depth=settings.ENGINE_LOOKAHEAD_DEPTH,
+                                   boundary_margin=settings.ENGINE_TRACK_BOUNDARY_MARGIN)
+    decision_cache = None
+    if settings.DECISION_CACHE_SIZE > 0:
+        decision_cache = DecisionCache(max_entries=settings.DECISION_CACHE_SIZE,
+                                       use_redis=settings.DECISION_CACHE_REDIS, ttl=settings.DECISION_CACHE_TTL)
+    decision_log = None
+    decision_log_task = None
+    if shared and settings.DECISION_LOG_ENABLED:
+        # Buffered and written by its own task, the engine never waits on the stream
+        decision_log = DecisionLog(max_length=settings.DECISION_LOG_MAX_LENGTH, batch_size=settings.DECISION_LOG_BATCH_SIZE,
+                                   flush_interval=settings.DECISION_LOG_FLUSH_INTERVAL,
+                                   buffer_size=settings.DECISION_LOG_BUFFER_SIZE,
+                                   codec=AudioFeaturesCodec(settings.REDIS_BINARY_CODECS))
+        decision_log_task = asyncio.create_task(decision_log.run())
+    engine = SyncStreamEngine(spotify=spotify_service, strategy_manager=strategy_manager,
+                              poll_interval=settings.ENGINE_POLL_INTERVAL, poll_scheduler=poll_scheduler,
+                              strategy_resolver=strategy_resolver, lookahead=lookahead,
+                              decision_cache=decision_cache, decision_log=decision_log)
     app.state.engine = engine
 
     # Run the engine as a non-blocking background task
@@ -59,11 +136,36 @@ async def lifespan(app: FastAPI):
     # Gracefully stop the Engine loop
     engine.stop()
     await engine_task
+    strategy_resolver.stop()
+    await resolver_task
+    if manager_task:
+        strategy_manager.stop()
+        await manager_task
     logger.info("Engine stopped successfully")
 
-    # Close Redis connection pool
-    await redis_manager.disconnect()
-    logger.info("Redis connection pool closed")
+    # Write out the buffered decisions
+    if decision_log_task:
+        decision_log.stop()
+        await decision_log_task
+
+    if recording_writer:
+        recording_writer.close()
+
+    # Close the Spotify HTTP client
+    if prod_spotify_service:
+        token_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await token_task
+        await prod_spotify_service.aclose()
+
+    # Close the Redis connection pool, or persist the in-memory state
+    await storage.close()
+    logger.info("Storage closed")
+    if lag_task:
+        lag_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await lag_task
+    shutdown_logging()
 
 app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan, debug=settings.DEBUG)
 app.include_router(strategies.router, prefix="/api")
@@ -76,3 +178,8 @@ async def root():
         "message": "Spotify SyncStream Architect is live",
         "status": "online"
     }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Engine, Spotify and Redis metrics in the Prometheus text exposition format"""
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -59,6 +59,15 @@ class SpotifyTrack(BaseModel):
     album: Optional[SpotifyAlbum] = None
     features: Optional[AudioFeatures] = None
 
+class SpotifyQueue(BaseModel):
+    """
+    Official Spotify User Queue Object (tracks only).
+    Other items (e.g. episodes) are kept as None, so positions still match the player queue.
+    Documentation: https://developer.spotify.com/documentation/web-api/reference/get-queue
+    """
+    currently_playing: Optional[SpotifyTrack] = None
+    queue: List[Optional[SpotifyTrack]] = []
+
 class PlaybackState(BaseModel):
     """
     Official Spotify Currently Playing Object.
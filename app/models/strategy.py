@@ -1,5 +1,11 @@
+import hashlib
+import json
 from typing import Any, Optional, Dict
-from pydantic import BaseModel, Field
+
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
+
+from app.strategies.chain import is_chain, parse_chain
+from app.strategies.rules import is_rule, parse_rule
 
 
 class StrategyConfig(BaseModel):
@@ -13,6 +19,21 @@ class StrategyConfig(BaseModel):
     is_active: bool = Field(default=True, description="Indicates whether the strategy is currently active")
     parameters: dict[str, Any] = Field(default_factory=dict, description="Custom parameters for the strategy")
 
+    @field_validator("parameters")
+    @classmethod
+    def validate_parameters(cls, parameters: dict[str, Any], info: ValidationInfo) -> dict[str, Any]:
+        """Rejects malformed rules (skip_if/keep_if) and chains when the config is created or updated"""
+        if is_rule(parameters):
+            parse_rule(parameters)
+        if is_chain(parameters):
+            parse_chain(parameters, info.data.get("id"))
+        return parameters
+
+    def fingerprint(self) -> str:
+        """Stable hash of everything that changes the strategy behaviour (id and parameters)"""
+        payload = json.dumps({"id": self.id, "parameters": self.parameters}, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
 class ActiveStrategyUpdate(BaseModel):
     """
     Model for updating the active strategy.
@@ -26,4 +47,10 @@ class EngineStatus(BaseModel):
     active_strategy_id: str
     is_running: bool
     last_evaluation: Optional[Dict[str, Any]] = None
-    current_track: Optional[Dict[str, Any]] = None
\ No newline at end of file
+    current_track: Optional[Dict[str, Any]] = None
+    polls_avoided: Optional[int] = None
+    features_cache: Optional[Dict[str, Any]] = None
+    strategy_chain: Optional[Dict[str, Any]] = None
+    skips: Optional[Dict[str, Any]] = None
+    decisions: Optional[Dict[str, Any]] = None
+    strategy_cache: Optional[Dict[str, Any]] = None
\ No newline at end of file
@@ -0,0 +1,118 @@
+import struct
+from typing import Generic, TypeVar
+
+import msgpack
+
+from app.models.spotify import AudioFeatures
+from app.models.strategy import StrategyConfig
+
+T = TypeVar("T")
+
+# Binary values start with MAGIC, which is neither '{' (legacy JSON) nor a digit (legacy text
+# features) and is never emitted by msgpack, then a format version byte.
+MAGIC = 0xC1
+STRATEGY_FORMAT_VERSION = 1
+FEATURES_FORMAT_VERSION = 1
+
+# Field order of the compact text encoding, and of the presence bitmask of the binary one.
+# Append new fields at the end only.
+FEATURE_FIELDS = (
+    "energy", "instrumentalness", "valence", "danceability", "key", "loudness", "mode",
+    "speechiness", "acousticness", "liveness", "tempo", "duration_ms", "time_signature",
+)
+ENCODING_VERSION = "1"
+NEGATIVE_ENTRY = "-"
+
+_FEATURE_INTS = {"key": "b", "mode": "b", "duration_ms": "I", "time_signature": "b"}
+_FEATURES_STRUCT = struct.Struct("<BBH" + "".join(_FEATURE_INTS.get(field, "d") for field in FEATURE_FIELDS))
+_ALL_FEATURES_PRESENT = (1 << len(FEATURE_FIELDS)) - 1
+
+
+def encode_features(features: AudioFeatures) -> str:
+    """Encodes audio features as '<version>:<v1>,<v2>,...' (empty for missing values)"""
+    values = (getattr(features, field) for field in FEATURE_FIELDS)
+    return ENCODING_VERSION + ":" + ",".join("" if value is None else repr(value) for value in values)
+
+
+def decode_features(track_id: str, value: str) -> AudioFeatures:
+    version, _, payload = value.partition(":")
+    if version != ENCODING_VERSION:
+        raise ValueError(f"Unsupported audio features encoding version: '{version}'")
+    values = payload.split(",")
+    return AudioFeatures(id=track_id, **{
+        field: raw for field, raw in zip(FEATURE_FIELDS, values) if raw != ""
+    })
+
+
+def _format_version(data: bytes, expected: int, kind: str) -> bool:
+    """True for a binary value, False for a legacy one, raises on an unknown binary version"""
+    if not data or data[0] != MAGIC:
+        return False
+    if len(data) < 2 or data[1] != expected:
+        raise ValueError(f"Unsupported {kind} encoding version: {data[1] if len(data) > 1 else None}")
+    return True
+
+
+class Codec(Generic[T]):
+    """
+    Serializes values stored in Redis. `encode` writes the codec's format while `decode`
+    reads every format ever written for the type, so values migrate as they are rewritten.
+    """
+
+    def encode(self, value: T) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, key: str, data: bytes) -> T:
+        raise NotImplementedError
+
+
+class StrategyConfigCodec(Codec[StrategyConfig]):
+    """
+    msgpack of the JSON-mode dump (decodable by the Lua scripts through cmsgpack), or JSON
+    with `binary=False` for a fleet that still runs replicas without this codec, and for
+    configs with integers msgpack cannot hold
+    """
+
+    def __init__(self, binary: bool = True):
+        self.binary = binary
+
+    def encode(self, config: StrategyConfig) -> bytes:
+        if self.binary:
+            try:
+                return bytes((MAGIC, STRATEGY_FORMAT_VERSION)) + msgpack.packb(config.model_dump(mode="json"))
+            except OverflowError:
+                pass  # msgpack ints stop at 64 bits, the parameters may hold larger ones
+        return config.model_dump_json().encode()
+
+    def decode(self, key: str, data: bytes) -> StrategyConfig:
+        if _format_version(data, STRATEGY_FORMAT_VERSION, "strategy"):
+            return StrategyConfig.model_validate(msgpack.unpackb(data[2:]))
+        return StrategyConfig.model_validate_json(data)
+
+
+class AudioFeaturesCodec(Codec[AudioFeatures]):
+    """
+    Fixed 83 byte layout: magic, version, presence bitmask, then every field of FEATURE_FIELDS
+    (float64, or a sized int), or the text encoding with `binary=False`
+    """
+
+    def __init__(self, binary: bool = True):
+        self.binary = binary
+
+    def encode(self, features: AudioFeatures) -> bytes:
+        if not self.binary:
+            return encode_features(features).encode()
+        values = [getattr(features, field) for field in FEATURE_FIELDS]
+        present = sum(1 << i for i, value in enumerate(values) if value is not None)
+        return _FEATURES_STRUCT.pack(MAGIC, FEATURES_FORMAT_VERSION, present,
+                                     *(0 if value is None else value for value in values))
+
+    def decode(self, track_id: str, data: bytes) -> AudioFeatures:
+        if not _format_version(data, FEATURES_FORMAT_VERSION, "audio features"):
+            return decode_features(track_id, data.decode())
+        _, _, present, *values = _FEATURES_STRUCT.unpack(data)
+        fields = dict(zip(FEATURE_FIELDS, values))
+        if present != _ALL_FEATURES_PRESENT:
+            fields = {field: value for i, (field, value) in enumerate(fields.items()) if present >> i & 1}
+        return AudioFeatures(id=track_id, **fields)
+
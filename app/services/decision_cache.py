@@ -0,0 +1,131 @@
+from collections import OrderedDict
+
+from app.core.logging import logger
+from app.models.strategy import StrategyConfig
+from app.services.storage import StorageBackend, storage as default_storage
+from app.strategies.base import PlaybackStrategy, StrategyAction
+from app.strategies.chain import StrategyChain
+
+ENCODED_ACTIONS = {StrategyAction.KEEP: b"k", StrategyAction.SKIP: b"s"}
+DECODED_ACTIONS = {value: action for action, value in ENCODED_ACTIONS.items()}
+
+
+def decision_fingerprint(config: StrategyConfig, strategy: PlaybackStrategy) -> str:
+    """Hash of everything a verdict depends on; a chain depends on its members, not on its own config"""
+    if isinstance(strategy, StrategyChain) and strategy.fingerprint:
+        return strategy.fingerprint
+    return config.fingerprint()
+
+
+class StrategyDecisionStats:
+    def __init__(self):
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return (self.local_hits + self.redis_hits) / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class DecisionCacheStats:
+    """
+    Per-strategy hit/miss counters of the decision cache
+    """
+
+    def __init__(self):
+        self.strategies: dict[str, StrategyDecisionStats] = {}
+        self.evictions = 0
+        self.redis_errors = 0
+
+    def of(self, strategy_id: str) -> StrategyDecisionStats:
+        stats = self.strategies.get(strategy_id)
+        if stats is None:
+            stats = self.strategies[strategy_id] = StrategyDecisionStats()
+        return stats
+
+    def as_dict(self) -> dict:
+        return {
+            "evictions": self.evictions,
+            "redis_errors": self.redis_errors,
+            "strategies": {strategy_id: stats.as_dict() for strategy_id, stats in self.strategies.items()},
+        }
+
+
+class DecisionCache:
+    """
+    Two-tier cache of keep/skip verdicts, keyed by track id and strategy fingerprint.
+    With the same config, a verdict is a pure function of the track, so it is shared by
+    every user and replica. A config change changes the fingerprint, which invalidates
+    its old verdicts without any explicit purge; they simply age out. The shared tier is
+    kept in the storage backend (Redis).
+    """
+
+    KEY_PREFIX = "decisions:"
+
+    def __init__(self, max_entries: int = 50_000, use_redis: bool = True, ttl: int | None = 7 * 24 * 3600,
+                 storage: StorageBackend | None = None):
+        self.storage = storage or default_storage
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self.ttl = ttl
+        self.stats = DecisionCacheStats()
+        self._local: OrderedDict[tuple[str, str], StrategyAction] = OrderedDict()
+
+    def _redis_key(self, fingerprint: str, track_id: str) -> str:
+        return f"{self.KEY_PREFIX}{fingerprint}:{track_id}"
+
+    async def get(self, track_id: str, fingerprint: str, strategy_id: str) -> StrategyAction | None:
+        stats = self.stats.of(strategy_id)
+        key = (fingerprint, track_id)
+        action = self._local.get(key)
+        if action is not None:
+            self._local.move_to_end(key)
+            stats.local_hits += 1
+            return action
+
+        action = await self._redis_get(fingerprint, track_id)
+        if action is not None:
+            stats.redis_hits += 1
+            self._remember(key, action)
+            return action
+
+        stats.misses += 1
+        return None
+
+    async def put(self, track_id: str, fingerprint: str, action: StrategyAction):
+        self._remember((fingerprint, track_id), action)
+        if not self.use_redis:
+            return
+        try:
+            await self.storage.set(self._redis_key(fingerprint, track_id), ENCODED_ACTIONS[action], ttl=self.ttl)
+        except Exception as e:
+            self.stats.redis_errors += 1
+            logger.warning("Decision cache write failed", track_id=track_id, error=str(e))
+
+    def _remember(self, key: tuple[str, str], action: StrategyAction):
+        self._local[key] = action
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def _redis_get(self, fingerprint: str, track_id: str) -> StrategyAction | None:
+        if not self.use_redis:
+            return None
+        try:
+            value = await self.storage.get(self._redis_key(fingerprint, track_id))
+        except Exception as e:
+            self.stats.redis_errors += 1
+            logger.warning("Decision cache read failed", track_id=track_id, error=str(e))
+            return None
+        return DECODED_ACTIONS.get(value)
@@ -0,0 +1,212 @@
+import asyncio
+from collections import deque
+
+from redis.exceptions import ResponseError
+
+from app.core.logging import logger
+from app.core.redis import redis_manager
+from app.models.spotify import AudioFeatures
+from app.models.strategy import StrategyConfig
+from app.services.codec import AudioFeaturesCodec
+from app.services.decision_cache import decision_fingerprint
+from app.strategies.base import PlaybackStrategy, StrategyAction
+
+STREAM_KEY = "engine:decisions"
+
+
+class DecisionLogStats:
+    def __init__(self):
+        self.appended = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.write_errors = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "appended": self.appended,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "write_errors": self.write_errors,
+        }
+
+
+class DecisionLog:
+    """
+    Durable record of the engine's decisions, one Redis Stream entry per evaluation.
+    `append` only buffers the entry: a background task writes the buffer in pipelined
+    batches once `batch_size` entries are waiting, or `flush_interval` seconds after the
+    first one, so a tick never waits on Redis. While Redis is slow or down, up to
+    `buffer_size` entries wait for the next attempt; further ones are dropped and counted.
+    The stream is trimmed to about `max_length` entries (XADD MAXLEN ~) and read with a
+    DecisionLogReader.
+    """
+
+    def __init__(self, max_length: int = 1_000_000, batch_size: int = 256, flush_interval: float = 0.5,
+                 buffer_size: int = 10_000, codec: AudioFeaturesCodec | None = None, stream_key: str = STREAM_KEY):
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.codec = codec or AudioFeaturesCodec()
+        self.stream_key = stream_key
+        self.stats = DecisionLogStats()
+        self._buffer: deque[tuple] = deque()
+        self._pending = asyncio.Event()
+        self._full = asyncio.Event()
+        self._stopping = False
+
+    def append(self, track_id: str, config: StrategyConfig, strategy: PlaybackStrategy, fingerprint: str | None,
+               action: StrategyAction, source: str, features: AudioFeatures | None, latency: float):
+        """Buffers one decision; the fingerprint, when not known yet, is computed by the writer"""
+        if len(self._buffer) >= self.buffer_size:
+            self.stats.dropped += 1
+            return
+        self._buffer.append((track_id, config, strategy, fingerprint, action, source, features, latency))
+        self.stats.appended += 1
+        self._pending.set()
+        if len(self._buffer) >= self.batch_size:
+            self._full.set()
+
+    async def run(self):
+        """Writes buffered entries until stopped, then writes out what is left"""
+        while not self._stopping:
+            await self._pending.wait()
+            if not self._stopping and len(self._buffer) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            if not await self.flush() and not self._stopping:
+                await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    def stop(self):
+        self._stopping = True
+        self._pending.set()
+        self._full.set()
+
+    async def flush(self) -> bool:
+        """Writes the buffered entries, one round trip per batch; False when Redis failed"""
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            self._update_events()
+            try:
+                async with redis_manager.get_binary_client().pipeline(transaction=False) as pipe:
+                    for fields in self._encode(batch):
+                        pipe.xadd(self.stream_key, fields, maxlen=self.max_length, approximate=True)
+                    await pipe.execute()
+            except Exception as e:
+                # Kept for the next attempt, ahead of the entries appended meanwhile
+                self._buffer.extendleft(reversed(batch))
+                self._update_events()
+                self.stats.write_errors += 1
+                logger.warning("Decision log write failed", entries=len(batch), error=str(e))
+                return False
+            self.stats.written += len(batch)
+            self.stats.flushes += 1
+        return True
+
+    def _update_events(self):
+        if not self._stopping:
+            if not self._buffer:
+                self._pending.clear()
+            if len(self._buffer) < self.batch_size:
+                self._full.clear()
+
+    def _encode(self, batch: list[tuple]) -> list[dict]:
+        # A batch mostly shares one config, its fingerprint is hashed once
+        fingerprints: dict[int, str] = {}
+        entries = []
+        for track_id, config, strategy, fingerprint, action, source, features, latency in batch:
+            if fingerprint is None:
+                fingerprint = fingerprints.get(id(strategy))
+                if fingerprint is None:
+                    fingerprint = fingerprints[id(strategy)] = decision_fingerprint(config, strategy)
+            entries.append({
+                "track": track_id,
+                "strategy": config.id,
+                "fingerprint": fingerprint,
+                "action": action.value,
+                "source": source,
+                "features": self.codec.encode(features) if features else b"",
+                "latency_us": int(latency * 1e6),
+            })
+        return entries
+
+
+class DecisionLogEntry:
+    __slots__ = ("id", "track_id", "strategy_id", "fingerprint", "action", "source", "features", "latency")
+
+    def __init__(self, id: str, track_id: str, strategy_id: str, fingerprint: str, action: StrategyAction,
+                 source: str, features: AudioFeatures | None, latency: float):
+        self.id = id
+        self.track_id = track_id
+        self.strategy_id = strategy_id
+        self.fingerprint = fingerprint
+        self.action = action
+        self.source = source
+        self.features = features
+        self.latency = latency
+
+    @property
+    def timestamp_ms(self) -> int:
+        """Time the entry was written, from its stream id"""
+        return int(self.id.split("-", 1)[0])
+
+
+class DecisionLogReader:
+    """
+    Reads the decision log as one consumer of a consumer group, for downstream analytics.
+    Each group keeps its own position and pending entries in Redis, so groups read
+    independently of each other and of the engine, which only ever appends. Entries read
+    but not acknowledged (e.g. by a crashed consumer) can be taken over with `claim_stale`.
+    """
+
+    def __init__(self, group: str, consumer: str, codec: AudioFeaturesCodec | None = None,
+                 stream_key: str = STREAM_KEY):
+        self.group = group
+        self.consumer = consumer
+        self.codec = codec or AudioFeaturesCodec()
+        self.stream_key = stream_key
+
+    async def create_group(self, start: str = "0"):
+        """Creates the group if missing, reading from `start` ("0" for the whole log, "$" for new entries)"""
+        try:
+            await redis_manager.get_binary_client().xgroup_create(self.stream_key, self.group, id=start, mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def read(self, count: int = 100, block: float | None = None) -> list[DecisionLogEntry]:
+        """Next entries not delivered to the group yet, waiting up to `block` seconds for one"""
+        reply = await redis_manager.get_binary_client().xreadgroup(
+            self.group, self.consumer, {self.stream_key: ">"}, count=count,
+            block=int(block * 1000) if block is not None else None)
+        return [self._decode(entry_id, fields) for _, entries in reply for entry_id, fields in entries]
+
+    async def ack(self, entries: list[DecisionLogEntry]):
+        if entries:
+            await redis_manager.get_binary_client().xack(self.stream_key, self.group, *(entry.id for entry in entries))
+
+    async def claim_stale(self, min_idle: float, count: int = 100) -> list[DecisionLogEntry]:
+        """Takes over entries delivered to any consumer of the group and unacknowledged for `min_idle` seconds"""
+        _, entries, *_ = await redis_manager.get_binary_client().xautoclaim(
+            self.stream_key, self.group, self.consumer, int(min_idle * 1000), count=count)
+        # Entries trimmed from the stream meanwhile come back without fields
+        return [self._decode(entry_id, fields) for entry_id, fields in entries if fields]
+
+    def _decode(self, entry_id: bytes, fields: dict[bytes, bytes]) -> DecisionLogEntry:
+        track_id = fields[b"track"].decode()
+        features = fields.get(b"features")
+        return DecisionLogEntry(
+            id=entry_id.decode(),
+            track_id=track_id,
+            strategy_id=fields[b"strategy"].decode(),
+            fingerprint=fields[b"fingerprint"].decode(),
+            action=StrategyAction(fields[b"action"].decode()),
+            source=fields[b"source"].decode(),
+            features=self.codec.decode(track_id, features) if features else None,
+            latency=int(fields[b"latency_us"]) / 1e6,
+        )
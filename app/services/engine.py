@@ -1,56 +1,232 @@
 import asyncio
+import time
+from functools import partial
 
+from app.core.clock import Clock, Sleep
 from app.core.logging import logger
+from app.core.metrics import ENGINE_STEP_SECONDS, ENGINE_TICK_SECONDS, STRATEGY_DECISIONS_TOTAL, metrics
+from app.models.spotify import AudioFeatures, PlaybackState, SpotifyTrack
+from app.models.strategy import StrategyConfig
+from app.services.decision_cache import DecisionCache, decision_fingerprint
+from app.services.decision_log import DecisionLog
+from app.services.lookahead import QueueLookahead, SkipStats
+from app.services.polling import PollScheduler, FixedPollScheduler
 from app.services.spotify.base import SpotifyService
 from app.services.strategy_manager import StrategyManager
-from app.strategies.base import StrategyAction
-from app.strategies.strategy_factory import StrategyFactory
+from app.services.strategy_resolver import ActiveStrategyResolver
+from app.strategies.base import PlaybackStrategy, StrategyAction
+from app.strategies.chain import StrategyChain
+
+
+class TickContext:
+    """State of one engine tick, handed from step to step"""
+    __slots__ = ("playback", "track", "config", "strategy", "fingerprint", "action", "preemptive", "cached", "started")
+
+    def __init__(self):
+        self.playback: PlaybackState | None = None
+        self.track: SpotifyTrack | None = None
+        self.config: StrategyConfig | None = None
+        self.strategy: PlaybackStrategy | None = None
+        self.fingerprint: str | None = None
+        self.action: StrategyAction | None = None
+        self.preemptive = False
+        self.cached = False
+        self.started = time.perf_counter()
 
 
 class SyncStreamEngine:
     """
     The SyncStream Architect Engine.
     It polls the current playback and applies the active strategy policy.
+    A tick runs TICK_STEPS in order, each returning False to end the tick early;
+    an EnginePipeline runs the same steps as separate concurrent stages.
     """
-    def __init__(self, spotify: SpotifyService, strategy_manager: StrategyManager, poll_interval: int = 10):
+    # Bounds back-to-back queue refreshes when a whole queue is rejected
+    MAX_SKIP_ROUNDS = 3
+    TICK_STEPS = ("poll_playback", "resolve_strategy", "fetch_features", "decide", "act")
+    _step_histograms = [(step, ENGINE_STEP_SECONDS.labels(step)) for step in TICK_STEPS]
+
+    def __init__(self, spotify: SpotifyService, strategy_manager: StrategyManager, poll_interval: int = 10,
+                 poll_scheduler: PollScheduler | None = None, strategy_resolver: ActiveStrategyResolver | None = None,
+                 lookahead: QueueLookahead | None = None, decision_cache: DecisionCache | None = None,
+                 decision_log: DecisionLog | None = None, clock: Clock = time.monotonic, sleep: Sleep | None = None):
         self.spotify = spotify
         self.strategy_manager = strategy_manager
+        self.strategy_resolver = strategy_resolver or ActiveStrategyResolver(strategy_manager)
         self.poll_interval = poll_interval
+        self.poll_scheduler = poll_scheduler or FixedPollScheduler(poll_interval)
+        self.lookahead = lookahead
+        self.decision_cache = decision_cache
+        self.decision_log = decision_log
+        # A VirtualClock and its sleep run the engine on simulated time
+        self.clock = clock
+        self.sleep = sleep or self._sleep_until_stopped
+        self.skip_stats = SkipStats()
+        self.current_playback: PlaybackState | None = None
+        self.last_action: StrategyAction | None = None
+        self._polled_at = 0.0
         self._stop_event = asyncio.Event()
 
+    @property
+    def polls_avoided(self) -> int:
+        """Number of playback polls saved by the poll scheduler"""
+        return self.poll_scheduler.polls_avoided
+
     async def run(self):
-        logger.info("Engine lifecycle started", provider=type(self.spotify).__name__, interval=f"{self.poll_interval}s")
+        logger.info("Engine lifecycle started", provider=type(self.spotify).__name__,
+                    interval=f"{self.poll_interval}s", scheduler=type(self.poll_scheduler).__name__)
 
         while not self._stop_event.is_set():
             try:
                 await self.apply_strategy()
-                await asyncio.sleep(self.poll_interval)
+                await self.sleep(self.next_poll_delay())
             except Exception as e:
                 logger.error("Engine encountered an error during execution", error=str(e))
-                await asyncio.sleep(self.poll_interval)
+                await self.sleep(self.poll_interval)
+
+    def stop(self):
+        """Signals the engine loop to exit, interrupting the wait for the next poll"""
+        self._stop_event.set()
 
+    async def _sleep_until_stopped(self, delay: float):
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def next_poll_delay(self) -> float:
+        """Seconds to wait before the next poll, based on the last observed playback"""
+        delay = self.poll_scheduler.next_delay(self.current_playback, self.last_action)
+        playback = self.current_playback
+        if (self.lookahead and self.last_action == StrategyAction.KEEP and playback and playback.item
+                and self.lookahead.next_is_rejected(playback.item.id)):
+            # Wake up right as the known-bad next track starts
+            remaining = (playback.item.duration_ms - (playback.progress_ms or 0)) / 1000
+            remaining -= self.clock() - self._polled_at
+            delay = min(delay, max(remaining, 0.0) + self.lookahead.boundary_margin)
+        return delay
 
     async def apply_strategy(self):
         """Evaluates the current track against active strategies and takes action."""
+        tick = TickContext()
+        if not metrics.enabled:
+            for step in self.TICK_STEPS:
+                if not await getattr(self, step)(tick):
+                    return
+            return
+
+        started = time.perf_counter()
+        try:
+            for step, histogram in self._step_histograms:
+                step_started = time.perf_counter()
+                proceed = await getattr(self, step)(tick)
+                histogram.observe(time.perf_counter() - step_started)
+                if not proceed:
+                    return
+        finally:
+            ENGINE_TICK_SECONDS.observe(time.perf_counter() - started)
+
+    async def poll_playback(self, tick: TickContext) -> bool:
+        self.last_action = None
         playback = await self.spotify.get_current_playback()
+        self._polled_at = self.clock()
+        self.current_playback = playback
         if not playback or not playback.item or not playback.is_playing:
             logger.info("No active playback found or playback is paused")
-            return
-
-        track = playback.item
+            return False
+        tick.playback, tick.track = playback, playback.item
+        return True
 
-        active_strategy = await self.strategy_manager.get_active_strategy()
-        if not active_strategy:
+    async def resolve_strategy(self, tick: TickContext) -> bool:
+        tick.config, tick.strategy = await self.strategy_resolver.resolve()
+        if not tick.config:
             logger.warn("No active strategy configured")
-            return
+            return False
 
-        if not track.features:
-            track.features = await self.spotify.get_audio_features(track.id)
-            if not track.features:
-                logger.warning("Missing audio features, cannot evaluate strategy", track_id=track.id)
-                return
+        # A verdict computed while the track was still queued saves the features fetch and evaluation
+        if self.lookahead:
+            tick.action = self.lookahead.verdict(tick.track.id, tick.strategy)
+            tick.preemptive = tick.action is not None
+        if tick.action is None and self.decision_cache:
+            tick.fingerprint = decision_fingerprint(tick.config, tick.strategy)
+            tick.action = await self.decision_cache.get(tick.track.id, tick.fingerprint, tick.config.id)
+            tick.cached = tick.action is not None
+        return True
 
-        action = await StrategyFactory.make(active_strategy).evaluate(track)
-        if action == StrategyAction.SKIP:
-            logger.info("Policy violated, skipping track", track_name=track.name, track_id=track.id, strategy=active_strategy.__class__.__name__)
+    async def fetch_features(self, tick: TickContext) -> bool:
+        # Chains fetch lazily, only if no metadata-only rule has decided first
+        if tick.action is not None or isinstance(tick.strategy, StrategyChain):
+            return True
+        if getattr(tick.strategy, "needs_features", True) and not tick.track.features:
+            return await self._load_features(tick.track) is not None
+        return True
+
+    async def decide(self, tick: TickContext) -> bool:
+        if tick.action is not None:
+            return True
+        tick.action = await self._evaluate(tick.track, tick.strategy)
+        if tick.action is None:
+            return False
+        # A keep decided without the features the strategy needs may not hold once they exist
+        complete = tick.track.features or not getattr(tick.strategy, "needs_features", True)
+        if self.decision_cache and (tick.action == StrategyAction.SKIP or complete):
+            await self.decision_cache.put(tick.track.id, tick.fingerprint, tick.action)
+        return True
+
+    async def act(self, tick: TickContext) -> bool:
+        track, strategy = tick.track, tick.strategy
+        self.last_action = tick.action
+        if metrics.enabled:
+            STRATEGY_DECISIONS_TOTAL.labels(tick.config.id, tick.action.value).inc()
+        if self.decision_log:
+            source = "lookahead" if tick.preemptive else "cache" if tick.cached else "live"
+            self.decision_log.append(track.id, tick.config, strategy, tick.fingerprint, tick.action, source,
+                                     track.features, time.perf_counter() - tick.started)
+        if tick.action == StrategyAction.SKIP:
+            logger.info("Policy violated, skipping track", track_name=track.name, track_id=track.id,
+                        strategy=tick.config.id, preemptive=tick.preemptive)
+            self.skip_stats.record((tick.playback.progress_ms or 0) / 1000 + self.clock() - self._polled_at)
+            self.skip_stats.preemptive += tick.preemptive
             await self.spotify.skip_next()
+            if self.lookahead:
+                await self._skip_known_rejects(track.id, strategy)
+        elif self.lookahead and self.lookahead.is_stale(track.id):
+            await self.lookahead.refresh(strategy)
+        return True
+
+    async def _skip_known_rejects(self, skipped_id: str, strategy: PlaybackStrategy):
+        """
+        Skips the tracks after `skipped_id` that are already known to be rejected, before they
+        start, then re-reads the queue so a rejected track we land on is skipped right away too.
+        """
+        current_id = skipped_id
+        for _ in range(self.MAX_SKIP_ROUNDS):
+            # Only a snapshot read while `current_id` played tells what follows it in the player queue
+            if not self.lookahead.is_stale(current_id):
+                for _ in range(self.lookahead.rejected_after(current_id)):
+                    await self._chain_skip()
+            await self.lookahead.refresh(strategy)
+            current_id = self.lookahead.current_id
+            if current_id is None or self.lookahead.verdict(current_id, strategy) != StrategyAction.SKIP:
+                return
+            await self._chain_skip()
+
+    async def _chain_skip(self):
+        await self.spotify.skip_next()
+        self.skip_stats.record(0.0)
+        self.skip_stats.chained += 1
+
+    async def _evaluate(self, track: SpotifyTrack, strategy: PlaybackStrategy) -> StrategyAction | None:
+        """Evaluates the current track live; None when it cannot be evaluated"""
+        if isinstance(strategy, StrategyChain):
+            # Fetches features only if no metadata-only rule has decided first
+            return await strategy.decide(track, partial(self._load_features, track))
+        if getattr(strategy, "needs_features", True) and not track.features and not await self._load_features(track):
+            return None
+        return await strategy.evaluate(track)
+
+    async def _load_features(self, track: SpotifyTrack) -> AudioFeatures | None:
+        track.features = await self.spotify.get_audio_features(track.id)
+        if not track.features:
+            logger.warning("Missing audio features, cannot evaluate strategy", track_id=track.id)
+        return track.features
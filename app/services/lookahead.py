@@ -0,0 +1,123 @@
+from collections import OrderedDict
+
+from app.core.logging import logger
+from app.models.spotify import SpotifyTrack
+from app.services.spotify.base import SpotifyService
+from app.strategies.base import PlaybackStrategy, StrategyAction
+
+
+class SkipStats:
+    """
+    How long rejected tracks were audible before their skip was issued.
+    Preemptive skips used a verdict computed while the track was still queued; tracks
+    skipped in a chain never started and count as zero.
+    """
+
+    def __init__(self):
+        self.rejected = 0
+        self.audible_total = 0.0
+        self.preemptive = 0
+        self.chained = 0
+
+    def record(self, audible: float):
+        self.rejected += 1
+        self.audible_total += audible
+
+    @property
+    def avg_audible_ms(self) -> float:
+        return self.audible_total / self.rejected * 1000 if self.rejected else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "rejected_tracks": self.rejected,
+            "avg_rejected_audible_ms": round(self.avg_audible_ms, 1),
+            "preemptive_skips": self.preemptive,
+            "chained_skips": self.chained,
+        }
+
+
+class QueueLookahead:
+    """
+    Pre-evaluates the next `depth` tracks of the user's queue: one queue request, one
+    batched features request for the tracks not seen yet, then a verdict per track.
+    The engine uses the verdicts to skip a known-bad track the moment it becomes current,
+    and to chain skips over consecutive bad tracks at the head of the queue.
+    """
+
+    def __init__(self, spotify: SpotifyService, depth: int = 5, boundary_margin: float = 0.5, max_verdicts: int = 1000):
+        self.spotify = spotify
+        self.depth = depth
+        self.boundary_margin = boundary_margin
+        self.max_verdicts = max_verdicts
+        # None stands for a queued item that is not a track, it is never skipped in a chain
+        self.upcoming: list[SpotifyTrack | None] = []
+        self._current_id: str | None = None
+        self._strategy: PlaybackStrategy | None = None
+        self._verdicts: OrderedDict[str, StrategyAction] = OrderedDict()
+
+    def _use(self, strategy: PlaybackStrategy):
+        # Verdicts only hold for the strategy that produced them
+        if strategy is not self._strategy:
+            self._verdicts.clear()
+            self.forget_queue()
+            self._strategy = strategy
+
+    def verdict(self, track_id: str, strategy: PlaybackStrategy) -> StrategyAction | None:
+        """The pre-computed action for a track, if it was evaluated with the same strategy"""
+        self._use(strategy)
+        return self._verdicts.get(track_id)
+
+    @property
+    def current_id(self) -> str | None:
+        """The track that was playing when the queue was last read"""
+        return self._current_id
+
+    def is_stale(self, current_id: str) -> bool:
+        return current_id != self._current_id
+
+    def rejected_after(self, current_id: str) -> int:
+        """Number of consecutive known-bad tracks queued right after `current_id`"""
+        sequence = [self._current_id] + [track.id if track else None for track in self.upcoming]
+        if current_id not in sequence:
+            return 0
+        count = 0
+        for track_id in sequence[sequence.index(current_id) + 1:]:
+            if self._verdicts.get(track_id) != StrategyAction.SKIP:
+                break
+            count += 1
+        return count
+
+    def next_is_rejected(self, current_id: str) -> bool:
+        return self.rejected_after(current_id) > 0
+
+    def forget_queue(self):
+        """The queue moved on (e.g. after skips); keep verdicts but drop the snapshot"""
+        self.upcoming = []
+        self._current_id = None
+
+    async def refresh(self, strategy: PlaybackStrategy):
+        """Fetches the queue and evaluates the current and upcoming tracks that have no verdict yet"""
+        self._use(strategy)
+
+        queue = await self.spotify.get_queue()
+        if not queue or not queue.currently_playing:
+            self.forget_queue()
+            return
+        self.upcoming = queue.queue[:self.depth]
+        self._current_id = queue.currently_playing.id
+
+        candidates = [queue.currently_playing] + [track for track in self.upcoming if track is not None]
+        pending = {track.id: track for track in candidates if track.id not in self._verdicts}
+        if not pending:
+            return
+        features = await self.spotify.get_audio_features_batch(list(pending))
+        for track_id, track in pending.items():
+            track.features = track.features or features.get(track_id)
+            if not track.features and getattr(strategy, "needs_features", True):
+                continue  # Decided live, the way the engine would
+            self._verdicts[track_id] = await strategy.evaluate(track)
+            self._verdicts.move_to_end(track_id)
+        while len(self._verdicts) > self.max_verdicts:
+            self._verdicts.popitem(last=False)
+        logger.debug("Queue pre-evaluated", upcoming=len(self.upcoming), evaluated=len(pending),
+                     rejected_next=self.rejected_after(self._current_id))
@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+from app.core.logging import logger
+from app.services.engine import SyncStreamEngine, TickContext
+
+
+class StageStats:
+    """
+    Time a stage spent working and the time ticks spent waiting in its queue
+    """
+
+    def __init__(self):
+        self.processed = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.wait_time = 0.0
+        self.max_depth = 0
+
+    @property
+    def avg_busy(self) -> float:
+        return self.busy_time / self.processed if self.processed else 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.wait_time / self.processed if self.processed else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "processed": self.processed,
+            "errors": self.errors,
+            "busy_ms": round(self.busy_time * 1000, 1),
+            "avg_busy_ms": round(self.avg_busy * 1000, 3),
+            "avg_wait_ms": round(self.avg_wait * 1000, 3),
+            "max_depth": self.max_depth,
+        }
+
+
+class PendingTick:
+    __slots__ = ("engine", "context", "done", "queued_at")
+
+    def __init__(self, engine: SyncStreamEngine, done: asyncio.Future):
+        self.engine = engine
+        self.context = TickContext()
+        self.done = done
+        self.queued_at = 0.0
+
+
+class Stage:
+    """One engine step, run by `concurrency` workers off a bounded queue"""
+
+    def __init__(self, step: str, concurrency: int, queue_size: int):
+        if concurrency < 1:
+            raise ValueError(f"Stage '{step}' needs at least one worker")
+        self.step = step
+        self.concurrency = concurrency
+        self.queue: asyncio.Queue[PendingTick] = asyncio.Queue(maxsize=queue_size)
+        self.stats = StageStats()
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    async def put(self, pending: PendingTick):
+        """Waits while the queue is full, which holds the upstream worker back"""
+        pending.queued_at = time.perf_counter()
+        await self.queue.put(pending)
+        self.stats.max_depth = max(self.stats.max_depth, self.queue.qsize())
+
+    def as_dict(self) -> dict:
+        return {"concurrency": self.concurrency, "depth": self.depth, **self.stats.as_dict()}
+
+
+class EnginePipeline:
+    """
+    Runs engine ticks as a pipeline of stages, one per SyncStreamEngine.TICK_STEPS step,
+    connected by bounded queues. Each stage has its own worker count, so a slow step
+    (e.g. the audio features fetch) gets more concurrency without letting the others
+    flood the API, and a full queue blocks the stage before it (backpressure).
+    Ticks of many sessions overlap; a single engine must not have two ticks in flight.
+    Once stopped, the pipeline takes no new ticks, and ticks it could not finish fail.
+    """
+
+    def __init__(self, concurrency: int | dict[str, int] = 1, queue_size: int = 100):
+        per_step = concurrency if isinstance(concurrency, dict) else {}
+        default = concurrency if isinstance(concurrency, int) else 1
+        unknown = set(per_step) - set(SyncStreamEngine.TICK_STEPS)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stages: {sorted(unknown)}")
+        self.stages = [Stage(step, per_step.get(step, default), queue_size) for step in SyncStreamEngine.TICK_STEPS]
+        self.ticks = 0
+        self.latency_total = 0.0
+        self._stop_event = asyncio.Event()
+        self._in_flight: set[PendingTick] = set()
+
+    def stage(self, step: str) -> Stage:
+        return next(stage for stage in self.stages if stage.step == step)
+
+    async def run_tick(self, engine: SyncStreamEngine):
+        """Submits one tick of `engine` and waits until it has gone through every stage it needs"""
+        if self._stop_event.is_set():
+            raise RuntimeError("Engine pipeline is stopped")
+        started = time.perf_counter()
+        pending = PendingTick(engine, asyncio.get_running_loop().create_future())
+        self._in_flight.add(pending)
+        try:
+            await self.stages[0].put(pending)
+            await pending.done
+        finally:
+            self._in_flight.discard(pending)
+        self.ticks += 1
+        self.latency_total += time.perf_counter() - started
+
+    async def run(self):
+        workers = [asyncio.create_task(self._work(index)) for index, stage in enumerate(self.stages)
+                   for _ in range(stage.concurrency)]
+        logger.info("Engine pipeline started", stages={stage.step: stage.concurrency for stage in self.stages})
+        try:
+            await self._stop_event.wait()
+            # Lets the ticks already submitted finish, stage by stage
+            for stage in self.stages:
+                await stage.queue.join()
+        finally:
+            self._stop_event.set()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._abandon()
+        logger.info("Engine pipeline stopped", ticks=self.ticks)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _abandon(self):
+        """Fails the ticks left unfinished (e.g. when `run` is cancelled) and empties the queues"""
+        for pending in self._in_flight:
+            if not pending.done.done():
+                pending.done.set_exception(RuntimeError("Engine pipeline stopped before the tick completed"))
+        for stage in self.stages:
+            while not stage.queue.empty():
+                stage.queue.get_nowait()
+                stage.queue.task_done()
+
+    async def _work(self, index: int):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            pending = await stage.queue.get()
+            started = time.perf_counter()
+            stage.stats.wait_time += started - pending.queued_at
+            try:
+                proceed = await getattr(pending.engine, stage.step)(pending.context)
+            except Exception as e:
+                stage.stats.errors += 1
+                proceed = False
+                if not pending.done.done():
+                    pending.done.set_exception(e)
+            stage.stats.processed += 1
+            stage.stats.busy_time += time.perf_counter() - started
+
+            if proceed and next_stage is not None:
+                await next_stage.put(pending)
+            elif not pending.done.done():
+                pending.done.set_result(None)
+            # Only once the tick is handed over, so joining the stages in order drains the pipeline
+            stage.queue.task_done()
+
+    def as_dict(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "avg_tick_ms": round(self.latency_total / self.ticks * 1000, 3) if self.ticks else 0.0,
+            "stages": {stage.step: stage.as_dict() for stage in self.stages},
+        }
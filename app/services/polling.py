@@ -0,0 +1,94 @@
+from typing import Protocol
+
+from app.core.config import Settings
+from app.models.spotify import PlaybackState
+from app.strategies.base import StrategyAction
+
+
+class PollScheduler(Protocol):
+    """
+    Decides how long the engine waits before the next playback poll
+    """
+    polls_avoided: int
+
+    def next_delay(self, playback: PlaybackState | None, action: StrategyAction | None) -> float:
+        """Returns the delay in seconds until the next poll"""
+
+
+class FixedPollScheduler:
+    """
+    Polls on a constant interval, regardless of what is playing
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.polls_avoided = 0
+
+    def next_delay(self, playback: PlaybackState | None, action: StrategyAction | None) -> float:
+        return self.interval
+
+
+class AdaptivePollScheduler:
+    """
+    Times polls around track boundaries instead of a fixed interval.
+    - Playing: wake up just after the current track is expected to end (capped by max_interval).
+    - Skipped: poll quickly to pick up the next track.
+    - Idle/paused: back off exponentially up to max_idle_interval.
+    """
+
+    def __init__(
+        self,
+        base_interval: float,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        max_idle_interval: float = 60.0,
+        boundary_margin: float = 0.5,
+    ):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_idle_interval = max_idle_interval
+        self.boundary_margin = boundary_margin
+        self._idle_streak = 0
+        self._avoided = 0.0
+
+    @property
+    def polls_avoided(self) -> int:
+        """Net number of polls saved compared to polling every base_interval"""
+        return max(0, round(self._avoided))
+
+    def next_delay(self, playback: PlaybackState | None, action: StrategyAction | None) -> float:
+        if action == StrategyAction.SKIP:
+            self._idle_streak = 0
+            delay = self.min_interval
+        elif not playback or not playback.item or not playback.is_playing:
+            self._idle_streak += 1
+            delay = min(self.base_interval * 2 ** (self._idle_streak - 1), self.max_idle_interval)
+        else:
+            self._idle_streak = 0
+            delay = self._until_track_boundary(playback)
+
+        self._avoided += delay / self.base_interval - 1
+        return delay
+
+    def _until_track_boundary(self, playback: PlaybackState) -> float:
+        if playback.progress_ms is None or not playback.item.duration_ms:
+            return self.base_interval
+        remaining_ms = max(playback.item.duration_ms - playback.progress_ms, 0)
+        delay = remaining_ms / 1000 + self.boundary_margin
+        return min(max(delay, self.min_interval), self.max_interval)
+
+
+def build_poll_scheduler(settings: Settings) -> PollScheduler:
+    """Instantiates the poll scheduler for the configured engine poll mode"""
+    if settings.ENGINE_POLL_MODE == "fixed":
+        return FixedPollScheduler(settings.ENGINE_POLL_INTERVAL)
+    if settings.ENGINE_POLL_MODE == "adaptive":
+        return AdaptivePollScheduler(
+            base_interval=settings.ENGINE_POLL_INTERVAL,
+            min_interval=settings.ENGINE_MIN_POLL_INTERVAL,
+            max_interval=settings.ENGINE_MAX_POLL_INTERVAL,
+            max_idle_interval=settings.ENGINE_MAX_IDLE_INTERVAL,
+            boundary_margin=settings.ENGINE_TRACK_BOUNDARY_MARGIN,
+        )
+    raise ValueError(f"Unknown engine poll mode: '{settings.ENGINE_POLL_MODE}'")
@@ -3,14 +3,16 @@ import asyncio
 from app.core.logging import logger
 
 
-async def refresh_token_task(spotify_service, interval_seconds: int = 2700):
+async def refresh_token_task(spotify_service, retry_interval: int = 30):
     """
-    Periodically refreshes the Spotify access token
+    Keeps the Spotify access token warm: wakes up when the token enters its refresh window
+    (shortly before it expires) so requests never wait for a refresh
     """
     while True:
         try:
-            await spotify_service.apply_refresh_token()
-            logger.info("Spotify access token refreshed successfully")
+            await spotify_service.tokens.get_token()
+            delay = max(spotify_service.tokens.seconds_until_refresh(), 1)
         except Exception as e:
             logger.error(f"Error refreshing Spotify access token: {e}")
-        await asyncio.sleep(interval_seconds)
\ No newline at end of file
+            delay = retry_interval
+        await asyncio.sleep(delay)
@@ -0,0 +1,182 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Callable
+
+from app.core.logging import logger
+from app.services.engine import SyncStreamEngine
+from app.services.pipeline import EnginePipeline
+
+
+class UserSession:
+    """
+    A single listener scheduled by the SessionScheduler.
+    Kept deliberately small: the engine holds the per-user state.
+    """
+    __slots__ = ("user_id", "engine", "next_due", "generation", "ticks")
+
+    def __init__(self, user_id: str, engine: SyncStreamEngine):
+        self.user_id = user_id
+        self.engine = engine
+        self.next_due = 0.0
+        # Stamp of the session's live heap entry, older entries of the same user are stale
+        self.generation = 0
+        self.ticks = 0
+
+
+class SchedulerStats:
+    """
+    Tick counters and scheduling jitter (how late a tick started compared to its due time)
+    """
+
+    def __init__(self, sample_size: int = 10_000):
+        self.ticks = 0
+        self.errors = 0
+        self.not_owned = 0
+        self.lateness_total = 0.0
+        self.lateness_max = 0.0
+        self.lateness_samples: deque[float] = deque(maxlen=sample_size)
+
+    def record_tick(self, lateness: float):
+        self.ticks += 1
+        self.lateness_total += lateness
+        self.lateness_max = max(self.lateness_max, lateness)
+        self.lateness_samples.append(lateness)
+
+    def lateness_percentile(self, percentile: float) -> float:
+        """Returns the lateness percentile (0-100) over the most recent ticks, in seconds"""
+        if not self.lateness_samples:
+            return 0.0
+        samples = sorted(self.lateness_samples)
+        index = min(int(len(samples) * percentile / 100), len(samples) - 1)
+        return samples[index]
+
+    def as_dict(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "errors": self.errors,
+            "not_owned": self.not_owned,
+            "lateness_avg_ms": (self.lateness_total / self.ticks * 1000) if self.ticks else 0.0,
+            "lateness_p99_ms": self.lateness_percentile(99) * 1000,
+            "lateness_max_ms": self.lateness_max * 1000,
+        }
+
+
+class SessionScheduler:
+    """
+    Runs many user sessions on a single event loop.
+    Sessions are kept in a min-heap keyed by their next due time; each due session
+    runs one engine tick, and the engine's poll scheduler decides when it is due again.
+    At most `max_concurrent_ticks` ticks are in flight at any time.
+    When `is_owned` is given (e.g. ShardLeaseManager.owns), sessions owned by another
+    replica are not ticked, only rescheduled.
+    With a `pipeline`, ticks go through its stages instead of running apply_strategy directly.
+    """
+
+    def __init__(self, max_concurrent_ticks: int = 100, clock: Callable[[], float] = time.monotonic,
+                 is_owned: Callable[[str], bool] | None = None, pipeline: EnginePipeline | None = None):
+        self.max_concurrent_ticks = max_concurrent_ticks
+        self.clock = clock
+        self.is_owned = is_owned
+        self.pipeline = pipeline
+        self.stats = SchedulerStats()
+        self._sessions: dict[str, UserSession] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        # Unique across sessions, so a removed session's entry never matches one re-added for the same user
+        self._generations = itertools.count(1)
+        self._slots = asyncio.Semaphore(max_concurrent_ticks)
+        self._wakeup = asyncio.Event()
+        self._stop_event = asyncio.Event()
+        self._in_flight: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._sessions
+
+    def add_session(self, user_id: str, engine: SyncStreamEngine, delay: float = 0.0):
+        """Registers a user session, first due after `delay` seconds"""
+        if user_id in self._sessions:
+            raise ValueError(f"Session for user '{user_id}' is already scheduled")
+        session = UserSession(user_id, engine)
+        self._sessions[user_id] = session
+        self._schedule(session, self.clock() + delay)
+
+    def remove_session(self, user_id: str) -> SyncStreamEngine | None:
+        """Unregisters a user session; its pending heap entry is discarded lazily"""
+        session = self._sessions.pop(user_id, None)
+        return session.engine if session else None
+
+    def get_session(self, user_id: str) -> UserSession | None:
+        return self._sessions.get(user_id)
+
+    def _schedule(self, session: UserSession, due: float):
+        session.generation = next(self._generations)
+        session.next_due = due
+        wake = not self._heap or due < self._heap[0][0]
+        heapq.heappush(self._heap, (due, session.generation, session.user_id))
+        if wake:
+            self._wakeup.set()
+
+    def _pop_due(self, now: float) -> UserSession | None:
+        """Pops the next due session, skipping entries of removed or rescheduled sessions"""
+        while self._heap and self._heap[0][0] <= now:
+            _, generation, user_id = heapq.heappop(self._heap)
+            session = self._sessions.get(user_id)
+            if session and session.generation == generation:
+                return session
+        return None
+
+    async def run(self):
+        logger.info("Session scheduler started", sessions=len(self._sessions), max_concurrent_ticks=self.max_concurrent_ticks)
+        while not self._stop_event.is_set():
+            self._wakeup.clear()
+            now = self.clock()
+            session = self._pop_due(now)
+            if session is None:
+                timeout = self._heap[0][0] - now if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._slots.acquire()
+            task = asyncio.create_task(self._tick(session, session.next_due))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        logger.info("Session scheduler stopped")
+
+    def stop(self):
+        self._stop_event.set()
+        self._wakeup.set()
+
+    async def _tick(self, session: UserSession, due: float):
+        engine = session.engine
+        try:
+            if self.is_owned is not None and not self.is_owned(session.user_id):
+                self.stats.not_owned += 1
+                delay = engine.poll_interval
+            else:
+                self.stats.record_tick(max(self.clock() - due, 0.0))
+                if self.pipeline is not None:
+                    await self.pipeline.run_tick(engine)
+                else:
+                    await engine.apply_strategy()
+                delay = engine.next_poll_delay()
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error("Session tick failed", user_id=session.user_id, error=str(e))
+            delay = engine.poll_interval
+        finally:
+            self._slots.release()
+
+        session.ticks += 1
+        if self._sessions.get(session.user_id) is session:
+            self._schedule(session, self.clock() + delay)
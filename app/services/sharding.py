@@ -0,0 +1,158 @@
+import asyncio
+import os
+import socket
+import time
+import zlib
+
+from app.core.logging import logger
+from app.core.redis import redis_manager
+
+# One round trip per renewal cycle, whatever the shard count: the script heartbeats the
+# replica, renews the leases it holds, releases any surplus above its fair share and
+# claims free or expired shards up to that share.
+#
+# KEYS[1] = leases hash (field = shard, value = "<replica>|<expires_at_ms>")
+# KEYS[2] = replicas sorted set (score = heartbeat expiry in ms)
+# ARGV    = replica_id, ttl_ms, num_shards
+# HSET is called in chunks of 500 leases, since unpack is limited by the Lua stack size
+LEASE_CYCLE_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local replica = ARGV[1]
+local ttl = tonumber(ARGV[2])
+local num_shards = tonumber(ARGV[3])
+
+redis.call('ZADD', KEYS[2], now + ttl, replica)
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+local target = math.ceil(num_shards / math.max(redis.call('ZCARD', KEYS[2]), 1))
+
+local leases = redis.call('HGETALL', KEYS[1])
+local owners = {}
+for i = 1, #leases, 2 do
+    local sep = string.find(leases[i + 1], '|', 1, true)
+    local expires_at = tonumber(string.sub(leases[i + 1], sep + 1))
+    if expires_at > now then
+        owners[tonumber(leases[i])] = string.sub(leases[i + 1], 1, sep - 1)
+    end
+end
+
+local owned = {}
+local free = {}
+for shard = 0, num_shards - 1 do
+    if owners[shard] == replica then
+        table.insert(owned, shard)
+    elseif owners[shard] == nil then
+        table.insert(free, shard)
+    end
+end
+
+while #owned > target do
+    redis.call('HDEL', KEYS[1], table.remove(owned))
+end
+for _, shard in ipairs(free) do
+    if #owned >= target then break end
+    table.insert(owned, shard)
+end
+
+local lease = replica .. '|' .. (now + ttl)
+local fields = {}
+for _, shard in ipairs(owned) do
+    table.insert(fields, shard)
+    table.insert(fields, lease)
+end
+for first = 1, #fields, 1000 do
+    redis.call('HSET', KEYS[1], unpack(fields, first, math.min(first + 999, #fields)))
+end
+return owned
+"""
+
+# Drops every lease held by the replica, used on graceful shutdown
+RELEASE_SCRIPT = """
+local leases = redis.call('HGETALL', KEYS[1])
+local prefix = ARGV[1] .. '|'
+for i = 1, #leases, 2 do
+    if string.sub(leases[i + 1], 1, #prefix) == prefix then
+        redis.call('HDEL', KEYS[1], leases[i])
+    end
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+return 1
+"""
+
+
+def shard_for(user_id: str, num_shards: int) -> int:
+    """Maps a user to a shard with a hash that is stable across processes"""
+    return zlib.crc32(user_id.encode("utf-8")) % num_shards
+
+
+class ShardLeaseManager:
+    """
+    Splits user sessions between replicas through TTL'd shard leases stored in Redis.
+    Each replica periodically runs a single lease cycle script; shards of a replica
+    that stops renewing expire and are claimed by the others.
+    """
+
+    LEASES_KEY = "shards:leases"
+    REPLICAS_KEY = "shards:replicas"
+
+    def __init__(self, num_shards: int = 64, lease_ttl: float = 10.0, renew_interval: float = 3.0,
+                 replica_id: str | None = None):
+        if renew_interval >= lease_ttl:
+            raise ValueError("Lease renew interval must be shorter than the lease TTL")
+        self.num_shards = num_shards
+        self.lease_ttl = lease_ttl
+        self.renew_interval = renew_interval
+        self.replica_id = replica_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.owned_shards: frozenset[int] = frozenset()
+        self._valid_until = 0.0
+        self._stop_event = asyncio.Event()
+
+    def owns_shard(self, shard: int) -> bool:
+        """True while the shard lease is held and has not possibly expired on the server"""
+        return shard in self.owned_shards and time.monotonic() < self._valid_until
+
+    def owns(self, user_id: str) -> bool:
+        return self.owns_shard(shard_for(user_id, self.num_shards))
+
+    async def renew(self) -> frozenset[int]:
+        """Runs one lease cycle and returns the shards now owned by this replica"""
+        started = time.monotonic()
+        client = redis_manager.get_client()
+        script = client.register_script(LEASE_CYCLE_SCRIPT)
+        owned = await script(
+            keys=[self.LEASES_KEY, self.REPLICAS_KEY],
+            args=[self.replica_id, int(self.lease_ttl * 1000), self.num_shards],
+        )
+        owned = frozenset(int(shard) for shard in owned)
+        # Measured from before the call, so local ownership always ends before the server-side lease
+        self._valid_until = started + self.lease_ttl
+
+        if owned != self.owned_shards:
+            logger.info("Shard ownership changed", replica_id=self.replica_id,
+                        acquired=sorted(owned - self.owned_shards), released=sorted(self.owned_shards - owned))
+        self.owned_shards = owned
+        return owned
+
+    async def release(self):
+        """Gives up all leases so other replicas can take over immediately"""
+        client = redis_manager.get_client()
+        script = client.register_script(RELEASE_SCRIPT)
+        await script(keys=[self.LEASES_KEY, self.REPLICAS_KEY], args=[self.replica_id])
+        self.owned_shards = frozenset()
+        self._valid_until = 0.0
+        logger.info("Shard leases released", replica_id=self.replica_id)
+
+    async def run(self):
+        logger.info("Shard lease manager started", replica_id=self.replica_id, num_shards=self.num_shards)
+        while not self._stop_event.is_set():
+            try:
+                await self.renew()
+            except Exception as e:
+                logger.error("Shard lease renewal failed", replica_id=self.replica_id, error=str(e))
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), self.renew_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        self._stop_event.set()
@@ -1,5 +1,5 @@
 from typing import Protocol
-from app.models.spotify import PlaybackState, AudioFeatures
+from app.models.spotify import PlaybackState, AudioFeatures, SpotifyQueue
 
 
 class SpotifyService(Protocol):
@@ -10,8 +10,14 @@ class SpotifyService(Protocol):
     async def get_current_playback(self) -> PlaybackState | None:
         """GET /v1/me/player"""
 
+    async def get_queue(self) -> SpotifyQueue | None:
+        """GET /v1/me/player/queue"""
+
     async def get_audio_features(self, track_id: str) -> AudioFeatures | None:
         """GET /v1/audio-features/{id}"""
 
+    async def get_audio_features_batch(self, track_ids: list[str]) -> dict[str, AudioFeatures | None]:
+        """GET /v1/audio-features?ids={ids}"""
+
     async def skip_next(self) -> bool:
         """POST /v1/me/player/next"""
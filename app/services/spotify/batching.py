@@ -0,0 +1,102 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from app.core.logging import logger
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoaderStats:
+    """
+    Counters of the batch loader
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.keys_fetched = 0
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self.keys_fetched / self.batches if self.batches else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "keys_fetched": self.keys_fetched,
+            "avg_batch_size": round(self.avg_batch_size, 2),
+        }
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    DataLoader-style request coalescing.
+    Concurrent `load(key)` calls made within `max_wait` seconds of the first one are merged into
+    a single `batch_fn(keys)` call (at most `max_batch_size` keys, a full batch is sent right away).
+    Callers asking for a key that is already queued or in flight share the same future.
+    A lone request is therefore delayed by at most `max_wait`.
+    """
+
+    def __init__(self, batch_fn: Callable[[list[K]], Awaitable[dict[K, V]]], max_batch_size: int = 100,
+                 max_wait: float = 0.005):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.stats = BatchLoaderStats()
+        self._queued: dict[K, asyncio.Future] = {}
+        self._in_flight: dict[K, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V | None:
+        """Returns the value of a single key, fetched as part of a batch"""
+        self.stats.requests += 1
+        future = self._queued.get(key) or self._in_flight.get(key)
+        if future is not None:
+            self.stats.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._queued[key] = future
+            if len(self._queued) >= self.max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.max_wait, self._dispatch)
+        # Shielded, so a cancelled caller does not cancel the result other callers are waiting for
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._queued:
+            return
+        batch, self._queued = self._queued, {}
+        self._in_flight.update(batch)
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, asyncio.Future]):
+        self.stats.batches += 1
+        self.stats.keys_fetched += len(batch)
+        try:
+            results = await self.batch_fn(list(batch))
+        except Exception as e:
+            logger.warning("Batch load failed", keys=len(batch), error=str(e))
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Callers may all have been cancelled; don't warn about an unretrieved exception
+                    future.exception()
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(results.get(key))
+        finally:
+            for key in batch:
+                self._in_flight.pop(key, None)
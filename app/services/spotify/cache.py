@@ -0,0 +1,210 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from app.core.logging import logger
+from app.models.spotify import PlaybackState, AudioFeatures, SpotifyQueue
+from app.services.codec import NEGATIVE_ENTRY, AudioFeaturesCodec
+from app.services.spotify.base import SpotifyService
+from app.services.storage import StorageBackend, storage as default_storage
+
+
+class FeaturesCacheStats:
+    """
+    Hit/miss counters of the audio features cache
+    """
+
+    def __init__(self):
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.redis_errors = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.local_hits + self.redis_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.local_hits + self.redis_hits) / self.lookups if self.lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "redis_errors": self.redis_errors,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class CachedSpotifyService:
+    """
+    Wraps any SpotifyService with a two-tier audio features cache:
+    a bounded in-process LRU backed by a shared tier in the storage backend (Redis).
+    Audio features never change for a track id, and ids without features are cached
+    negatively (for `negative_ttl` seconds, in both tiers) so they are not fetched on
+    every poll either.
+    """
+
+    KEY_PREFIX = "spotify:features:"
+
+    def __init__(self, spotify: SpotifyService, max_entries: int = 10_000, use_redis: bool = True,
+                 ttl: int | None = 30 * 24 * 3600, negative_ttl: int = 3600, codec: AudioFeaturesCodec | None = None,
+                 clock: Callable[[], float] = time.monotonic, storage: StorageBackend | None = None):
+        self.spotify = spotify
+        self.storage = storage or default_storage
+        self.codec = codec or AudioFeaturesCodec()
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.stats = FeaturesCacheStats()
+        # track_id -> AudioFeatures, or None for a negative entry
+        self._local: OrderedDict[str, AudioFeatures | None] = OrderedDict()
+        # track_id -> expiry of its local negative entry
+        self._negative_expires: dict[str, float] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything that is not cached (e.g. apply_refresh_token) goes straight to the wrapped service
+        return getattr(self.spotify, name)
+
+    async def get_current_playback(self) -> PlaybackState | None:
+        return await self.spotify.get_current_playback()
+
+    async def get_queue(self) -> SpotifyQueue | None:
+        return await self.spotify.get_queue()
+
+    async def skip_next(self) -> bool:
+        return await self.spotify.skip_next()
+
+    async def get_audio_features(self, track_id: str) -> AudioFeatures | None:
+        if self._local_has(track_id):
+            self._local.move_to_end(track_id)
+            features = self._local[track_id]
+            self.stats.local_hits += 1
+            if features is None:
+                self.stats.negative_hits += 1
+            return features
+
+        found, features = await self._redis_get(track_id)
+        if found:
+            self.stats.redis_hits += 1
+            if features is None:
+                self.stats.negative_hits += 1
+            self._remember(track_id, features)
+            return features
+
+        self.stats.misses += 1
+        features = await self.spotify.get_audio_features(track_id)
+        self._remember(track_id, features)
+        await self._redis_set(track_id, features)
+        return features
+
+    async def get_audio_features_batch(self, track_ids: list[str]) -> dict[str, AudioFeatures | None]:
+        """Serves what it can from both tiers and fetches the remaining ids in one batch"""
+        results: dict[str, AudioFeatures | None] = {}
+        missing = []
+        for track_id in dict.fromkeys(track_ids):
+            if self._local_has(track_id):
+                self._local.move_to_end(track_id)
+                results[track_id] = self._local[track_id]
+                self.stats.local_hits += 1
+                if results[track_id] is None:
+                    self.stats.negative_hits += 1
+            else:
+                missing.append(track_id)
+
+        if missing:
+            for track_id, (found, features) in zip(missing, await self._redis_get_many(missing)):
+                if found:
+                    self.stats.redis_hits += 1
+                    if features is None:
+                        self.stats.negative_hits += 1
+                    results[track_id] = features
+                    self._remember(track_id, features)
+            missing = [track_id for track_id in missing if track_id not in results]
+
+        if missing:
+            self.stats.misses += len(missing)
+            fetched = await self.spotify.get_audio_features_batch(missing)
+            for track_id in missing:
+                results[track_id] = fetched.get(track_id)
+                self._remember(track_id, results[track_id])
+            await self._redis_set_many({track_id: results[track_id] for track_id in missing})
+        return results
+
+    def _local_has(self, track_id: str) -> bool:
+        """Whether the local tier holds the track, dropping its negative entry once expired"""
+        if track_id not in self._local:
+            return False
+        expires = self._negative_expires.get(track_id)
+        if expires is not None and expires <= self.clock():
+            del self._local[track_id]
+            del self._negative_expires[track_id]
+            return False
+        return True
+
+    def _remember(self, track_id: str, features: AudioFeatures | None):
+        self._local[track_id] = features
+        self._local.move_to_end(track_id)
+        if features is None:
+            self._negative_expires[track_id] = self.clock() + self.negative_ttl
+        else:
+            self._negative_expires.pop(track_id, None)
+        while len(self._local) > self.max_entries:
+            evicted, _ = self._local.popitem(last=False)
+            self._negative_expires.pop(evicted, None)
+            self.stats.evictions += 1
+
+    async def _redis_get(self, track_id: str) -> tuple[bool, AudioFeatures | None]:
+        return (await self._redis_get_many([track_id]))[0]
+
+    async def _redis_get_many(self, track_ids: list[str]) -> list[tuple[bool, AudioFeatures | None]]:
+        """Returns a (found, features) pair per track id"""
+        if not self.use_redis:
+            return [(False, None)] * len(track_ids)
+        try:
+            values = await self.storage.get_many([self.KEY_PREFIX + track_id for track_id in track_ids])
+        except Exception as e:
+            self.stats.redis_errors += 1
+            logger.warning("Audio features cache read failed", track_ids=len(track_ids), error=str(e))
+            return [(False, None)] * len(track_ids)
+        return [self._decode(track_id, value) for track_id, value in zip(track_ids, values)]
+
+    def _decode(self, track_id: str, value: bytes | None) -> tuple[bool, AudioFeatures | None]:
+        if value is None:
+            return False, None
+        if value == NEGATIVE_ENTRY.encode():
+            return True, None
+        try:
+            return True, self.codec.decode(track_id, value)
+        except Exception as e:
+            # A corrupt value, or one from an unknown codec version, is a miss; the fetch overwrites it
+            self.stats.redis_errors += 1
+            logger.warning("Audio features cache value unreadable", track_id=track_id, error=str(e))
+            return False, None
+
+    async def _redis_set(self, track_id: str, features: AudioFeatures | None):
+        await self._redis_set_many({track_id: features})
+
+    async def _redis_set_many(self, entries: dict[str, AudioFeatures | None]):
+        if not self.use_redis:
+            return
+        found = {self.KEY_PREFIX + track_id: self.codec.encode(features)
+                 for track_id, features in entries.items() if features is not None}
+        negative = {self.KEY_PREFIX + track_id: NEGATIVE_ENTRY
+                    for track_id, features in entries.items() if features is None}
+        try:
+            if found:
+                await self.storage.set_many(found, ttl=self.ttl)
+            if negative:
+                await self.storage.set_many(negative, ttl=self.negative_ttl)
+        except Exception as e:
+            self.stats.redis_errors += 1
+            logger.warning("Audio features cache write failed", track_ids=len(entries), error=str(e))
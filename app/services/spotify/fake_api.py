@@ -0,0 +1,241 @@
+"""
+Local stand-in for the Spotify Web API and accounts service, serving a synthetic
+ListenerPool over real HTTP so ProdSpotifyService can be load tested end to end.
+
+    uv run python -m app.services.spotify.fake_api --listeners 10000 --median-ms 40 --p99-ms 400 --rate-limit 500
+"""
+import argparse
+import asyncio
+import itertools
+import math
+import random
+import time
+from collections import Counter
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+from app.services.spotify.workload import ListenerPool, SyntheticCatalog
+
+REFRESH_TOKEN_PREFIX = "listener-"
+
+
+def refresh_token_for(listener: int) -> str:
+    """Refresh token the fake API maps to a listener of its pool"""
+    return f"{REFRESH_TOKEN_PREFIX}{listener}"
+
+
+class LatencyModel:
+    """Log-normal service time fitted to a median and a p99, in milliseconds"""
+
+    def __init__(self, median_ms: float = 0.0, p99_ms: float | None = None, rng: random.Random | None = None):
+        self.median = median_ms / 1000
+        self.sigma = math.log(p99_ms / median_ms) / 2.326 if median_ms and p99_ms and p99_ms > median_ms else 0.0
+        self._rng = rng or random.Random()
+
+    def sample(self) -> float:
+        if not self.median:
+            return 0.0
+        return self.median * math.exp(self.sigma * self._rng.gauss(0.0, 1.0))
+
+
+class FakeSpotifyAPI:
+    """
+    Serves /api/token, /v1/me/player, /v1/me/player/queue, /v1/me/player/next and
+    /v1/audio-features (single and batched) for the listeners of a pool.
+
+    Access tokens expire after `token_lifetime` seconds and are checked on every call;
+    expired ones are dropped as new ones are issued.
+    Before a request is served it waits for a `latency` sample; requests beyond the
+    `rate_limit` (requests/second over a `burst` bucket, shared by all users like
+    Spotify's per-app limit) get a 429 with Retry-After. On top, `error_rates` maps a
+    status (401, 429, 500, 503) to the share of requests that fail with it at random.
+    Served requests are counted by endpoint and status, see GET /stats.
+    """
+
+    def __init__(self, pool: ListenerPool, latency: LatencyModel | None = None,
+                 token_latency: LatencyModel | None = None, rate_limit: float = 0.0, burst: int = 100,
+                 error_rates: dict[int, float] | None = None, token_lifetime: int = 3600, seed: int | None = None):
+        self.pool = pool
+        self.latency = latency or LatencyModel()
+        self.token_latency = token_latency or LatencyModel()
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.error_rates = error_rates or {}
+        self.token_lifetime = token_lifetime
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(seed)
+        self._tokens: dict[str, tuple[int, float]] = {}  # access token -> (listener, expires at)
+        self._serial = itertools.count(1)
+        self._allowance = float(burst)
+        self._allowance_at = time.monotonic()
+
+    def _count(self, endpoint: str, status: int):
+        self.stats[f"{endpoint} {status}"] += 1
+
+    def _throttle(self) -> float:
+        """Seconds until the shared budget allows this request, 0 when it does"""
+        if not self.rate_limit:
+            return 0.0
+        now = time.monotonic()
+        self._allowance = min(self.burst, self._allowance + (now - self._allowance_at) * self.rate_limit)
+        self._allowance_at = now
+        if self._allowance < 1:
+            return (1 - self._allowance) / self.rate_limit
+        self._allowance -= 1
+        return 0.0
+
+    def _injected_error(self) -> int | None:
+        roll = self._rng.random()
+        for status, rate in self.error_rates.items():
+            if roll < rate:
+                return status
+            roll -= rate
+        return None
+
+    async def issue_token(self, request: Request) -> Response:
+        await asyncio.sleep(self.token_latency.sample())
+        form = parse_qs((await request.body()).decode())
+        refresh_token = form.get("refresh_token", [""])[0]
+        listener = refresh_token.removeprefix(REFRESH_TOKEN_PREFIX)
+        if form.get("grant_type") != ["refresh_token"] or not listener.isdigit() \
+                or int(listener) >= self.pool.listeners:
+            self._count("POST /api/token", 400)
+            return JSONResponse({"error": "invalid_grant"}, status_code=400)
+        now = time.monotonic()
+        # Tokens are issued with the same lifetime, so the expired ones are the oldest entries
+        while self._tokens:
+            oldest = next(iter(self._tokens))
+            if self._tokens[oldest][1] > now:
+                break
+            del self._tokens[oldest]
+        access_token = f"fake-{listener}-{next(self._serial)}"
+        self._tokens[access_token] = (int(listener), now + self.token_lifetime)
+        self._count("POST /api/token", 200)
+        return JSONResponse({"access_token": access_token, "token_type": "Bearer", "expires_in": self.token_lifetime})
+
+    async def _admit(self, request: Request, endpoint: str) -> tuple[int | None, Response | None]:
+        """Resolves the caller's listener, or the error response the request gets instead"""
+        await asyncio.sleep(self.latency.sample())
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        listener, expires_at = self._tokens.get(token, (None, 0.0))
+        status, headers = None, {}
+        if listener is None or expires_at <= time.monotonic():
+            self._tokens.pop(token, None)
+            status = 401
+        elif retry_after := self._throttle():
+            status, headers = 429, {"Retry-After": str(math.ceil(retry_after))}
+        else:
+            status = self._injected_error()
+            if status == 429:
+                headers = {"Retry-After": "1"}
+        if status is None:
+            return listener, None
+        self._count(endpoint, status)
+        return None, JSONResponse({"error": {"status": status, "message": "Fake API error"}},
+                                  status_code=status, headers=headers)
+
+    async def playback(self, request: Request) -> Response:
+        listener, error = await self._admit(request, "GET /me/player")
+        if error:
+            return error
+        playback = self.pool.playback(listener)
+        if playback is None:
+            self._count("GET /me/player", 204)
+            return Response(status_code=204)
+        self._count("GET /me/player", 200)
+        return JSONResponse(playback.model_dump(mode="json", exclude_none=True))
+
+    async def queue(self, request: Request) -> Response:
+        listener, error = await self._admit(request, "GET /me/player/queue")
+        if error:
+            return error
+        self._count("GET /me/player/queue", 200)
+        return JSONResponse(self.pool.queue(listener).model_dump(mode="json", exclude_none=True))
+
+    async def skip(self, request: Request) -> Response:
+        listener, error = await self._admit(request, "POST /me/player/next")
+        if error:
+            return error
+        self.pool.skip(listener)
+        self._count("POST /me/player/next", 204)
+        return Response(status_code=204)
+
+    async def features(self, request: Request, track_id: str) -> Response:
+        _, error = await self._admit(request, "GET /audio-features/{id}")
+        if error:
+            return error
+        features = self.pool.catalog.features(track_id)
+        if features is None:
+            self._count("GET /audio-features/{id}", 404)
+            return JSONResponse({"error": {"status": 404, "message": "analysis not found"}}, status_code=404)
+        self._count("GET /audio-features/{id}", 200)
+        return JSONResponse(features.model_dump(mode="json", exclude_none=True))
+
+    async def features_batch(self, request: Request) -> Response:
+        _, error = await self._admit(request, "GET /audio-features")
+        if error:
+            return error
+        ids = [track_id for track_id in request.query_params.get("ids", "").split(",") if track_id]
+        if not ids or len(ids) > 100:
+            self._count("GET /audio-features", 400)
+            return JSONResponse({"error": {"status": 400, "message": "Invalid ids"}}, status_code=400)
+        features = [self.pool.catalog.features(track_id) for track_id in ids]
+        self._count("GET /audio-features", 200)
+        return JSONResponse({"audio_features": [item.model_dump(mode="json", exclude_none=True) if item else None
+                                                for item in features]})
+
+    def build_app(self) -> FastAPI:
+        app = FastAPI(title="Fake Spotify Web API")
+        app.add_api_route("/api/token", self.issue_token, methods=["POST"])
+        app.add_api_route("/v1/me/player", self.playback, methods=["GET"])
+        app.add_api_route("/v1/me/player/queue", self.queue, methods=["GET"])
+        app.add_api_route("/v1/me/player/next", self.skip, methods=["POST"])
+        app.add_api_route("/v1/audio-features", self.features_batch, methods=["GET"])
+        app.add_api_route("/v1/audio-features/{track_id}", self.features, methods=["GET"])
+        app.add_api_route("/stats", lambda: dict(self.stats), methods=["GET"])
+        return app
+
+
+def parse_error_rates(values: list[str]) -> dict[int, float]:
+    """['429=0.01', '500=0.001'] -> {429: 0.01, 500: 0.001}"""
+    rates = {}
+    for value in values:
+        status, _, rate = value.partition("=")
+        rates[int(status)] = float(rate)
+    return rates
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--listeners", type=int, default=10_000)
+    parser.add_argument("--catalog", type=int, default=50_000, help="Tracks in the catalog")
+    parser.add_argument("--median-ms", type=float, default=40.0, help="Median API latency")
+    parser.add_argument("--p99-ms", type=float, default=400.0, help="p99 API latency")
+    parser.add_argument("--token-median-ms", type=float, default=100.0, help="Median /api/token latency")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/second for all users, 0 = unlimited")
+    parser.add_argument("--burst", type=int, default=100)
+    parser.add_argument("--error-rate", nargs="*", default=[], metavar="STATUS=RATE",
+                        help="Random failures, e.g. 429=0.01 500=0.001")
+    parser.add_argument("--token-lifetime", type=int, default=3600, help="Access token lifetime in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    api = FakeSpotifyAPI(
+        ListenerPool(SyntheticCatalog(size=args.catalog, seed=args.seed), listeners=args.listeners, seed=args.seed),
+        latency=LatencyModel(args.median_ms, args.p99_ms, rng),
+        token_latency=LatencyModel(args.token_median_ms, args.token_median_ms * 3, rng),
+        rate_limit=args.rate_limit, burst=args.burst, error_rates=parse_error_rates(args.error_rate),
+        token_lifetime=args.token_lifetime, seed=args.seed,
+    )
+    uvicorn.run(api.build_app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
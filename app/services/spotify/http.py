@@ -0,0 +1,93 @@
+import importlib.util
+import time
+
+import httpx
+
+from app.core.logging import logger
+
+
+class RequestTimings:
+    """
+    Connection timings of a single request, collected through the httpcore trace extension.
+    connect/tls are zero when a pooled keep-alive connection was reused.
+    """
+    __slots__ = ("started", "connect_ms", "tls_ms", "pool_wait_ms", "ttfb_ms", "_marks")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.connect_ms = 0.0
+        self.tls_ms = 0.0
+        self.pool_wait_ms = 0.0
+        self.ttfb_ms = 0.0
+        self._marks: dict[str, float] = {}
+
+    @property
+    def new_connection(self) -> bool:
+        return "connection.connect_tcp.started" in self._marks
+
+    async def trace(self, event_name: str, info: dict):
+        now = time.perf_counter()
+        self._marks[event_name] = now
+        marks = self._marks
+        if event_name == "connection.connect_tcp.complete":
+            self.connect_ms = (now - marks["connection.connect_tcp.started"]) * 1000
+        elif event_name == "connection.start_tls.complete":
+            self.tls_ms = (now - marks["connection.start_tls.started"]) * 1000
+        elif event_name.endswith("send_request_headers.started"):
+            # Time spent waiting for a pooled connection (or opening one) before sending
+            self.pool_wait_ms = (now - self.started) * 1000 - self.connect_ms - self.tls_ms
+        elif event_name.endswith("receive_response_headers.complete"):
+            protocol = event_name.split(".", 1)[0]
+            self.ttfb_ms = (now - marks[f"{protocol}.send_request_headers.started"]) * 1000
+
+
+class HttpTimingStats:
+    """
+    Aggregated connection timings of the requests made by a Spotify client
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.connect_ms_total = 0.0
+        self.tls_ms_total = 0.0
+        self.pool_wait_ms_total = 0.0
+        self.ttfb_ms_total = 0.0
+        self.last: RequestTimings | None = None
+
+    def record(self, timings: RequestTimings):
+        self.requests += 1
+        self.new_connections += timings.new_connection
+        self.connect_ms_total += timings.connect_ms
+        self.tls_ms_total += timings.tls_ms
+        self.pool_wait_ms_total += timings.pool_wait_ms
+        self.ttfb_ms_total += timings.ttfb_ms
+        self.last = timings
+
+    def as_dict(self) -> dict:
+        requests = self.requests or 1
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "avg_connect_ms": round(self.connect_ms_total / requests, 3),
+            "avg_tls_ms": round(self.tls_ms_total / requests, 3),
+            "avg_pool_wait_ms": round(self.pool_wait_ms_total / requests, 3),
+            "avg_ttfb_ms": round(self.ttfb_ms_total / requests, 3),
+        }
+
+
+def build_http_client(max_connections: int = 100, max_keepalive_connections: int = 20,
+                      keepalive_expiry: float = 30.0, http2: bool = False, timeout: float = 10.0) -> httpx.AsyncClient:
+    """Creates the long-lived, pooled HTTP client used for all Spotify calls"""
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1")
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+    )
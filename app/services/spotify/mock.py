@@ -1,17 +1,179 @@
+import asyncio
+import itertools
 import random
-from typing import Optional
+import time
+from collections import Counter, deque
+from typing import Callable, Optional
+
+from app.core.clock import Sleep
 from app.models.spotify import (
-    PlaybackState, SpotifyTrack, AudioFeatures,
+    PlaybackState, SpotifyTrack, AudioFeatures, SpotifyQueue,
     SpotifyArtist, SpotifyAlbum, SpotifyImage
 )
+from app.services.spotify.workload import FaultInjector, SyntheticListener
+
+
+def mock_track(track_id: str, is_focus: bool, duration_ms: int = 210000) -> SpotifyTrack:
+    return SpotifyTrack(
+        id=track_id,
+        name="Deep Work Focus" if is_focus else "High Energy Vocal Mix",
+        uri="spotify:track:mock_uri",
+        duration_ms=duration_ms,
+        explicit=False,
+        popularity=85,
+        external_urls={"spotify": "https://open.spotify.com/track/mock"},
+        artists=[
+            SpotifyArtist(
+                id="artist_1",
+                name="The SyncStream Architect",
+                external_urls={"spotify": "https://open.spotify.com/artist/1"}
+            )
+        ],
+        album=SpotifyAlbum(
+            id="album_1",
+            name="Architecture Vol 1",
+            images=[SpotifyImage(url="https://placehold.co/640x640", height=640, width=640)]
+        )
+    )
+
+
+def mock_features(track_id: str) -> AudioFeatures:
+    """Returns features matching the ID hint from get_current_playback."""
+    if "focus" in track_id:
+        return AudioFeatures(
+            id=track_id,
+            instrumentalness=0.85,  # High instrumental
+            energy=0.3,  # Low energy
+            valence=0.4,
+            danceability=0.2,
+            tempo=110.0,
+            loudness=-12.5,
+            speechiness=0.02,
+            acousticness=0.7
+        )
+
+    # 'Noise' track features (triggering skip in Focus Guard)
+    return AudioFeatures(
+        id=track_id,
+        instrumentalness=0.05,  # Vocals present
+        energy=0.88,  # High energy
+        valence=0.8,
+        danceability=0.75,
+        tempo=140.0,
+        loudness=-5.2,
+        speechiness=0.1,
+        acousticness=0.1
+    )
+
+
+class PlayedTrack:
+    __slots__ = ("track_id", "is_focus", "audible", "skipped")
+
+    def __init__(self, track_id: str, is_focus: bool, audible: float, skipped: bool):
+        self.track_id = track_id
+        self.is_focus = is_focus
+        self.audible = audible
+        self.skipped = skipped
+
+
+class SimulatedPlayer:
+    """
+    A device playing an endless queue of focus/noise tracks in real time.
+    Tracks advance on their own when they end or on skip, and the history records
+    how long each one was audible.
+    """
+
+    def __init__(self, focus_ratio: float = 0.5, duration_ms: tuple[int, int] = (150000, 240000),
+                 seed: int | None = None, clock: Callable[[], float] = time.monotonic):
+        self.focus_ratio = focus_ratio
+        self.duration_ms = duration_ms
+        self.clock = clock
+        self.history: list[PlayedTrack] = []
+        self._rng = random.Random(seed)
+        self._ids = itertools.count()
+        self._upcoming: deque[SpotifyTrack] = deque()
+        self.current = self._next_track()
+        self._started = clock()
+
+    def _next_track(self) -> SpotifyTrack:
+        return self._upcoming.popleft() if self._upcoming else self._new_track()
+
+    def _new_track(self) -> SpotifyTrack:
+        is_focus = self._rng.random() < self.focus_ratio
+        return mock_track(f"mock_id_{'focus' if is_focus else 'noise'}_{next(self._ids)}", is_focus,
+                          self._rng.randint(*self.duration_ms))
+
+    def _advance(self, audible: float, skipped: bool):
+        self.history.append(PlayedTrack(self.current.id, "focus" in self.current.id, audible, skipped))
+        self.current = self._next_track()
+
+    def _sync(self):
+        """Plays through every track that ended since the last call"""
+        now = self.clock()
+        while now - self._started >= self.current.duration_ms / 1000:
+            self._started += self.current.duration_ms / 1000
+            self._advance(self.current.duration_ms / 1000, skipped=False)
+
+    def playback(self) -> PlaybackState:
+        self._sync()
+        return PlaybackState(
+            timestamp=int(time.time() * 1000),
+            progress_ms=int((self.clock() - self._started) * 1000),
+            is_playing=True,
+            currently_playing_type="track",
+            item=self.current,
+        )
+
+    def queue(self, size: int = 20) -> SpotifyQueue:
+        self._sync()
+        while len(self._upcoming) < size:
+            self._upcoming.append(self._new_track())
+        return SpotifyQueue(currently_playing=self.current, queue=list(itertools.islice(self._upcoming, size)))
+
+    def skip(self):
+        self._sync()
+        now = self.clock()
+        self._advance(now - self._started, skipped=True)
+        self._started = now
+
+    def features(self, track_id: str) -> AudioFeatures:
+        return mock_features(track_id)
 
 
 class MockSpotifyService:
     """
-    Spotify API Mock
+    Spotify API Mock.
+    Random playback by default; with a player (SimulatedPlayer, or a SyntheticListener of a
+    workload), a consistent playback/queue/skip timeline and the player's features.
+    `latency` (in seconds) is added to every call through `sleep`, to load test against a
+    realistic API; `faults` makes a share of calls fail with 429/401. Calls are counted by endpoint.
     """
 
+    def __init__(self, player: SimulatedPlayer | SyntheticListener | None = None, latency: float = 0.0,
+                 faults: FaultInjector | None = None, sleep: Sleep = asyncio.sleep):
+        self.player = player
+        self.latency = latency
+        self.faults = faults
+        self.sleep = sleep
+        self.calls: Counter[str] = Counter()
+
+    async def _round_trip(self, endpoint: str):
+        self.calls[endpoint] += 1
+        if self.latency:
+            await self.sleep(self.latency)
+        if self.faults is not None:
+            self.faults.check(endpoint)
+
+    def _features(self, track_id: str) -> AudioFeatures | None:
+        return self.player.features(track_id) if self.player is not None else mock_features(track_id)
+
     async def get_current_playback(self) -> PlaybackState | None:
+        await self._round_trip("/me/player")
+        if self.player is not None:
+            return self.player.playback()
+        return self._random_playback()
+
+    def _random_playback(self) -> PlaybackState | None:
         # Simulate 'nothing playing' state (5% chance)
         if random.random() < 0.05:
             return None
@@ -27,56 +189,30 @@ class MockSpotifyService:
             progress_ms=45000,
             is_playing=True,
             currently_playing_type="track",  # Valid types: track, episode, ad, unknown
-            item=SpotifyTrack(
-                id=f"mock_id_{'focus' if is_focus else 'noise'}",
-                name="Deep Work Focus" if is_focus else "High Energy Vocal Mix",
-                uri="spotify:track:mock_uri",
-                duration_ms=210000,
-                explicit=False,
-                popularity=85,
-                external_urls={"spotify": "https://open.spotify.com/track/mock"},
-                artists=[
-                    SpotifyArtist(
-                        id="artist_1",
-                        name="The SyncStream Architect",
-                        external_urls={"spotify": "https://open.spotify.com/artist/1"}
-                    )
-                ],
-                album=SpotifyAlbum(
-                    id="album_1",
-                    name="Architecture Vol 1",
-                    images=[SpotifyImage(url="https://placehold.co/640x640", height=640, width=640)]
-                )
-            )
+            item=mock_track(f"mock_id_{'focus' if is_focus else 'noise'}", is_focus)
+        )
+
+    async def get_queue(self) -> Optional[SpotifyQueue]:
+        await self._round_trip("/me/player/queue")
+        if self.player is not None:
+            return self.player.queue()
+        playback = self._random_playback()
+        upcoming = [random.choice([True, False]) for _ in range(20)]
+        return SpotifyQueue(
+            currently_playing=playback.item if playback else None,
+            queue=[mock_track(f"mock_id_{'focus' if is_focus else 'noise'}", is_focus) for is_focus in upcoming],
         )
 
     async def get_audio_features(self, track_id: str) -> AudioFeatures | None:
-        """Returns features matching the ID hint from get_current_playback."""
-        if "focus" in track_id:
-            return AudioFeatures(
-                id=track_id,
-                instrumentalness=0.85,  # High instrumental
-                energy=0.3,  # Low energy
-                valence=0.4,
-                danceability=0.2,
-                tempo=110.0,
-                loudness=-12.5,
-                speechiness=0.02,
-                acousticness=0.7
-            )
+        await self._round_trip("/audio-features/{id}")
+        return self._features(track_id)
 
-        # 'Noise' track features (triggering skip in Focus Guard)
-        return AudioFeatures(
-            id=track_id,
-            instrumentalness=0.05,  # Vocals present
-            energy=0.88,  # High energy
-            valence=0.8,
-            danceability=0.75,
-            tempo=140.0,
-            loudness=-5.2,
-            speechiness=0.1,
-            acousticness=0.1
-        )
+    async def get_audio_features_batch(self, track_ids: list[str]) -> dict[str, AudioFeatures | None]:
+        await self._round_trip("/audio-features")
+        return {track_id: self._features(track_id) for track_id in track_ids}
 
     async def skip_next(self) -> bool:
-        return True
\ No newline at end of file
+        await self._round_trip("/me/player/next")
+        if self.player is not None:
+            self.player.skip()
+        return True
@@ -1,12 +1,19 @@
 import asyncio
-from typing import Any
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 import httpx
 from httpx import AsyncClient, HTTPStatusError, HTTPError
 
 from app.core.logging import logger
-from app.core.redis import redis_manager
-from app.models.spotify import PlaybackState, AudioFeatures
+from app.core.metrics import SPOTIFY_REQUEST_SECONDS, metrics
+from app.models.spotify import PlaybackState, AudioFeatures, SpotifyQueue
+from app.services.spotify.batching import BatchLoader
+from app.services.spotify.http import HttpTimingStats, RequestTimings, build_http_client
+from app.services.spotify.rate_limit import RequestPriority, SpotifyRateLimiter
+from app.services.spotify.token import SpotifyTokenManager
+from app.services.storage import StorageBackend
 
 
 class ProdSpotifyService:
@@ -17,26 +24,82 @@ class ProdSpotifyService:
     ACCESS_TOKEN_KEY = "spotify:access_token"
     API_BASE_URL = "https://api.spotify.com/v1"
     AUTH_URL = "https://accounts.spotify.com/api/token"
-
-    def __init__(self, client_id: str, client_secret: str, refresh_token: str):
+    FEATURES_BATCH_LIMIT = 100  # Max ids per GET /audio-features request
+
+    def __init__(self, client_id: str, client_secret: str, refresh_token: str,
+                 user_id: str | None = None, http_client: AsyncClient | None = None,
+                 features_batch_window: float | None = None, features_loader: BatchLoader | None = None,
+                 api_base_url: str | None = None, auth_url: str | None = None, token_refresh_margin: float = 60.0,
+                 rate_limiter: SpotifyRateLimiter | None = None, max_retries: int = 3,
+                 storage: StorageBackend | None = None):
         self.client_id = client_id
         self.client_secret = client_secret
         self.refresh_token = refresh_token
+        self.user_id = user_id
+        self.api_base_url = api_base_url or self.API_BASE_URL
+        self.auth_url = auth_url or self.AUTH_URL
+        # A long-lived pooled client, either shared between user sessions or created by open().
+        # Without one, a short-lived client (and connection) is opened per call.
+        self.http_client = http_client
+        self._owns_http_client = False
+        self.http_timings = HttpTimingStats()
+        # Shared between the sessions of a worker; the bucket itself may be shared through Redis
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.tokens = SpotifyTokenManager(self._fetch_access_token, cache_key=self.access_token_key,
+                                          refresh_margin=token_refresh_margin, storage=storage)
+        # Coalesces concurrent get_audio_features calls into batched requests. Audio features are
+        # not user specific, so sessions may share one loader.
+        if features_loader is None and features_batch_window is not None:
+            features_loader = BatchLoader(self.get_audio_features_batch, max_batch_size=self.FEATURES_BATCH_LIMIT,
+                                          max_wait=features_batch_window)
+        self.features_loader = features_loader
+
+    @property
+    def access_token_key(self) -> str:
+        """Storage key of the cached access token, scoped per user when serving several users"""
+        return f"{self.ACCESS_TOKEN_KEY}:{self.user_id}" if self.user_id else self.ACCESS_TOKEN_KEY
+
+    async def open(self, **client_options):
+        """Creates the pooled HTTP client used for all subsequent calls (see build_http_client)"""
+        if self.http_client is None:
+            self.http_client = build_http_client(**client_options)
+            self._owns_http_client = True
+            logger.info("Spotify HTTP client opened", **client_options)
+
+    async def aclose(self):
+        """Closes the pooled HTTP client, if this service created it"""
+        if self._owns_http_client and self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+            self._owns_http_client = False
+            logger.info("Spotify HTTP client closed", **self.http_timings.as_dict())
+
+    @asynccontextmanager
+    async def _http(self) -> AsyncIterator[AsyncClient]:
+        """Yields the shared HTTP client, or a short-lived one when none was provided"""
+        if self.http_client is not None:
+            yield self.http_client
+        else:
+            async with AsyncClient() as client:
+                yield client
 
     async def _get_access_token(self) -> str:
-        """Fetch an access token from cache"""
-        client = redis_manager.get_redis_client()
-        access_token = client.get(self.ACCESS_TOKEN_KEY)
-        return access_token.decode("utf-8") if access_token else None
+        """Returns a valid access token (held in memory, refreshed shortly before it expires)"""
+        return await self.tokens.get_token()
 
     async def apply_refresh_token(self) -> str:
         """
-        Refreshes the Spotify access token and updates the cache
+        Forces a refresh of the Spotify access token and updates the cache
         """
-        async with AsyncClient() as client:
+        return await self.tokens.refresh()
+
+    async def _fetch_access_token(self) -> tuple[str, int]:
+        """Exchanges the refresh token for a new access token, returns it with its lifetime in seconds"""
+        async with self._http() as client:
             try:
                 response = await client.post(
-                    self.AUTH_URL,
+                    self.auth_url,
                     data={
                         "grant_type": "refresh_token",
                         "refresh_token": self.refresh_token,
@@ -47,48 +110,70 @@ class ProdSpotifyService:
                 )
                 response.raise_for_status()
                 data = response.json()
-                access_token = data["access_token"]
-                client = redis_manager.get_redis_client()
-                await client.set(self.ACCESS_TOKEN_KEY, access_token)
-                return access_token
+                # Spotify may rotate the refresh token
+                self.refresh_token = data.get("refresh_token", self.refresh_token)
+                return data["access_token"], int(data.get("expires_in", 3600))
             except HTTPStatusError as e:
-                logger.error("Failed to refresh Spotify access token")
+                logger.error("Failed to refresh Spotify access token", status_code=e.response.status_code)
                 raise
 
-    async def _request(self, method: str, endpoint: str, retry_on_401: bool = True, **kwargs) -> Any:
+    async def _request(self, method: str, endpoint: str, priority: RequestPriority = RequestPriority.PLAYBACK,
+                       retry_on_401: bool = True, endpoint_label: str | None = None, **kwargs) -> Any:
         """
-        Internal request wrapper with error handling and token management
+        Internal request wrapper with error handling, token management and rate limiting.
+        `endpoint_label` names the endpoint in metrics when the path embeds an id.
         """
         token = await self._get_access_token()
-        if not token:
-            token = await self.apply_refresh_token()
+        retries = 0
 
-        headers = {"Authorization": f"Bearer {token}"}
-
-        async with AsyncClient(base_url=self.API_BASE_URL, headers=headers) as client:
+        async with self._http() as client:
             try:
-                response = await client.request(method, endpoint, **kwargs)
-
-                # Handle 401 Unauthorized
-                if response.status_code == 401 and retry_on_401:
-                    logger.warning("Spotify token expired (401). Retrying with fresh token...")
-                    await self.apply_refresh_token()
-                    return await self._request(method, endpoint, retry_on_401=False, **kwargs)
-
-                # Handle Rate Limiting - 429 Too Many Requests
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", 5))
-                    logger.warning(f"Spotify Rate Limit hit. Backing off for {retry_after}s")
-                    await asyncio.sleep(retry_after)
-                    return await self._request(method, endpoint, **kwargs)
-
-                response.raise_for_status()
-
-                # Spotify returns 204 No Content for successful skips/commands
-                if response.status_code == 204:
-                    return True
-
-                return response.json()
+                while True:
+                    if self.rate_limiter is not None:
+                        await self.rate_limiter.acquire(priority)
+
+                    timings = RequestTimings()
+                    status = "error"
+                    try:
+                        response = await client.request(method, f"{self.api_base_url}{endpoint}",
+                                                        headers={"Authorization": f"Bearer {token}"},
+                                                        extensions={"trace": timings.trace}, **kwargs)
+                        status = str(response.status_code)
+                    finally:
+                        if metrics.enabled:
+                            SPOTIFY_REQUEST_SECONDS.labels(f"{method} {endpoint_label or endpoint}", status).observe(
+                                time.perf_counter() - timings.started)
+                    self.http_timings.record(timings)
+
+                    # Handle 401 Unauthorized
+                    if response.status_code == 401 and retry_on_401:
+                        logger.warning("Spotify token expired (401). Retrying with fresh token...")
+                        token = await self.tokens.invalidate(token)
+                        retry_on_401 = False
+                        continue
+
+                    # Handle Rate Limiting - 429 Too Many Requests, within a bounded retry budget
+                    if response.status_code == 429:
+                        retry_after = float(response.headers.get("Retry-After", 5))
+                        if self.rate_limiter is not None:
+                            # Holds back every queued request, on every worker
+                            await self.rate_limiter.report_throttled(retry_after)
+                        if retries < self.max_retries:
+                            retries += 1
+                            logger.warning(f"Spotify Rate Limit hit. Backing off for {retry_after}s", attempt=retries)
+                            if self.rate_limiter is None:
+                                await asyncio.sleep(retry_after)
+                            continue
+                        if self.rate_limiter is not None:
+                            self.rate_limiter.stats.retries_exhausted += 1
+
+                    response.raise_for_status()
+
+                    # Spotify returns 204 No Content for successful skips/commands
+                    if response.status_code == 204:
+                        return True
+
+                    return response.json()
 
             except HTTPError as e:
                 logger.error(f"Spotify API request failed: {method} {endpoint}", exc_info=e)
@@ -96,18 +181,47 @@ class ProdSpotifyService:
 
     async def get_current_playback(self) -> PlaybackState | None:
         """Fetches the user's current playback state"""
-        data = self._request("GET", "/me/player")
-        if data is None:
+        data = await self._request("GET", "/me/player", priority=RequestPriority.PLAYBACK)
+        # 204 No Content: nothing is playing
+        if not isinstance(data, dict):
             return None
         return PlaybackState(**data)
 
+    async def get_queue(self) -> SpotifyQueue | None:
+        """Fetches the currently playing track and the user's upcoming queue"""
+        data = await self._request("GET", "/me/player/queue", priority=RequestPriority.PLAYBACK)
+        if not isinstance(data, dict):
+            return None
+        # The queue may also hold episodes, which cannot be evaluated but still take a skip each
+        items = [item if item and item.get("type", "track") == "track" else None for item in data.get("queue") or []]
+        current = data.get("currently_playing")
+        return SpotifyQueue(
+            currently_playing=current if current and current.get("type", "track") == "track" else None,
+            queue=items,
+        )
+
     async def get_audio_features(self, track_id: str) -> AudioFeatures | None:
         """Fetches audio features of a track"""
-        data = await self._request("GET", f"/audio-features/{track_id}")
+        if self.features_loader is not None:
+            return await self.features_loader.load(track_id)
+        data = await self._request("GET", f"/audio-features/{track_id}", priority=RequestPriority.BULK,
+                                   endpoint_label="/audio-features/{id}")
         if data is None:
             return None
         return AudioFeatures(**data)
 
+    async def get_audio_features_batch(self, track_ids: list[str]) -> dict[str, AudioFeatures | None]:
+        """Fetches audio features of several tracks, FEATURES_BATCH_LIMIT ids per request"""
+        features: dict[str, AudioFeatures | None] = {}
+        for start in range(0, len(track_ids), self.FEATURES_BATCH_LIMIT):
+            chunk = track_ids[start:start + self.FEATURES_BATCH_LIMIT]
+            data = await self._request("GET", "/audio-features", priority=RequestPriority.BULK,
+                                       params={"ids": ",".join(chunk)})
+            # Results are in request order, with null for unknown ids
+            for track_id, item in zip(chunk, (data or {}).get("audio_features") or []):
+                features[track_id] = AudioFeatures(**item) if item else None
+        return features
+
     async def skip_next(self) -> bool:
         """Issues the skip command to the active device"""
-        return await self._request("POST", "/me/player/next")
\ No newline at end of file
+        return await self._request("POST", "/me/player/next", priority=RequestPriority.SKIP)
\ No newline at end of file
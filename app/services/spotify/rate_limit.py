@@ -0,0 +1,204 @@
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Protocol
+
+from app.core.logging import logger
+from app.core.redis import redis_manager
+
+
+class RequestPriority(IntEnum):
+    """Lower values are served first when requests queue up"""
+    SKIP = 0
+    PLAYBACK = 1
+    BULK = 2
+
+
+class TokenBucket(Protocol):
+    """
+    Storage of the shared request budget
+    """
+
+    async def take(self) -> float:
+        """Consumes one token; returns 0 when granted, otherwise the seconds to wait before retrying"""
+
+    async def block(self, seconds: float):
+        """Grants no token to anyone for `seconds` (Spotify's Retry-After)"""
+
+
+class LocalTokenBucket:
+    """
+    In-process token bucket, for a single worker
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    async def take(self) -> float:
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    async def block(self, seconds: float):
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+# KEYS[1] = bucket hash (tokens, updated_ms), KEYS[2] = blocked marker (expires with Retry-After)
+# ARGV    = rate per second, burst
+# Returns 0 when a token is granted, otherwise the milliseconds to wait
+TAKE_TOKEN_SCRIPT = """
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    return blocked
+end
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_ms')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(now - updated, 0) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_ms', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return wait
+"""
+
+# Extends the blocked window, never shortens it
+BLOCK_SCRIPT = """
+if redis.call('PTTL', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], '1', 'PX', ARGV[1])
+end
+return 1
+"""
+
+
+class RedisTokenBucket:
+    """
+    Token bucket shared by every worker through Redis
+    """
+
+    BUCKET_KEY = "spotify:ratelimit:bucket"
+    BLOCKED_KEY = "spotify:ratelimit:blocked"
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+
+    async def take(self) -> float:
+        client = redis_manager.get_client()
+        wait_ms = await client.register_script(TAKE_TOKEN_SCRIPT)(
+            keys=[self.BUCKET_KEY, self.BLOCKED_KEY], args=[self.rate, self.burst]
+        )
+        return int(wait_ms) / 1000
+
+    async def block(self, seconds: float):
+        client = redis_manager.get_client()
+        await client.register_script(BLOCK_SCRIPT)(keys=[self.BLOCKED_KEY], args=[max(int(seconds * 1000), 1)])
+
+
+class RateLimiterStats:
+    """
+    Per-priority throughput and queueing delay, plus 429 counters
+    """
+
+    def __init__(self):
+        self.acquired = {priority: 0 for priority in RequestPriority}
+        self.queue_delay_total = {priority: 0.0 for priority in RequestPriority}
+        self.queue_delay_max = {priority: 0.0 for priority in RequestPriority}
+        self.throttled = 0
+        self.retries_exhausted = 0
+
+    def record(self, priority: RequestPriority, delay: float):
+        self.acquired[priority] += 1
+        self.queue_delay_total[priority] += delay
+        self.queue_delay_max[priority] = max(self.queue_delay_max[priority], delay)
+
+    def avg_queue_delay(self, priority: RequestPriority) -> float:
+        return self.queue_delay_total[priority] / self.acquired[priority] if self.acquired[priority] else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "throttled": self.throttled,
+            "retries_exhausted": self.retries_exhausted,
+            **{
+                priority.name.lower(): {
+                    "acquired": self.acquired[priority],
+                    "avg_queue_delay_ms": round(self.avg_queue_delay(priority) * 1000, 3),
+                    "max_queue_delay_ms": round(self.queue_delay_max[priority] * 1000, 3),
+                }
+                for priority in RequestPriority
+            },
+        }
+
+
+class SpotifyRateLimiter:
+    """
+    Client-side limiter in front of every Spotify call.
+    Requests wait in a priority queue and are released one token at a time, so a
+    user-visible skip is never stuck behind bulk feature fetches. A 429 blocks the
+    shared bucket for Retry-After seconds, for every worker.
+    """
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.stats = RateLimiterStats()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._pump_task: asyncio.Task | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, priority: RequestPriority = RequestPriority.PLAYBACK):
+        """Waits until the request may be sent"""
+        enqueued = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._pump())
+        await future
+        self.stats.record(priority, time.monotonic() - enqueued)
+
+    async def report_throttled(self, retry_after: float):
+        """Records a 429 and holds back every worker for Retry-After seconds"""
+        self.stats.throttled += 1
+        await self.bucket.block(retry_after)
+
+    async def _pump(self):
+        while self._waiters:
+            # Drop callers that gave up before spending a token on them
+            while self._waiters and self._waiters[0][2].cancelled():
+                heapq.heappop(self._waiters)
+            if not self._waiters:
+                break
+            try:
+                wait = await self.bucket.take()
+            except Exception as e:
+                logger.error("Rate limiter bucket unavailable, releasing request", error=str(e))
+                wait = 0.0
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.cancelled():
+                future.set_result(None)
@@ -0,0 +1,210 @@
+import json
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+from app.models.spotify import AudioFeatures, PlaybackState, SpotifyArtist, SpotifyQueue, SpotifyTrack
+from app.services.spotify.base import SpotifyService
+from app.services.codec import NEGATIVE_ENTRY, decode_features, encode_features
+
+RECORDING_VERSION = 1
+# Slack (in seconds) for poll and progress jitter: a track cut short by more than this without
+# a skip from the engine was skipped by the listener, and shorter gaps are not idle time
+TIMING_TOLERANCE = 2.0
+
+
+class RecordingWriter:
+    """
+    Append-only recording of one listener's session, one JSON array per line:
+
+        ["h", version, user_id, started_epoch_ms]      header, once per session
+        ["t", id, name, duration_ms, explicit, popularity, [[artist_id, artist_name], ...]]
+        ["f", track_id, encoded_features | "-"]        audio features, once per track
+        ["p", t_ms, track_id | null, progress_ms, is_playing]
+        ["s", t_ms]                                    skip issued by the engine
+
+    `t_ms` is relative to the session header. Tracks and features are written the first
+    time they are seen, so a long session mostly consists of short playback lines.
+    """
+
+    def __init__(self, path: str | Path, user_id: str = "user", clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._file = open(path, "a", encoding="utf-8")
+        self._started = clock()
+        self._tracks: set[str] = set()
+        self._features: set[str] = set()
+        self._write(["h", RECORDING_VERSION, user_id, int(self._started * 1000)])
+
+    def _write(self, record: list):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def _offset_ms(self) -> int:
+        return int((self.clock() - self._started) * 1000)
+
+    def track(self, track: SpotifyTrack):
+        if track.id not in self._tracks:
+            self._tracks.add(track.id)
+            self._write(["t", track.id, track.name, track.duration_ms, track.explicit, track.popularity,
+                         [[artist.id, artist.name] for artist in track.artists]])
+
+    def features(self, track_id: str, features: AudioFeatures | None):
+        if track_id not in self._features:
+            self._features.add(track_id)
+            self._write(["f", track_id, encode_features(features) if features else NEGATIVE_ENTRY])
+
+    def playback(self, playback: PlaybackState | None):
+        item = playback.item if playback else None
+        if item is not None:
+            self.track(item)
+        self._write(["p", self._offset_ms(), item.id if item else None,
+                     playback.progress_ms if playback else None, bool(playback and playback.is_playing)])
+
+    def skip(self):
+        self._write(["s", self._offset_ms()])
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class RecordingSpotifyService:
+    """
+    Wraps any SpotifyService and records what it returns, to be replayed later with
+    ReplaySpotifyService
+    """
+
+    def __init__(self, spotify: SpotifyService, writer: RecordingWriter):
+        self.spotify = spotify
+        self.writer = writer
+
+    async def get_current_playback(self) -> PlaybackState | None:
+        playback = await self.spotify.get_current_playback()
+        self.writer.playback(playback)
+        return playback
+
+    async def get_queue(self) -> SpotifyQueue | None:
+        queue = await self.spotify.get_queue()
+        for track in queue.queue if queue else ():
+            if track is not None:
+                self.writer.track(track)
+        return queue
+
+    async def get_audio_features(self, track_id: str) -> AudioFeatures | None:
+        features = await self.spotify.get_audio_features(track_id)
+        self.writer.features(track_id, features)
+        return features
+
+    async def get_audio_features_batch(self, track_ids: list[str]) -> dict[str, AudioFeatures | None]:
+        features = await self.spotify.get_audio_features_batch(track_ids)
+        for track_id in track_ids:
+            self.writer.features(track_id, features.get(track_id))
+        return features
+
+    async def skip_next(self) -> bool:
+        skipped = await self.spotify.skip_next()
+        self.writer.skip()
+        return skipped
+
+
+class Observation:
+    __slots__ = ("at", "track_id", "progress", "is_playing")
+
+    def __init__(self, at: float, track_id: str | None, progress: float, is_playing: bool):
+        self.at = at
+        self.track_id = track_id
+        self.progress = progress
+        self.is_playing = is_playing
+
+
+class Recording:
+    """
+    A parsed recording. Times are in seconds since the first session started.
+    """
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.tracks: dict[str, SpotifyTrack] = {}
+        self.features: dict[str, AudioFeatures | None] = {}
+        self.observations: list[Observation] = []
+        self.skips: list[float] = []
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Recording":
+        with open(path, encoding="utf-8") as file:
+            return cls.parse(file)
+
+    @classmethod
+    def parse(cls, lines: Iterator[str]) -> "Recording":
+        recording = None
+        origin = session_start = 0.0
+        for line in lines:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            kind = record[0]
+            if kind == "h":
+                if record[1] != RECORDING_VERSION:
+                    raise ValueError(f"Unsupported recording version: {record[1]}")
+                if recording is None:
+                    recording = cls(record[2])
+                    origin = record[3] / 1000
+                session_start = record[3] / 1000 - origin
+            elif recording is None:
+                raise ValueError("Recording does not start with a header")
+            elif kind == "t":
+                _, track_id, name, duration_ms, explicit, popularity, artists = record
+                recording.tracks[track_id] = SpotifyTrack(
+                    id=track_id, name=name, uri=f"spotify:track:{track_id}", duration_ms=duration_ms,
+                    explicit=explicit, popularity=popularity,
+                    artists=[SpotifyArtist(id=artist_id, name=artist_name) for artist_id, artist_name in artists],
+                )
+            elif kind == "f":
+                recording.features[record[1]] = None if record[2] == NEGATIVE_ENTRY else decode_features(record[1], record[2])
+            elif kind == "p":
+                _, offset_ms, track_id, progress_ms, is_playing = record
+                recording.observations.append(
+                    Observation(session_start + offset_ms / 1000, track_id, (progress_ms or 0) / 1000, is_playing))
+            elif kind == "s":
+                recording.skips.append(session_start + record[1] / 1000)
+        if recording is None:
+            raise ValueError("Empty recording")
+        return recording
+
+    def timeline(self) -> list[tuple[str | None, float]]:
+        """
+        Rebuilds what was listened to as (track_id, seconds) entries, None being idle time.
+        Tracks the engine skipped are restored to their full length, so a replayed engine
+        makes its own decision; tracks the listener cut short stay cut short. Pauses are
+        replayed as idle time after the track.
+        """
+        runs: list[tuple[str, float, float]] = []  # track id, start, last seen
+        for observation in self.observations:
+            if not observation.is_playing or observation.track_id is None:
+                continue
+            if runs and runs[-1][0] == observation.track_id:
+                runs[-1] = (runs[-1][0], runs[-1][1], observation.at)
+            else:
+                runs.append((observation.track_id, observation.at - observation.progress, observation.at))
+
+        entries: list[tuple[str | None, float]] = []
+        skips = iter(sorted(self.skips))
+        next_skip = next(skips, None)
+        for index, (track_id, start, last_seen) in enumerate(runs):
+            duration = self.tracks[track_id].duration_ms / 1000 if track_id in self.tracks else last_seen - start
+            played, idle = duration, 0.0
+            if index + 1 < len(runs):
+                next_start = runs[index + 1][1]
+                while next_skip is not None and next_skip < start:
+                    next_skip = next(skips, None)
+                skipped_by_engine = next_skip is not None and next_skip <= next_start
+                ended = min(start + duration, max(next_start, last_seen))
+                if not skipped_by_engine and ended < start + duration - TIMING_TOLERANCE:
+                    played = ended - start
+                if next_start - ended > TIMING_TOLERANCE:
+                    idle = next_start - ended
+            entries.append((track_id, played))
+            if idle:
+                entries.append((None, idle))
+        return entries
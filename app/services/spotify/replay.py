@@ -0,0 +1,99 @@
+from collections import Counter
+from typing import Callable, Optional
+
+from app.models.spotify import AudioFeatures, PlaybackState, SpotifyQueue, SpotifyTrack
+from app.services.spotify.recording import Recording
+
+
+class ReplayPlayer:
+    """
+    Plays a recording's timeline on a (usually virtual) clock. Tracks advance when their
+    recorded listening time is up or on skip; idle entries report nothing playing, and
+    nothing plays once the timeline is over.
+    """
+
+    def __init__(self, recording: Recording, clock: Callable[[], float]):
+        self.recording = recording
+        self.clock = clock
+        self.entries = recording.timeline()
+        self._index = 0
+        self._started = clock()
+
+    @property
+    def finished(self) -> bool:
+        return self._sync() >= len(self.entries)
+
+    def _sync(self) -> int:
+        """Moves past every entry that ended since the last call"""
+        now = self.clock()
+        while self._index < len(self.entries) and now - self._started >= self.entries[self._index][1]:
+            self._started += self.entries[self._index][1]
+            self._index += 1
+        return self._index
+
+    def _track(self, index: int) -> SpotifyTrack:
+        # A fresh object per call like the API returns; the engine attaches features to it
+        return self.recording.tracks[self.entries[index][0]].model_copy()
+
+    def playback(self) -> PlaybackState | None:
+        index = self._sync()
+        if index >= len(self.entries) or self.entries[index][0] is None:
+            return None
+        return PlaybackState(
+            timestamp=int(self.clock() * 1000),
+            progress_ms=int((self.clock() - self._started) * 1000),
+            is_playing=True,
+            currently_playing_type="track",
+            item=self._track(index),
+        )
+
+    def queue(self, size: int = 20) -> SpotifyQueue | None:
+        current = self.playback()
+        if current is None:
+            return None
+        upcoming = []
+        for index in range(self._index + 1, len(self.entries)):
+            if len(upcoming) == size:
+                break
+            if self.entries[index][0] is not None:
+                upcoming.append(self._track(index))
+        return SpotifyQueue(currently_playing=current.item, queue=upcoming)
+
+    def skip(self):
+        index = self._sync()
+        if index < len(self.entries) and self.entries[index][0] is not None:
+            self._index += 1
+            self._started = self.clock()
+
+
+class ReplaySpotifyService:
+    """
+    Spotify API backed by a recording, counting calls by endpoint.
+    Features come from the recording; tracks it has no features for return None.
+    """
+
+    def __init__(self, recording: Recording, clock: Callable[[], float]):
+        self.player = ReplayPlayer(recording, clock)
+        self.features = recording.features
+        self.calls: Counter[str] = Counter()
+
+    async def get_current_playback(self) -> PlaybackState | None:
+        self.calls["playback"] += 1
+        return self.player.playback()
+
+    async def get_queue(self) -> Optional[SpotifyQueue]:
+        self.calls["queue"] += 1
+        return self.player.queue()
+
+    async def get_audio_features(self, track_id: str) -> AudioFeatures | None:
+        self.calls["audio_features"] += 1
+        return self.features.get(track_id)
+
+    async def get_audio_features_batch(self, track_ids: list[str]) -> dict[str, AudioFeatures | None]:
+        self.calls["audio_features_batch"] += 1
+        return {track_id: self.features.get(track_id) for track_id in track_ids}
+
+    async def skip_next(self) -> bool:
+        self.calls["skip"] += 1
+        self.player.skip()
+        return True
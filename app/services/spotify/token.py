@@ -0,0 +1,121 @@
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from redis.exceptions import RedisError
+
+from app.core.logging import logger
+from app.services.storage import StorageBackend, storage as default_storage
+
+
+class SpotifyTokenManager:
+    """
+    Keeps the Spotify access token and its expiry deadline in memory.
+    - The token is refreshed `refresh_margin` seconds before it expires.
+    - Concurrent callers (e.g. a burst of 401s) share a single in-flight refresh.
+    - Replicas share the token through the storage backend (Redis), and a lock there ensures
+      only one of them calls the auth endpoint while the others wait for the new token.
+    """
+
+    def __init__(self, fetch_token: Callable[[], Awaitable[tuple[str, int]]], cache_key: str,
+                 refresh_margin: float = 60.0, lock_ttl: float = 10.0, poll_interval: float = 0.05,
+                 storage: StorageBackend | None = None):
+        self.fetch_token = fetch_token
+        self.storage = storage or default_storage
+        self.cache_key = cache_key
+        self.lock_key = f"{cache_key}:lock"
+        self.refresh_margin = refresh_margin
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.refresh_count = 0
+        self._token: str | None = None
+        self._expires_at = 0.0
+        self._refresh_task: asyncio.Task | None = None
+
+    def seconds_until_refresh(self) -> float:
+        """Seconds until the in-memory token enters its refresh window"""
+        return max(self._expires_at - self.refresh_margin - time.monotonic(), 0.0)
+
+    def _is_fresh(self) -> bool:
+        return self._token is not None and self.seconds_until_refresh() > 0
+
+    async def get_token(self) -> str:
+        """Returns a valid access token, refreshing it when it is about to expire"""
+        if self._is_fresh():
+            return self._token
+        return await self._single_flight(stale_token=None)
+
+    async def invalidate(self, token: str) -> str:
+        """
+        Reports `token` as rejected (401) and returns a new one.
+        Calls reporting the same rejected token all share one refresh.
+        """
+        if token != self._token and self._is_fresh():
+            return self._token
+        return await self._single_flight(stale_token=token)
+
+    async def refresh(self) -> str:
+        """Forces a new token from the auth endpoint"""
+        return await self._single_flight(stale_token=self._token or "")
+
+    async def _single_flight(self, stale_token: str | None) -> str:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._load_or_refresh(stale_token))
+        return await asyncio.shield(self._refresh_task)
+
+    def _adopt(self, token: str, ttl: float):
+        self._token = token
+        self._expires_at = time.monotonic() + ttl
+
+    async def _read_shared(self, stale_token: str | None) -> bool:
+        """Adopts the shared token, if it is usable and not the rejected one"""
+        token, ttl = await self.storage.get_with_ttl(self.cache_key)
+        if token and token.decode() != stale_token and ttl is not None and ttl > self.refresh_margin:
+            self._adopt(token.decode(), ttl)
+            return True
+        return False
+
+    async def _load_or_refresh(self, stale_token: str | None) -> str:
+        try:
+            if await self._read_shared(stale_token):
+                return self._token
+
+            lock_id = uuid.uuid4().hex
+            deadline = time.monotonic() + self.lock_ttl
+            while not await self.storage.set(self.lock_key, lock_id, ttl=self.lock_ttl, only_if_absent=True):
+                # Another replica is refreshing: wait for its token
+                await asyncio.sleep(self.poll_interval)
+                if await self._read_shared(stale_token):
+                    return self._token
+                if time.monotonic() > deadline:
+                    logger.warning("Timed out waiting for another replica to refresh the Spotify token")
+                    return await self._refresh_and_store()
+
+            try:
+                # The lock holder may have refreshed between our first read and the lock
+                if await self._read_shared(stale_token):
+                    return self._token
+                return await self._refresh_and_store()
+            finally:
+                await self.storage.delete_if_equal(self.lock_key, lock_id)
+        except (RedisError, RuntimeError) as e:
+            # The storage (Redis) is unavailable: keep serving this replica with a local-only refresh
+            logger.warning("Token cache unavailable, refreshing locally", error=str(e))
+            return await self._refresh_locally()
+
+    async def _refresh_locally(self) -> str:
+        access_token, expires_in = await self.fetch_token()
+        self.refresh_count += 1
+        self._adopt(access_token, expires_in)
+        return access_token
+
+    async def _refresh_and_store(self) -> str:
+        access_token = await self._refresh_locally()
+        ttl = self._expires_at - time.monotonic()
+        logger.info("Spotify access token refreshed", expires_in=round(ttl))
+        try:
+            await self.storage.set(self.cache_key, access_token, ttl=ttl)
+        except (RedisError, RuntimeError) as e:
+            logger.warning("Failed to share the refreshed Spotify token", error=str(e))
+        return access_token
@@ -0,0 +1,235 @@
+import random
+import time
+from typing import Callable
+
+import httpx
+import numpy as np
+
+from app.models.spotify import AudioFeatures, PlaybackState, SpotifyArtist, SpotifyQueue, SpotifyTrack
+
+_MASK = (1 << 64) - 1
+
+
+def _mix(value: int) -> int:
+    """splitmix64 finalizer: a fast, well-distributed 64-bit hash"""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+class SyntheticCatalog:
+    """
+    Seeded catalog of tracks held as columns (about 60 bytes per track). Features follow
+    rough real-world shapes: most tracks are vocal with a minority of instrumentals,
+    energy/valence are bell shaped, durations log-normal around 3.5 minutes. Track index
+    doubles as popularity rank. SpotifyTrack/AudioFeatures objects are built on demand.
+    """
+    ID_PREFIX = "syn"
+
+    def __init__(self, size: int = 50_000, seed: int = 0, missing_features: float = 0.02):
+        rng = np.random.default_rng(seed)
+        self.size = size
+        instrumental = rng.random(size) < 0.3
+        self.instrumentalness = np.where(instrumental, rng.beta(5, 1.5, size), rng.beta(0.5, 8, size)).astype(np.float32)
+        self.energy = rng.beta(2.5, 2, size).astype(np.float32)
+        self.valence = rng.beta(2, 2, size).astype(np.float32)
+        self.danceability = rng.beta(3, 2.2, size).astype(np.float32)
+        self.speechiness = rng.beta(1, 12, size).astype(np.float32)
+        self.acousticness = rng.beta(0.7, 1.5, size).astype(np.float32)
+        self.liveness = rng.beta(1.5, 8, size).astype(np.float32)
+        self.loudness = np.clip(rng.normal(-8, 3.5, size), -30, 0).astype(np.float32)
+        self.tempo = np.clip(rng.normal(120, 28, size), 60, 200).astype(np.float32)
+        self.key = rng.integers(0, 12, size, dtype=np.int8)
+        self.mode = (rng.random(size) < 0.65).astype(np.int8)
+        self.time_signature = np.where(rng.random(size) < 0.95, 4, 3).astype(np.int8)
+        self.duration_ms = np.clip(rng.lognormal(np.log(210_000), 0.3, size), 60_000, 600_000).astype(np.int32)
+        self.explicit = rng.random(size) < 0.15
+        rank = np.arange(size) / size
+        self.popularity = np.clip(100 * np.exp(-3 * rank) + rng.normal(0, 5, size), 0, 100).astype(np.int8)
+        self.has_features = rng.random(size) >= missing_features
+
+    def track_id(self, index: int) -> str:
+        return f"{self.ID_PREFIX}_{index}"
+
+    def index_of(self, track_id: str) -> int | None:
+        prefix, _, index = track_id.partition("_")
+        if prefix != self.ID_PREFIX or not index.isdigit() or int(index) >= self.size:
+            return None
+        return int(index)
+
+    def track(self, index: int) -> SpotifyTrack:
+        track_id = self.track_id(index)
+        return SpotifyTrack(
+            id=track_id,
+            name=f"Synthetic Track {index}",
+            uri=f"spotify:track:{track_id}",
+            duration_ms=int(self.duration_ms[index]),
+            explicit=bool(self.explicit[index]),
+            popularity=int(self.popularity[index]),
+            artists=[SpotifyArtist(id=f"{self.ID_PREFIX}_artist_{index % 997}", name=f"Synthetic Artist {index % 997}")],
+        )
+
+    def features(self, track_id: str) -> AudioFeatures | None:
+        index = self.index_of(track_id)
+        if index is None or not self.has_features[index]:
+            return None
+        return AudioFeatures(
+            id=track_id,
+            energy=float(self.energy[index]),
+            instrumentalness=float(self.instrumentalness[index]),
+            valence=float(self.valence[index]),
+            danceability=float(self.danceability[index]),
+            key=int(self.key[index]),
+            loudness=float(self.loudness[index]),
+            mode=int(self.mode[index]),
+            speechiness=float(self.speechiness[index]),
+            acousticness=float(self.acousticness[index]),
+            liveness=float(self.liveness[index]),
+            tempo=float(self.tempo[index]),
+            duration_ms=int(self.duration_ms[index]),
+            time_signature=int(self.time_signature[index]),
+        )
+
+
+class ListenerPool:
+    """
+    N virtual listeners over a shared catalog, each playing tracks back to back in real or
+    virtual time. Per listener the pool keeps only three numbers (current play number, its
+    start time, library offset), 20 bytes; everything else is derived from a seeded
+    hash of (listener, play number):
+    - the track: drawn from the listener's library, a window of `library_size` tracks placed
+      with a bias towards popular tracks, so listeners overlap the way real ones do
+    - an optional pause within the track (`pause_rate`, lasting up to `max_pause` seconds);
+      some pauses are device hand-offs, during which nothing is reported as playing
+    So the upcoming queue is known ahead, and a run only depends on the seed and the clock.
+    """
+
+    def __init__(self, catalog: SyntheticCatalog, listeners: int, seed: int = 0, library_size: int = 500,
+                 popularity_skew: float = 2.0, pause_rate: float = 0.05, max_pause: float = 300.0,
+                 device_change_rate: float = 0.2, clock: Callable[[], float] = time.monotonic):
+        self.catalog = catalog
+        self.listeners = listeners
+        self.seed = seed
+        self.library_size = min(library_size, catalog.size)
+        self.pause_rate = pause_rate
+        self.max_pause = max_pause
+        self.device_change_rate = device_change_rate
+        self.clock = clock
+        self._durations = (catalog.duration_ms / 1000).tolist()  # Python floats index faster than numpy scalars
+        rng = np.random.default_rng(seed)
+        span = catalog.size - self.library_size + 1
+        self.offset = (span * rng.random(listeners) ** popularity_skew).astype(np.int32)
+        self.play_no = np.zeros(listeners, dtype=np.int64)
+        # Listeners start somewhere in their first play, so their track boundaries are spread out
+        now = clock()
+        self.started = now - rng.random(listeners) * np.array(
+            [sum(self.play(listener, 0)[1::2]) for listener in range(listeners)])
+
+    def play(self, listener: int, play_no: int) -> tuple[int, float, float, float, bool]:
+        """
+        (track index, track seconds, pause start, pause seconds, device hand-off) of a listener's
+        play; one hash decides the track and whether it pauses, a second one shapes the pause
+        """
+        hashed = _mix(_mix(self.seed * 0x100000001B3 + listener) ^ play_no)
+        index = int(self.offset[listener]) + ((hashed >> 32) * self.library_size >> 32)
+        duration = self._durations[index]
+        if (hashed & 0xFFFFFFFF) >= self.pause_rate * 2 ** 32:
+            return index, duration, 0.0, 0.0, False
+        shape = _mix(hashed)
+        return (index, duration, (shape >> 43) / 2 ** 21 * duration,
+                1 + (shape >> 22 & 0x1FFFFF) / 2 ** 21 * self.max_pause,
+                (shape & 0x3FFFFF) < self.device_change_rate * 2 ** 22)
+
+    def track_index(self, listener: int, play_no: int) -> int:
+        return self.play(listener, play_no)[0]
+
+    def _sync(self, listener: int) -> tuple[int, float, tuple]:
+        """Advances the listener past every play that ended; returns (play number, seconds into it, play)"""
+        now = self.clock()
+        play_no, started = int(self.play_no[listener]), float(self.started[listener])
+        play = self.play(listener, play_no)
+        while now - started >= play[1] + play[3]:
+            started += play[1] + play[3]
+            play_no += 1
+            play = self.play(listener, play_no)
+        self.play_no[listener], self.started[listener] = play_no, started
+        return play_no, now - started, play
+
+    def playback(self, listener: int) -> PlaybackState | None:
+        _, elapsed, (index, _, pause_at, pause_length, hand_off) = self._sync(listener)
+        paused = pause_length and pause_at <= elapsed < pause_at + pause_length
+        if paused and hand_off:
+            return None
+        if pause_length and elapsed >= pause_at:
+            elapsed = pause_at if paused else elapsed - pause_length
+        return PlaybackState(
+            timestamp=int(time.time() * 1000),
+            progress_ms=int(elapsed * 1000),
+            is_playing=not paused,
+            currently_playing_type="track",
+            item=self.catalog.track(index),
+        )
+
+    def queue(self, listener: int, size: int = 20) -> SpotifyQueue:
+        play_no, _, play = self._sync(listener)
+        return SpotifyQueue(
+            currently_playing=self.catalog.track(play[0]),
+            queue=[self.catalog.track(self.track_index(listener, play_no + offset)) for offset in range(1, size + 1)],
+        )
+
+    def skip(self, listener: int):
+        play_no, _, _ = self._sync(listener)
+        self.play_no[listener] = play_no + 1
+        self.started[listener] = self.clock()
+
+    def listener(self, listener: int) -> "SyntheticListener":
+        return SyntheticListener(self, listener)
+
+
+class SyntheticListener:
+    """One listener of a ListenerPool, as a player for MockSpotifyService"""
+    __slots__ = ("pool", "listener")
+
+    def __init__(self, pool: ListenerPool, listener: int):
+        self.pool = pool
+        self.listener = listener
+
+    def playback(self) -> PlaybackState | None:
+        return self.pool.playback(self.listener)
+
+    def queue(self, size: int = 20) -> SpotifyQueue:
+        return self.pool.queue(self.listener, size)
+
+    def skip(self):
+        self.pool.skip(self.listener)
+
+    def features(self, track_id: str) -> AudioFeatures | None:
+        return self.pool.catalog.features(track_id)
+
+
+class FaultInjector:
+    """
+    Makes a share of calls fail the way ProdSpotifyService surfaces Spotify errors once its
+    retries are spent: an HTTPStatusError for 429 (with Retry-After) or 401.
+    """
+
+    def __init__(self, rate_429: float = 0.0, rate_401: float = 0.0, retry_after: int = 1, seed: int | None = None):
+        self.rate_429 = rate_429
+        self.rate_401 = rate_401
+        self.retry_after = retry_after
+        self.injected = {429: 0, 401: 0}
+        self._rng = random.Random(seed)
+
+    def check(self, endpoint: str):
+        roll = self._rng.random()
+        if roll < self.rate_429:
+            self._fail(endpoint, 429, {"Retry-After": str(self.retry_after)})
+        elif roll < self.rate_429 + self.rate_401:
+            self._fail(endpoint, 401, {})
+
+    def _fail(self, endpoint: str, status: int, headers: dict):
+        self.injected[status] += 1
+        request = httpx.Request("GET", f"https://api.spotify.com/v1{endpoint}")
+        response = httpx.Response(status, headers=headers, request=request)
+        raise httpx.HTTPStatusError(f"Injected {status} for {endpoint}", request=request, response=response)
@@ -0,0 +1,17 @@
+from app.core.config import settings
+from app.services.storage.base import StorageBackend
+from app.services.storage.memory import InMemoryStorage
+from app.services.storage.redis import RedisStorage
+
+
+def build_storage() -> StorageBackend:
+    """The backend selected by STORAGE_BACKEND"""
+    if settings.STORAGE_BACKEND == "memory":
+        return InMemoryStorage(settings.STORAGE_SNAPSHOT_PATH, settings.STORAGE_SNAPSHOT_INTERVAL)
+    if settings.STORAGE_BACKEND == "redis":
+        return RedisStorage()
+    raise ValueError(f"Unknown storage backend: '{settings.STORAGE_BACKEND}'")
+
+
+# Shared by every component of this process, opened and closed by the app lifespan
+storage = build_storage()
@@ -0,0 +1,72 @@
+from typing import Protocol
+
+
+class ChangeSubscription(Protocol):
+    """
+    Strategy change notifications, from the moment the subscription was opened
+    """
+
+    async def wait(self, timeout: float) -> bool:
+        """True when a change was published within `timeout` seconds"""
+
+    async def close(self):
+        """Unsubscribes"""
+
+
+class StorageBackend(Protocol):
+    """
+    Interface for shared state: the versioned strategy catalog, and values with an optional
+    TTL (token cache, other caches). Values are opaque bytes, see app.services.codec.
+    Every strategy write bumps the catalog version and notifies subscribers atomically.
+    """
+
+    async def open(self):
+        """Connects, or loads the persisted state"""
+
+    async def close(self):
+        """Disconnects, or persists the state"""
+
+    async def get(self, key: str) -> bytes | None:
+        """Value of `key`, None when missing or expired"""
+
+    async def get_with_ttl(self, key: str) -> tuple[bytes | None, float | None]:
+        """Value of `key` and its remaining TTL in seconds (None without expiry)"""
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        """Values of `keys`, in the same order"""
+
+    async def set(self, key: str, value: bytes | str, ttl: float | None = None, only_if_absent: bool = False) -> bool:
+        """Stores `value`, expiring after `ttl` seconds; False when `only_if_absent` and the key exists"""
+
+    async def set_many(self, entries: dict[str, bytes | str], ttl: float | None = None):
+        """Stores several values with the same TTL"""
+
+    async def delete(self, key: str):
+        """Removes `key`"""
+
+    async def delete_if_equal(self, key: str, value: bytes | str) -> bool:
+        """Removes `key` only if it still holds `value` (e.g. releasing a lock), atomically"""
+
+    async def get_version(self) -> int:
+        """Strategy catalog version, 0 before the first write"""
+
+    async def get_catalog(self) -> dict[str, bytes]:
+        """Every encoded strategy config by id"""
+
+    async def get_strategies(self, strategy_ids: list[str]) -> list[bytes | None]:
+        """Encoded configs of `strategy_ids`, in the same order"""
+
+    async def get_active_strategy(self) -> tuple[str | None, bytes | None]:
+        """Active strategy id and its encoded config, read together"""
+
+    async def load_strategies(self) -> tuple[int, dict[str, bytes], str | None]:
+        """Version, catalog and active id, read together"""
+
+    async def upsert_strategies(self, strategies: dict[str, bytes]) -> int:
+        """Writes encoded configs by id as a single change; returns the new version"""
+
+    async def set_active_strategy(self, strategy_id: str) -> int | str:
+        """Sets the active id if that strategy exists and is enabled; returns the new version, else 'missing' or 'disabled'"""
+
+    async def subscribe_changes(self) -> ChangeSubscription:
+        """Opens a subscription to strategy changes"""
@@ -0,0 +1,202 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import msgpack
+
+from app.core.logging import logger
+from app.services.codec import StrategyConfigCodec
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class InMemoryChangeSubscription:
+    def __init__(self, storage: "InMemoryStorage"):
+        self.storage = storage
+        self._changed = asyncio.Event()
+
+    def notify(self):
+        self._changed.set()
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        # Changes published meanwhile are coalesced, readers only need to know they are stale
+        self._changed.clear()
+        return True
+
+    async def close(self):
+        self.storage._subscriptions.discard(self)
+
+
+class InMemoryStorage:
+    """
+    Shared state kept in this process, for single-node deployments without Redis. Every
+    operation completes without yielding to the event loop, so each one is atomic like its
+    Redis script counterpart. With `snapshot_path`, the state is written there every
+    `snapshot_interval` seconds (when it changed) and on close, and loaded again on open.
+    Expired values are dropped when read, and swept on the same interval.
+    """
+
+    def __init__(self, snapshot_path: str | None = None, snapshot_interval: float = 30.0):
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.snapshot_interval = snapshot_interval
+        self.codec = StrategyConfigCodec()
+        # key -> (value, expires_at as a wall clock time, so TTLs survive a restart)
+        self._values: dict[str, tuple[bytes, float | None]] = {}
+        self._catalog: dict[str, bytes] = {}
+        self._active_id: str | None = None
+        self._version = 0
+        self._subscriptions: set[InMemoryChangeSubscription] = set()
+        self._dirty = False
+        self._maintenance_task: asyncio.Task | None = None
+
+    async def open(self):
+        if self.snapshot_path and self.snapshot_path.exists():
+            self._restore(await asyncio.to_thread(self.snapshot_path.read_bytes))
+            logger.info("Storage snapshot loaded", path=str(self.snapshot_path), version=self._version,
+                        values=len(self._values))
+        self._maintenance_task = asyncio.create_task(self._maintain())
+
+    async def close(self):
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        await self.save()
+
+    async def save(self):
+        """Writes the state to `snapshot_path`, if it changed since the last save"""
+        if not self.snapshot_path or not self._dirty:
+            return
+        data, self._dirty = self._dump(), False
+        await asyncio.to_thread(self._write_snapshot, data)
+
+    def _write_snapshot(self, data: bytes):
+        # Replaced atomically, a crash mid-write leaves the previous snapshot in place
+        temporary = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, self.snapshot_path)
+
+    def _dump(self) -> bytes:
+        return msgpack.packb({
+            "format": SNAPSHOT_FORMAT_VERSION,
+            "values": {key: [value, expires_at] for key, (value, expires_at) in self._values.items()},
+            "catalog": self._catalog,
+            "active_id": self._active_id,
+            "version": self._version,
+        })
+
+    def _restore(self, data: bytes):
+        snapshot = msgpack.unpackb(data)
+        if snapshot.get("format") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported storage snapshot format: {snapshot.get('format')}")
+        self._values = {key: (value, expires_at) for key, (value, expires_at) in snapshot["values"].items()}
+        self._catalog = snapshot["catalog"]
+        self._active_id = snapshot["active_id"]
+        self._version = snapshot["version"]
+        self._sweep()
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            self._sweep()
+            try:
+                await self.save()
+            except OSError as e:
+                self._dirty = True
+                logger.warning("Failed to write the storage snapshot", path=str(self.snapshot_path), error=str(e))
+
+    def _sweep(self):
+        now = time.time()
+        for key in [key for key, (_, expires_at) in self._values.items() if expires_at is not None and expires_at <= now]:
+            del self._values[key]
+
+    def _entry(self, key: str) -> tuple[bytes, float | None] | None:
+        entry = self._values.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self._values[key]
+            return None
+        return entry
+
+    def _store(self, key: str, value: bytes | str, ttl: float | None):
+        self._values[key] = (value.encode() if isinstance(value, str) else value,
+                             time.time() + ttl if ttl is not None else None)
+        self._dirty = True
+
+    def _changed(self) -> int:
+        self._version += 1
+        self._dirty = True
+        for subscription in self._subscriptions:
+            subscription.notify()
+        return self._version
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entry(key)
+        return entry[0] if entry else None
+
+    async def get_with_ttl(self, key: str) -> tuple[bytes | None, float | None]:
+        entry = self._entry(key)
+        if entry is None:
+            return None, None
+        value, expires_at = entry
+        return value, expires_at - time.time() if expires_at is not None else None
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return [entry[0] if (entry := self._entry(key)) else None for key in keys]
+
+    async def set(self, key: str, value: bytes | str, ttl: float | None = None, only_if_absent: bool = False) -> bool:
+        if only_if_absent and self._entry(key) is not None:
+            return False
+        self._store(key, value, ttl)
+        return True
+
+    async def set_many(self, entries: dict[str, bytes | str], ttl: float | None = None):
+        for key, value in entries.items():
+            self._store(key, value, ttl)
+
+    async def delete(self, key: str):
+        if self._values.pop(key, None) is not None:
+            self._dirty = True
+
+    async def delete_if_equal(self, key: str, value: bytes | str) -> bool:
+        entry = self._entry(key)
+        if entry is None or entry[0] != (value.encode() if isinstance(value, str) else value):
+            return False
+        await self.delete(key)
+        return True
+
+    async def get_version(self) -> int:
+        return self._version
+
+    async def get_catalog(self) -> dict[str, bytes]:
+        return dict(self._catalog)
+
+    async def get_strategies(self, strategy_ids: list[str]) -> list[bytes | None]:
+        return [self._catalog.get(strategy_id) for strategy_id in strategy_ids]
+
+    async def get_active_strategy(self) -> tuple[str | None, bytes | None]:
+        return self._active_id, self._catalog.get(self._active_id) if self._active_id else None
+
+    async def load_strategies(self) -> tuple[int, dict[str, bytes], str | None]:
+        return self._version, dict(self._catalog), self._active_id
+
+    async def upsert_strategies(self, strategies: dict[str, bytes]) -> int:
+        self._catalog.update(strategies)
+        return self._changed()
+
+    async def set_active_strategy(self, strategy_id: str) -> int | str:
+        strategy = self._catalog.get(strategy_id)
+        if strategy is None:
+            return "missing"
+        if not self.codec.decode(strategy_id, strategy).is_active:
+            return "disabled"
+        self._active_id = strategy_id
+        return self._changed()
+
+    async def subscribe_changes(self) -> InMemoryChangeSubscription:
+        subscription = InMemoryChangeSubscription(self)
+        self._subscriptions.add(subscription)
+        return subscription
@@ -0,0 +1,176 @@
+import time
+
+from app.core.redis import redis_manager
+from app.services.codec import MAGIC
+
+# Reads the active id and its config in one round trip.
+# KEYS[1] = active id, KEYS[2] = catalog hash
+# Returns {} without an active id, {active_id} when its config is missing, else {active_id, config}
+GET_ACTIVE_SCRIPT = """
+local active_id = redis.call('GET', KEYS[1])
+if not active_id then
+    return {}
+end
+local strategy = redis.call('HGET', KEYS[2], active_id)
+if not strategy then
+    return {active_id}
+end
+return {active_id, strategy}
+"""
+
+# Validates and sets the active id, bumps the version and publishes it, atomically.
+# KEYS[1] = active id, KEYS[2] = catalog hash, KEYS[3] = version
+# ARGV    = strategy_id, changes channel
+# Returns the new version, or 'missing' / 'disabled' without writing
+SET_ACTIVE_SCRIPT = f"""
+local strategy = redis.call('HGET', KEYS[2], ARGV[1])
+if not strategy then
+    return 'missing'
+end
+-- Configs are msgpack after the StrategyConfigCodec header, or legacy JSON
+if string.byte(strategy, 1) == {MAGIC} then
+    strategy = cmsgpack.unpack(string.sub(strategy, 3))
+else
+    strategy = cjson.decode(strategy)
+end
+if strategy['is_active'] == false then
+    return 'disabled'
+end
+redis.call('SET', KEYS[1], ARGV[1])
+local version = redis.call('INCR', KEYS[3])
+redis.call('PUBLISH', ARGV[2], version)
+return version
+"""
+
+# Writes any number of configs with a single version bump and notification.
+# KEYS[1] = catalog hash, KEYS[2] = version
+# ARGV    = changes channel, then strategy_id, config pairs
+# HSET is called in chunks of 500 pairs, since unpack is limited by the Lua stack size
+UPSERT_SCRIPT = """
+for first = 2, #ARGV, 1000 do
+    redis.call('HSET', KEYS[1], unpack(ARGV, first, math.min(first + 999, #ARGV)))
+end
+local version = redis.call('INCR', KEYS[2])
+redis.call('PUBLISH', ARGV[1], version)
+return version
+"""
+
+# Deletes the key only if it still holds the given value
+# KEYS[1] = key, ARGV[1] = expected value
+DELETE_IF_EQUAL_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisChangeSubscription:
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    async def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        # Subscribe confirmations are read (and ignored) as None too, keep reading until the deadline
+        while (remaining := deadline - time.monotonic()) > 0:
+            if await self.pubsub.get_message(timeout=remaining) is not None:
+                return True
+        return False
+
+    async def close(self):
+        await self.pubsub.aclose()
+
+
+class RedisStorage:
+    """
+    Shared state in Redis, for any number of replicas. Strategy writes run as Lua scripts
+    that also bump `strategies:version` and publish it on `strategies:changes`.
+    """
+
+    STRATEGIES_CATALOG_KEY = "strategies:catalog"
+    ACTIVE_STRATEGY_KEY = "strategies:active_id"
+    # Bumped on every write and published on the changes channel, so readers can cache safely
+    VERSION_KEY = "strategies:version"
+    CHANGES_CHANNEL = "strategies:changes"
+
+    async def open(self):
+        await redis_manager.connect()
+
+    async def close(self):
+        await redis_manager.disconnect()
+
+    async def get(self, key: str) -> bytes | None:
+        return await redis_manager.get_binary_client().get(key)
+
+    async def get_with_ttl(self, key: str) -> tuple[bytes | None, float | None]:
+        async with redis_manager.get_binary_client().pipeline(transaction=False) as pipe:
+            value, ttl_ms = await pipe.get(key).pttl(key).execute()
+        return value, ttl_ms / 1000 if ttl_ms >= 0 else None
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return await redis_manager.get_binary_client().mget(keys)
+
+    async def set(self, key: str, value: bytes | str, ttl: float | None = None, only_if_absent: bool = False) -> bool:
+        px = max(int(ttl * 1000), 1) if ttl is not None else None
+        return bool(await redis_manager.get_binary_client().set(key, value, px=px, nx=only_if_absent))
+
+    async def set_many(self, entries: dict[str, bytes | str], ttl: float | None = None):
+        px = max(int(ttl * 1000), 1) if ttl is not None else None
+        async with redis_manager.get_binary_client().pipeline(transaction=False) as pipe:
+            for key, value in entries.items():
+                pipe.set(key, value, px=px)
+            await pipe.execute()
+
+    async def delete(self, key: str):
+        await redis_manager.get_binary_client().delete(key)
+
+    async def delete_if_equal(self, key: str, value: bytes | str) -> bool:
+        client = redis_manager.get_binary_client()
+        return bool(await client.register_script(DELETE_IF_EQUAL_SCRIPT)(keys=[key], args=[value]))
+
+    async def get_version(self) -> int:
+        return int(await redis_manager.get_binary_client().get(self.VERSION_KEY) or 0)
+
+    async def get_catalog(self) -> dict[str, bytes]:
+        strategies = await redis_manager.get_binary_client().hgetall(self.STRATEGIES_CATALOG_KEY)
+        return {strategy_id.decode(): strategy for strategy_id, strategy in strategies.items()}
+
+    async def get_strategies(self, strategy_ids: list[str]) -> list[bytes | None]:
+        return await redis_manager.get_binary_client().hmget(self.STRATEGIES_CATALOG_KEY, strategy_ids)
+
+    async def get_active_strategy(self) -> tuple[str | None, bytes | None]:
+        client = redis_manager.get_binary_client()
+        result = await client.register_script(GET_ACTIVE_SCRIPT)(
+            keys=[self.ACTIVE_STRATEGY_KEY, self.STRATEGIES_CATALOG_KEY])
+        if not result:
+            return None, None
+        return result[0].decode(), result[1] if len(result) > 1 else None
+
+    async def load_strategies(self) -> tuple[int, dict[str, bytes], str | None]:
+        async with redis_manager.get_binary_client().pipeline(transaction=True) as pipe:
+            version, raw, active_id = await (pipe.get(self.VERSION_KEY).hgetall(self.STRATEGIES_CATALOG_KEY)
+                                             .get(self.ACTIVE_STRATEGY_KEY).execute())
+        catalog = {strategy_id.decode(): strategy for strategy_id, strategy in raw.items()}
+        return int(version or 0), catalog, active_id and active_id.decode()
+
+    async def upsert_strategies(self, strategies: dict[str, bytes]) -> int:
+        fields = [value for strategy_id, strategy in strategies.items() for value in (strategy_id, strategy)]
+        client = redis_manager.get_binary_client()
+        return await client.register_script(UPSERT_SCRIPT)(keys=[self.STRATEGIES_CATALOG_KEY, self.VERSION_KEY],
+                                                           args=[self.CHANGES_CHANNEL, *fields])
+
+    async def set_active_strategy(self, strategy_id: str) -> int | str:
+        client = redis_manager.get_binary_client()
+        result = await client.register_script(SET_ACTIVE_SCRIPT)(
+            keys=[self.ACTIVE_STRATEGY_KEY, self.STRATEGIES_CATALOG_KEY, self.VERSION_KEY],
+            args=[strategy_id, self.CHANGES_CHANNEL])
+        return result.decode() if isinstance(result, bytes) else result
+
+    async def subscribe_changes(self) -> RedisChangeSubscription:
+        pubsub = redis_manager.get_client().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self.CHANGES_CHANNEL)
+        except BaseException:
+            await pubsub.aclose()
+            raise
+        return RedisChangeSubscription(pubsub)
@@ -0,0 +1,132 @@
+import asyncio
+from typing import Any, Awaitable
+
+from app.core.logging import logger
+from app.models.strategy import StrategyConfig
+from app.services.codec import StrategyConfigCodec
+from app.services.storage import StorageBackend
+from app.services.strategy_manager import StrategyChangeListener, StrategyManager
+
+
+class StrategySnapshot:
+    """The catalog and active id as of one `strategies:version`"""
+    __slots__ = ("version", "catalog", "active_id", "raw")
+
+    def __init__(self, version: int, catalog: dict[str, StrategyConfig], active_id: str | None,
+                 raw: dict[str, bytes]):
+        self.version = version
+        self.catalog = catalog
+        self.active_id = active_id
+        self.raw = raw  # Encoded config per strategy id, so a reload only parses what changed
+
+
+class StrategyCacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.version_checks = 0
+        self.reloads = 0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "version_checks": self.version_checks, "reloads": self.reloads}
+
+
+class CachedStrategyManager(StrategyManager):
+    """
+    StrategyManager serving reads from an in-process snapshot of the catalog and active id.
+    While `run` is subscribed to strategy changes, reads make no storage round trip: a
+    published change, or a write through this manager, marks the snapshot stale and the
+    next read reloads it in one round trip (MULTI/EXEC on Redis). Without the subscription,
+    each read first checks the catalog version. Writes and their validation still go to
+    the storage. Returned configs are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, reconnect_interval: float = 1.0, codec: StrategyConfigCodec | None = None,
+                 storage: StorageBackend | None = None):
+        super().__init__(codec, storage)
+        self.stats = StrategyCacheStats()
+        self.listener = StrategyChangeListener(self.invalidate, reconnect_interval, self.storage)
+        self._snapshot: StrategySnapshot | None = None
+        # Bumped by every invalidation; the snapshot is stale until a reload started since then
+        self._generation = 0
+        self._loaded_generation = -1
+        self._reload_task: asyncio.Task | None = None
+
+    @property
+    def subscribed(self) -> bool:
+        return self.listener.subscribed
+
+    @property
+    def stale(self) -> bool:
+        return self._loaded_generation < self._generation
+
+    def invalidate(self):
+        """Forces the next read to reload the snapshot"""
+        self._generation += 1
+
+    async def snapshot(self) -> StrategySnapshot:
+        if not self.stale:
+            if self.listener.subscribed:
+                self.stats.hits += 1
+                return self._snapshot
+            version = await super().get_version()
+            self.stats.version_checks += 1
+            if version == self._snapshot.version:
+                return self._snapshot
+            self.invalidate()
+        generation = self._generation
+        while self._loaded_generation < generation:
+            # Concurrent reads share one reload; one that started before this read is awaited, then redone
+            if self._reload_task is None or self._reload_task.done():
+                self._reload_task = asyncio.create_task(self._reload())
+            await asyncio.shield(self._reload_task)
+        return self._snapshot
+
+    async def _reload(self):
+        generation = self._generation
+        version, raw, active_id = await self.storage.load_strategies()
+        previous = self._snapshot
+        catalog = {
+            strategy_id: previous.catalog[strategy_id] if previous and previous.raw.get(strategy_id) == strategy
+            else self.codec.decode(strategy_id, strategy)
+            for strategy_id, strategy in raw.items()
+        }
+        self._snapshot = StrategySnapshot(version, catalog, active_id, raw)
+        self._loaded_generation = generation
+        self.stats.reloads += 1
+        logger.debug("Strategy snapshot loaded", version=self._snapshot.version, strategies=len(catalog))
+
+    async def _write(self, write: Awaitable) -> Any:
+        result = await super()._write(write)
+        # Read-your-writes, without waiting for our own change notification
+        self.invalidate()
+        return result
+
+    async def get_version(self) -> int:
+        return (await self.snapshot()).version
+
+    async def get_catalog(self, only_active: bool = False) -> list[StrategyConfig]:
+        strategies = (await self.snapshot()).catalog.values()
+        return [strategy for strategy in strategies if strategy.is_active or not only_active]
+
+    async def get_active_strategy(self) -> StrategyConfig:
+        snapshot = await self.snapshot()
+        if not snapshot.active_id:
+            raise ValueError("No active strategy configured")
+        strategy = snapshot.catalog.get(snapshot.active_id)
+        if strategy is None:
+            raise ValueError(f"Active strategy id: '{snapshot.active_id}' does not exist")
+        return strategy
+
+    async def get_strategies(self, strategy_ids: list[str]) -> list[StrategyConfig]:
+        catalog = (await self.snapshot()).catalog
+        missing = [strategy_id for strategy_id in strategy_ids if strategy_id not in catalog]
+        if missing:
+            raise ValueError(f"Strategy ids: {missing} do not exist")
+        return [catalog[strategy_id] for strategy_id in strategy_ids]
+
+    async def run(self):
+        """Keeps the snapshot coherent with the other replicas, see StrategyChangeListener"""
+        await self.listener.run()
+
+    def stop(self):
+        self.listener.stop()
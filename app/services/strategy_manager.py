@@ -1,42 +1,147 @@
-from app.core.redis import redis_manager
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+from app.core.logging import logger
 from app.models.strategy import StrategyConfig
+from app.services.codec import StrategyConfigCodec
+from app.services.storage import StorageBackend, storage as default_storage
+from app.strategies.chain import check_chain_members, is_chain, parse_chain
 
 
 class StrategyManager:
-    STRATEGIES_CATALOG_KEY = "strategies:catalog"
-    ACTIVE_STRATEGY_KEY = "strategies:active_id"
+    """
+    Strategy catalog and active strategy on top of a StorageBackend. Every write bumps the
+    catalog version and notifies subscribers, so readers can cache safely.
+    """
+
+    def __init__(self, codec: StrategyConfigCodec | None = None, storage: StorageBackend | None = None):
+        self.codec = codec or StrategyConfigCodec(settings.REDIS_BINARY_CODECS)
+        self.storage = storage or default_storage
+
+    async def get_version(self) -> int:
+        """Current catalog version; changes whenever a strategy or the active id is written"""
+        return await self.storage.get_version()
+
+    async def _write(self, write: Awaitable) -> Any:
+        """Awaits a storage write; each one bumps the version and notifies subscribers atomically"""
+        return await write
 
     async def get_catalog(self, only_active: bool = False) -> list[StrategyConfig]:
         """Retrieve all strategy configurations"""
-        client = redis_manager.get_client()
-        strategies = await client.hgetall(self.STRATEGIES_CATALOG_KEY)
-        strategies_catalog = [StrategyConfig.model_validate_json(strategy) for strategy in strategies.values()]
+        strategies = await self.storage.get_catalog()
+        strategies_catalog = [self.codec.decode(strategy_id, strategy) for strategy_id, strategy in strategies.items()]
         if only_active:
             return [strategy for strategy in strategies_catalog if strategy.is_active]
         return strategies_catalog
 
     async def set_active_strategy(self, strategy_id: str):
         """Set an active strategy"""
-        client = redis_manager.get_client()
-        strategy = await client.hget(self.STRATEGIES_CATALOG_KEY, strategy_id)
-        if not strategy:
+        [strategy] = await self.storage.get_strategies([strategy_id])
+        if strategy is not None:
+            config = self.codec.decode(strategy_id, strategy)
+            if is_chain(config.parameters):
+                members = parse_chain(config.parameters, config.id)
+                configs = await self.storage.get_strategies(members)
+                check_chain_members(config.id, members, {
+                    member: self.codec.decode(member, raw).parameters
+                    for member, raw in zip(members, configs) if raw is not None})
+        result = await self._write(self.storage.set_active_strategy(strategy_id))
+        if result == "missing":
             raise ValueError(f"Strategy id: '{strategy_id}' does not exist")
-        if not StrategyConfig.model_validate_json(strategy).is_active:
+        if result == "disabled":
             raise ValueError(f"Strategy id: '{strategy_id}' is dsabled")
-        await client.set(self.ACTIVE_STRATEGY_KEY, strategy_id)
 
     async def get_active_strategy(self) -> StrategyConfig:
         """Get the currently active strategy configuration"""
-        client = redis_manager.get_client()
-        active_strategy_id = await client.get(self.ACTIVE_STRATEGY_KEY)
-        if not active_strategy_id:
+        active_id, strategy = await self.storage.get_active_strategy()
+        if not active_id:
             raise ValueError("No active strategy configured")
-        strategy = await client.hget(self.STRATEGIES_CATALOG_KEY, active_strategy_id)
-        if not strategy:
-            raise ValueError(f"Active strategy id: '{active_strategy_id}' does not exist")
-        return StrategyConfig.model_validate_json(strategy)
+        if strategy is None:
+            raise ValueError(f"Active strategy id: '{active_id}' does not exist")
+        return self.codec.decode(active_id, strategy)
+
+    async def get_strategies(self, strategy_ids: list[str]) -> list[StrategyConfig]:
+        """Get several strategy configurations, in the given order"""
+        strategies = await self.storage.get_strategies(strategy_ids)
+        missing = [strategy_id for strategy_id, strategy in zip(strategy_ids, strategies) if not strategy]
+        if missing:
+            raise ValueError(f"Strategy ids: {missing} do not exist")
+        return [self.codec.decode(strategy_id, strategy) for strategy_id, strategy in zip(strategy_ids, strategies)]
 
     async def upsert_strategy(self, strategy: StrategyConfig):
         """Create or update a strategy configuration"""
-        client = redis_manager.get_client()
-        await client.hset(self.STRATEGIES_CATALOG_KEY, strategy.id, strategy.model_dump_json())
+        await self.upsert_strategies([strategy])
+
+    async def upsert_strategies(self, strategies: list[StrategyConfig]):
+        """Create or update several strategy configurations at once, as a single change"""
+        if not strategies:
+            return
+        await self._check_chains(strategies)
+        await self._write(self.storage.upsert_strategies(
+            {strategy.id: self.codec.encode(strategy) for strategy in strategies}))
+
+    async def _check_chains(self, strategies: list[StrategyConfig]):
+        """Rejects chains with missing or chained members, and turning a chain member into a chain"""
+        if not any(is_chain(strategy.parameters) for strategy in strategies):
+            return
+        catalog = {strategy.id: strategy.parameters for strategy in await self.get_catalog()}
+        catalog.update({strategy.id: strategy.parameters for strategy in strategies})
+        for strategy in strategies:
+            if not is_chain(strategy.parameters):
+                continue
+            check_chain_members(strategy.id, parse_chain(strategy.parameters, strategy.id), catalog)
+            parents = [chain_id for chain_id, parameters in catalog.items()
+                       if is_chain(parameters) and strategy.id in parameters["chain"]]
+            if parents:
+                raise ValueError(f"Strategy id: '{strategy.id}' is a member of chains {parents}, it cannot be a chain")
+
+
+class StrategyChangeListener:
+    """
+    Subscribes to the strategy changes channel and calls `on_change` for every published
+    change, and on each (re)subscription since changes may have been missed meanwhile.
+    Resubscribes every `reconnect_interval` seconds while the connection is down.
+    """
+
+    def __init__(self, on_change: Callable[[], None], reconnect_interval: float = 1.0,
+                 storage: StorageBackend | None = None):
+        self.on_change = on_change
+        self.reconnect_interval = reconnect_interval
+        self.storage = storage or default_storage
+        self._subscribed = False
+        self._stop_event = asyncio.Event()
+
+    @property
+    def subscribed(self) -> bool:
+        return self._subscribed
+
+    async def run(self):
+        """Listens for strategy changes, resubscribing whenever the connection drops"""
+        while not self._stop_event.is_set():
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Strategy change subscription lost, falling back to version checks", error=str(e))
+            finally:
+                self._subscribed = False
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), self.reconnect_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _listen(self):
+        subscription = await self.storage.subscribe_changes()
+        try:
+            self.on_change()
+            self._subscribed = True
+            while not self._stop_event.is_set():
+                if await subscription.wait(timeout=1.0):
+                    self.on_change()
+        finally:
+            await subscription.close()
+
+    def stop(self):
+        self._stop_event.set()
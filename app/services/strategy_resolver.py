@@ -0,0 +1,81 @@
+from app.core.logging import logger
+from app.models.strategy import StrategyConfig
+from app.services.strategy_manager import StrategyChangeListener, StrategyManager
+from app.strategies.base import PlaybackStrategy
+from app.strategies.chain import is_chain, parse_chain
+from app.strategies.strategy_factory import StrategyFactory
+
+
+class ResolverStats:
+    def __init__(self):
+        self.hits = 0
+        self.version_checks = 0
+        self.reloads = 0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "version_checks": self.version_checks, "reloads": self.reloads}
+
+
+class ActiveStrategyResolver:
+    """
+    Resolves the active strategy for engine ticks without touching storage in steady state.
+    The active config and its compiled strategy are cached against `strategies:version`.
+    Every write through the StrategyManager bumps that version and publishes it. The
+    listener then marks the cache stale, so the next tick reloads it. While the subscription
+    is down, each resolve falls back to a single GET of the version.
+    """
+
+    def __init__(self, strategy_manager: StrategyManager, reconnect_interval: float = 1.0):
+        self.strategy_manager = strategy_manager
+        self.reconnect_interval = reconnect_interval
+        self.stats = ResolverStats()
+        self.config: StrategyConfig | None = None
+        self.strategy: PlaybackStrategy | None = None
+        self._version: int | None = None
+        self._stale = True
+        # Changes are watched on the manager's storage; managers without one (e.g. static) use the default
+        self.listener = StrategyChangeListener(self.invalidate, reconnect_interval,
+                                               getattr(strategy_manager, "storage", None))
+
+    @property
+    def subscribed(self) -> bool:
+        return self.listener.subscribed
+
+    def invalidate(self):
+        """Forces the next resolve to reload the active strategy"""
+        self._stale = True
+
+    async def resolve(self) -> tuple[StrategyConfig, PlaybackStrategy]:
+        """Returns the active strategy config and its compiled implementation"""
+        if self.listener.subscribed and not self._stale:
+            self.stats.hits += 1
+            return self.config, self.strategy
+
+        version = await self.strategy_manager.get_version()
+        self.stats.version_checks += 1
+        if not self._stale and version == self._version:
+            return self.config, self.strategy
+
+        # Cleared before loading, so a change published while loading triggers another reload
+        self._stale = False
+        try:
+            config = await self.strategy_manager.get_active_strategy()
+            if is_chain(config.parameters):
+                members = await self.strategy_manager.get_strategies(parse_chain(config.parameters))
+                strategy = StrategyFactory.make_chain(members)
+            else:
+                strategy = StrategyFactory.get(config)
+        except Exception:
+            self._stale = True
+            raise
+        self.config, self.strategy, self._version = config, strategy, version
+        self.stats.reloads += 1
+        logger.info("Active strategy loaded", strategy_id=config.id, version=version)
+        return config, strategy
+
+    async def run(self):
+        """Listens for strategy changes, resubscribing whenever the connection drops"""
+        await self.listener.run()
+
+    def stop(self):
+        self.listener.stop()
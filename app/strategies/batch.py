@@ -0,0 +1,77 @@
+from typing import Protocol, Sequence, runtime_checkable
+
+import numpy as np
+
+from app.models.spotify import SpotifyTrack
+from app.strategies.base import PlaybackStrategy, StrategyAction
+
+# Numeric AudioFeatures fields, in column order
+FEATURE_COLUMNS = (
+    "energy", "instrumentalness", "valence", "danceability", "key", "loudness", "mode",
+    "speechiness", "acousticness", "liveness", "tempo", "duration_ms", "time_signature",
+)
+# SpotifyTrack metadata, available without an audio features fetch
+TRACK_COLUMNS = ("explicit", "popularity")
+COLUMNS = FEATURE_COLUMNS + TRACK_COLUMNS
+COLUMN_INDEX = {name: index for index, name in enumerate(COLUMNS)}
+
+
+class FeatureMatrix:
+    """
+    Columnar audio features and metadata of many tracks.
+    `values` holds one contiguous float64 column per AudioFeatures field and per track column
+    (NaN where a value is missing), and `has_features` marks the tracks that have features at all.
+    """
+
+    def __init__(self, values: np.ndarray, has_features: np.ndarray, tracks: Sequence[SpotifyTrack] | None = None):
+        self.values = values
+        self.has_features = has_features
+        self.tracks = tracks
+
+    def __len__(self) -> int:
+        return len(self.has_features)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, COLUMN_INDEX[name]]
+
+    @classmethod
+    def from_tracks(cls, tracks: Sequence[SpotifyTrack]) -> "FeatureMatrix":
+        missing = [None] * len(FEATURE_COLUMNS)
+        rows = [
+            ([getattr(track.features, name) for name in FEATURE_COLUMNS] if track.features else missing)
+            + [getattr(track, name) for name in TRACK_COLUMNS]
+            for track in tracks
+        ]
+        values = np.asfortranarray(np.array(rows, dtype=np.float64).reshape(len(tracks), len(COLUMNS)))
+        has_features = np.fromiter((track.features is not None for track in tracks), dtype=bool, count=len(tracks))
+        return cls(values, has_features, tracks)
+
+    @classmethod
+    def from_columns(cls, size: int, **columns: np.ndarray) -> "FeatureMatrix":
+        """Builds a matrix straight from column arrays; fields not given are missing (NaN)"""
+        values = np.full((size, len(COLUMNS)), np.nan, dtype=np.float64, order="F")
+        for name, column in columns.items():
+            values[:, COLUMN_INDEX[name]] = column
+        return cls(values, np.ones(size, dtype=bool))
+
+
+@runtime_checkable
+class BatchPlaybackStrategy(Protocol):
+    """
+    A strategy that can decide a whole FeatureMatrix at once.
+    Must return exactly what `evaluate` would return for each track.
+    """
+    def evaluate_batch(self, matrix: FeatureMatrix) -> np.ndarray:
+        """Returns a boolean mask, True where the track should be skipped"""
+
+
+async def evaluate_batch(strategy: PlaybackStrategy, matrix: FeatureMatrix) -> np.ndarray:
+    """
+    Skip mask for every track of the matrix. Vectorized when the strategy supports it,
+    otherwise falls back to calling `evaluate` once per track.
+    """
+    if isinstance(strategy, BatchPlaybackStrategy):
+        return strategy.evaluate_batch(matrix)
+    if matrix.tracks is None:
+        raise ValueError(f"{type(strategy).__name__} has no batch evaluation and the matrix holds no tracks")
+    return np.array([await strategy.evaluate(track) == StrategyAction.SKIP for track in matrix.tracks], dtype=bool)
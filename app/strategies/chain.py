@@ -0,0 +1,157 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from app.models.spotify import AudioFeatures, SpotifyTrack
+from app.strategies.base import PlaybackStrategy, StrategyAction
+
+CHAIN_KEY = "chain"
+
+
+def is_chain(parameters: dict[str, Any]) -> bool:
+    return CHAIN_KEY in parameters
+
+
+def parse_chain(parameters: dict[str, Any], chain_id: str | None = None) -> list[str]:
+    """Validates a chain definition: a non-empty list of distinct strategy ids, other than the chain's own"""
+    members = parameters[CHAIN_KEY]
+    if not isinstance(members, list) or not members or not all(isinstance(member, str) and member for member in members):
+        raise ValueError("'chain' takes a non-empty list of strategy ids")
+    if len(set(members)) != len(members):
+        raise ValueError("'chain' lists the same strategy more than once")
+    if chain_id is not None and chain_id in members:
+        raise ValueError("'chain' cannot list the chain itself")
+    return members
+
+
+def check_chain_members(chain_id: str, members: list[str], catalog: dict[str, dict[str, Any]]):
+    """
+    Checks that every member of a chain exists in `catalog` (strategy id -> parameters)
+    and is not a chain itself, since chains are built from plain strategies only
+    """
+    missing = [member for member in members if member not in catalog]
+    if missing:
+        raise ValueError(f"Chain '{chain_id}' members: {missing} do not exist")
+    nested = [member for member in members if is_chain(catalog[member])]
+    if nested:
+        raise ValueError(f"Chain '{chain_id}' members: {nested} are chains, chains cannot be nested")
+
+
+class ChainRuleStats:
+    def __init__(self):
+        self.evaluations = 0
+        self.rejections = 0
+        self.total_time = 0.0
+
+    @property
+    def reject_rate(self) -> float:
+        # Optimistic prior, so a new rule gets evaluated early until it has data
+        return (self.rejections + 1) / (self.evaluations + 2)
+
+    @property
+    def avg_cost(self) -> float:
+        return self.total_time / self.evaluations if self.evaluations else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "evaluations": self.evaluations,
+            "rejections": self.rejections,
+            "reject_rate": round(self.rejections / self.evaluations, 4) if self.evaluations else None,
+            "avg_cost_us": round(self.avg_cost * 1e6, 2),
+        }
+
+
+class ChainRule:
+    __slots__ = ("name", "strategy", "needs_features", "stats")
+
+    def __init__(self, name: str, strategy: PlaybackStrategy):
+        self.name = name
+        self.strategy = strategy
+        self.needs_features = getattr(strategy, "needs_features", True)
+        self.stats = ChainRuleStats()
+
+    def rank(self) -> tuple[bool, float]:
+        """
+        Rules that need no audio features go first, since they may avoid the fetch.
+        Within each group, the lowest expected cost per rejection goes first.
+        """
+        return self.needs_features, self.stats.avg_cost / self.stats.reject_rate
+
+
+class StrategyChain:
+    """
+    Runs several strategies as one: a track is skipped as soon as any of them rejects it.
+    Rules are reordered every `reorder_interval` decisions by their observed cost and
+    reject rate. Audio features are fetched only when a rule that needs them is reached.
+    """
+
+    def __init__(self, rules: list[tuple[str, PlaybackStrategy]], reorder_interval: int = 50,
+                 fingerprint: str | None = None):
+        self.rules = [ChainRule(name, strategy) for name, strategy in rules]
+        self.rules.sort(key=ChainRule.rank)
+        self.reorder_interval = reorder_interval
+        # Identifies the member configs; the verdict does not depend on the rule order
+        self.fingerprint = fingerprint
+        self.needs_features = any(rule.needs_features for rule in self.rules)
+        self.decisions = 0
+        self.reorders = 0
+        self.features_fetches = 0
+        self.features_fetches_avoided = 0
+
+    @property
+    def order(self) -> list[str]:
+        return [rule.name for rule in self.rules]
+
+    async def evaluate(self, track: SpotifyTrack) -> StrategyAction:
+        return await self.decide(track)
+
+    async def decide(self, track: SpotifyTrack,
+                     load_features: Callable[[], Awaitable[AudioFeatures | None]] | None = None,
+                     ) -> StrategyAction | None:
+        """
+        Evaluates the rules in their current order.
+        `load_features` is called at most once, right before the first rule that needs features.
+        Returns None when no rule skipped but some could not run for lack of features.
+        """
+        action = StrategyAction.KEEP
+        fetched = loaded = False
+        for rule in self.rules:
+            if rule.needs_features and not track.features and not loaded:
+                if not fetched and load_features is not None:
+                    fetched = True
+                    self.features_fetches += 1
+                    loaded = bool(await load_features())
+                if not loaded:
+                    action = None
+                    continue
+
+            started = time.perf_counter()
+            rule_action = await rule.strategy.evaluate(track)
+            rule.stats.total_time += time.perf_counter() - started
+            rule.stats.evaluations += 1
+            if rule_action == StrategyAction.SKIP:
+                rule.stats.rejections += 1
+                action = StrategyAction.SKIP
+                break
+
+        if not fetched and self.needs_features and not track.features and load_features is not None:
+            self.features_fetches_avoided += 1
+        self.decisions += 1
+        if self.decisions % self.reorder_interval == 0:
+            self._reorder()
+        return action
+
+    def _reorder(self):
+        order = self.order
+        self.rules.sort(key=ChainRule.rank)
+        if self.order != order:
+            self.reorders += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "order": self.order,
+            "decisions": self.decisions,
+            "reorders": self.reorders,
+            "features_fetches": self.features_fetches,
+            "features_fetches_avoided": self.features_fetches_avoided,
+            "rules": {rule.name: rule.stats.as_dict() for rule in self.rules},
+        }
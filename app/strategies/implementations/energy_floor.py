@@ -1,4 +1,7 @@
+import numpy as np
+
 from app.strategies.base import StrategyAction
+from app.strategies.batch import FeatureMatrix
 from app.models.spotify import SpotifyTrack
 from app.core.logging import logger
 
@@ -27,4 +30,7 @@ class EnergyFloorStrategy:
             energy=energy,
             floor=self.energy_floor
         )
-        return StrategyAction.SKIP
\ No newline at end of file
+        return StrategyAction.SKIP
+
+    def evaluate_batch(self, matrix: FeatureMatrix) -> np.ndarray:
+        return matrix.has_features & ~(matrix.column("energy") >= self.energy_floor)
@@ -1,6 +1,9 @@
+import numpy as np
+
 from app.core.logging import logger
 from app.models.spotify import SpotifyTrack
 from app.strategies.base import StrategyAction
+from app.strategies.batch import FeatureMatrix
 
 
 class FocusGuardStrategy:
@@ -32,4 +35,11 @@ class FocusGuardStrategy:
                         name=track.name,
                         instrumentalness=features.instrumentalness,
                         energy=features.energy)
-            return StrategyAction.SKIP
\ No newline at end of file
+            return StrategyAction.SKIP
+
+    def evaluate_batch(self, matrix: FeatureMatrix) -> np.ndarray:
+        focus_condition = (
+            (matrix.column("instrumentalness") >= self.instrumental_threshold) &
+            (matrix.column("energy") <= self.energy_threshold)
+        )
+        return matrix.has_features & ~focus_condition
@@ -0,0 +1,36 @@
+import numpy as np
+
+from app.core.logging import logger
+from app.models.spotify import SpotifyTrack
+from app.strategies.base import StrategyAction
+from app.strategies.batch import FeatureMatrix
+from app.strategies.rules import Rule, compile_mask, compile_predicate
+
+
+class RuleStrategy:
+    """
+    Keeps or skips tracks according to a declarative rule (see app.strategies.rules)
+    Logic: skip_if matches -> SKIP, keep_if does not match -> SKIP
+    """
+
+    def __init__(self, rule: Rule, name: str = "rule"):
+        self.rule = rule
+        self.name = name
+        self.needs_features = rule.needs_features
+        self._matches = compile_predicate(rule)
+        self._mask = compile_mask(rule)
+
+    async def evaluate(self, track: SpotifyTrack) -> StrategyAction:
+        if self.needs_features and not track.features:
+            return StrategyAction.KEEP
+
+        if self._matches(track.features, track) != self.rule.skips_matches:
+            return StrategyAction.KEEP
+
+        logger.info("Rule: Track rejected", strategy=self.name, track_id=track.id, name=track.name)
+        return StrategyAction.SKIP
+
+    def evaluate_batch(self, matrix: FeatureMatrix) -> np.ndarray:
+        matches = self._mask(matrix)
+        skip = matches if self.rule.skips_matches else ~matches
+        return skip & matrix.has_features if self.needs_features else skip
@@ -1,4 +1,7 @@
+import numpy as np
+
 from app.strategies.base import StrategyAction
+from app.strategies.batch import FeatureMatrix
 from app.models.spotify import SpotifyTrack
 from app.core.logging import logger
 
@@ -28,4 +31,8 @@ class VibeShiftStrategy:
             valence=valence,
             range=f"{self.min_valence}-{self.max_valence}"
         )
-        return StrategyAction.SKIP
\ No newline at end of file
+        return StrategyAction.SKIP
+
+    def evaluate_batch(self, matrix: FeatureMatrix) -> np.ndarray:
+        valence = matrix.column("valence")
+        return matrix.has_features & ~((self.min_valence <= valence) & (valence <= self.max_valence))
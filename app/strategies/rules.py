@@ -0,0 +1,181 @@
+"""
+Declarative rules stored in `StrategyConfig.parameters`.
+
+A rule strategy has exactly one of `skip_if` / `keep_if`, holding an expression:
+
+    {"all": [<expr>, ...]}                                  every sub-expression holds
+    {"any": [<expr>, ...]}                                  at least one holds
+    {"not": <expr>}
+    {"field": "tempo", "op": "between", "value": [90, 120]}
+
+Fields are the numeric AudioFeatures fields plus the track's `explicit` and `popularity`.
+Operators: ==, !=, <, <=, >, >=, between (inclusive) and in. A comparison on a missing
+value (e.g. no tempo) is false, except `!=`, which is true.
+
+Rules are validated when the config is built and compiled once into a flat Python
+predicate and a NumPy mask function.
+"""
+import math
+from typing import Any, Callable
+
+import numpy as np
+
+from app.models.spotify import AudioFeatures, SpotifyTrack
+from app.strategies.batch import FEATURE_COLUMNS, TRACK_COLUMNS, FeatureMatrix
+
+RULE_MODES = ("skip_if", "keep_if")
+COMPARISONS = ("==", "!=", "<", "<=", ">", ">=")
+OPERATORS = COMPARISONS + ("between", "in")
+BOOLEAN_FIELDS = {"explicit"}
+# AudioFeatures fields that may be None; ordered comparisons on them need a guard
+OPTIONAL_FEATURES = {name for name in FEATURE_COLUMNS if not AudioFeatures.model_fields[name].is_required()}
+MAX_DEPTH = 16
+
+
+class Rule:
+    """A validated rule: whether matching tracks are skipped or kept, and its expression"""
+
+    def __init__(self, mode: str, expression: dict):
+        self.mode = mode
+        self.expression = expression
+        self.fields = _collect_fields(expression)
+        self.needs_features = any(field in FEATURE_COLUMNS for field in self.fields)
+
+    @property
+    def skips_matches(self) -> bool:
+        return self.mode == "skip_if"
+
+
+def is_rule(parameters: dict[str, Any]) -> bool:
+    return any(mode in parameters for mode in RULE_MODES)
+
+
+def parse_rule(parameters: dict[str, Any]) -> Rule:
+    """Validates the rule in strategy parameters; raises ValueError describing the first problem"""
+    modes = [mode for mode in RULE_MODES if mode in parameters]
+    if len(modes) != 1:
+        raise ValueError("A rule strategy needs exactly one of 'skip_if' or 'keep_if'")
+    mode = modes[0]
+    _validate(parameters[mode], path=mode, depth=0)
+    return Rule(mode, parameters[mode])
+
+
+def _validate(expression: Any, path: str, depth: int):
+    if depth > MAX_DEPTH:
+        raise ValueError(f"{path}: rule is nested deeper than {MAX_DEPTH} levels")
+    if not isinstance(expression, dict):
+        raise ValueError(f"{path}: expected an object, got {type(expression).__name__}")
+
+    if "all" in expression or "any" in expression:
+        combinator = "all" if "all" in expression else "any"
+        operands = expression[combinator]
+        if len(expression) != 1 or not isinstance(operands, list) or not operands:
+            raise ValueError(f"{path}: '{combinator}' takes a non-empty list and nothing else")
+        for index, operand in enumerate(operands):
+            _validate(operand, f"{path}.{combinator}[{index}]", depth + 1)
+        return
+    if "not" in expression:
+        if len(expression) != 1:
+            raise ValueError(f"{path}: 'not' takes a single expression and nothing else")
+        _validate(expression["not"], f"{path}.not", depth + 1)
+        return
+
+    if set(expression) != {"field", "op", "value"}:
+        raise ValueError(f"{path}: a condition needs exactly 'field', 'op' and 'value'")
+    field, op, value = expression["field"], expression["op"], expression["value"]
+    if field not in FEATURE_COLUMNS and field not in TRACK_COLUMNS:
+        raise ValueError(f"{path}: unknown field '{field}'")
+    if op not in OPERATORS:
+        raise ValueError(f"{path}: unknown operator '{op}', expected one of {', '.join(OPERATORS)}")
+    if field in BOOLEAN_FIELDS:
+        if op not in ("==", "!=") or not isinstance(value, bool):
+            raise ValueError(f"{path}: '{field}' can only be compared with == or != to true/false")
+    elif op == "between":
+        if not (isinstance(value, list) and len(value) == 2 and all(_is_number(bound) for bound in value)):
+            raise ValueError(f"{path}: 'between' takes a [low, high] pair of numbers")
+        if value[0] > value[1]:
+            raise ValueError(f"{path}: 'between' bounds are reversed")
+    elif op == "in":
+        if not (isinstance(value, list) and value and all(_is_number(item) for item in value)):
+            raise ValueError(f"{path}: 'in' takes a non-empty list of numbers")
+    elif not _is_number(value):
+        raise ValueError(f"{path}: '{op}' on '{field}' takes a number")
+
+
+def _is_number(value: Any) -> bool:
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return False
+    try:
+        return math.isfinite(value)
+    except OverflowError:
+        # Integers beyond the float range, they could not be compared as features anyway
+        return False
+
+
+def _collect_fields(expression: dict) -> set[str]:
+    if "field" in expression:
+        return {expression["field"]}
+    if "not" in expression:
+        return _collect_fields(expression["not"])
+    operands = expression.get("all") or expression.get("any")
+    return set().union(*(_collect_fields(operand) for operand in operands))
+
+
+def _literal(value: Any) -> str:
+    # Values are validated numbers/bools, so their repr is safe to embed in generated code
+    return repr(value) if isinstance(value, bool) else repr(float(value))
+
+
+def _predicate_source(expression: dict) -> str:
+    if "all" in expression:
+        return "(" + " and ".join(_predicate_source(operand) for operand in expression["all"]) + ")"
+    if "any" in expression:
+        return "(" + " or ".join(_predicate_source(operand) for operand in expression["any"]) + ")"
+    if "not" in expression:
+        return f"(not {_predicate_source(expression['not'])})"
+
+    field, op, value = expression["field"], expression["op"], expression["value"]
+    operand = f"features.{field}" if field in FEATURE_COLUMNS else f"track.{field}"
+    if op == "between":
+        condition = f"{_literal(value[0])} <= {operand} <= {_literal(value[1])}"
+    elif op == "in":
+        condition = f"{operand} in ({', '.join(_literal(item) for item in value)},)"
+    else:
+        condition = f"{operand} {op} {_literal(value)}"
+    if field in OPTIONAL_FEATURES and op not in ("==", "!=", "in"):
+        condition = f"{operand} is not None and {condition}"
+    return f"({condition})"
+
+
+def _mask_source(expression: dict, columns: dict[str, str]) -> str:
+    if "all" in expression:
+        return "(" + " & ".join(_mask_source(operand, columns) for operand in expression["all"]) + ")"
+    if "any" in expression:
+        return "(" + " | ".join(_mask_source(operand, columns) for operand in expression["any"]) + ")"
+    if "not" in expression:
+        return f"(~{_mask_source(expression['not'], columns)})"
+
+    field, op, value = expression["field"], expression["op"], expression["value"]
+    column = columns.setdefault(field, f"c{len(columns)}")
+    if op == "between":
+        return f"(({_literal(value[0])} <= {column}) & ({column} <= {_literal(value[1])}))"
+    if op == "in":
+        return f"np.isin({column}, ({', '.join(_literal(item) for item in value)},))"
+    return f"({column} {op} {_literal(value)})"
+
+
+def compile_predicate(rule: Rule) -> Callable[[AudioFeatures | None, SpotifyTrack], bool]:
+    """Compiles the rule into one flat function of (features, track), with no per-track interpretation"""
+    source = f"lambda features, track: {_predicate_source(rule.expression)}"
+    return eval(compile(source, "<rule>", "eval"), {"__builtins__": {}})
+
+
+def compile_mask(rule: Rule) -> Callable[[FeatureMatrix], np.ndarray]:
+    """Compiles the rule into a function returning the boolean match mask of a FeatureMatrix"""
+    columns: dict[str, str] = {}
+    expression = _mask_source(rule.expression, columns)
+    lines = [f"    {name} = matrix.column({field!r})" for field, name in columns.items()]
+    source = "def mask(matrix):\n" + "\n".join(lines) + f"\n    return {expression}\n"
+    namespace = {"np": np}
+    exec(compile(source, "<rule>", "exec"), namespace)
+    return namespace["mask"]
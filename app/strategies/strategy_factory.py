@@ -1,10 +1,41 @@
+import hashlib
+
 from app.models.strategy import StrategyConfig
+from app.strategies.base import PlaybackStrategy
+from app.strategies.chain import StrategyChain, is_chain
+from app.strategies.rules import is_rule, parse_rule
 from app.strategies.implementations.energy_floor import EnergyFloorStrategy
 from app.strategies.implementations.focus_guard import FocusGuardStrategy
+from app.strategies.implementations.rule_based import RuleStrategy
 from app.strategies.implementations.vibe_shift import VibeShiftStrategy
 
 
 class StrategyFactory:
+    # Compiled strategies by config fingerprint; they are stateless, so one instance is shared by every caller
+    _compiled: dict[str, PlaybackStrategy] = {}
+    MAX_COMPILED = 256
+
+    @classmethod
+    def get(cls, config: StrategyConfig) -> PlaybackStrategy:
+        """
+        Returns the compiled strategy for a config, building it only the first time
+        its id and parameters are seen
+        """
+        key = config.fingerprint()
+        strategy = cls._compiled.get(key)
+        if strategy is None:
+            if len(cls._compiled) >= cls.MAX_COMPILED:
+                cls._compiled.clear()
+            strategy = cls._compiled[key] = cls.make(config)
+        return strategy
+
+    @classmethod
+    def make_chain(cls, members: list[StrategyConfig]) -> StrategyChain:
+        """Builds a chain from the configs of its member strategies, reusing their compiled instances"""
+        fingerprints = sorted(member.fingerprint() for member in members)
+        fingerprint = hashlib.sha1(":".join(fingerprints).encode()).hexdigest()[:16]
+        return StrategyChain([(member.id, cls.get(member)) for member in members], fingerprint=fingerprint)
+
     @staticmethod
     def make(config: StrategyConfig):
         """
@@ -12,6 +43,13 @@ class StrategyFactory:
         """
         params = config.parameters or {}
 
+        if is_chain(params):
+            raise ValueError(f"Strategy '{config.id}' is a chain, build it with make_chain from its members")
+
+        # Declarative rules work for any id, no implementation class needed
+        if is_rule(params):
+            return RuleStrategy(parse_rule(params), name=config.id)
+
         if config.id == "focus":
             return FocusGuardStrategy(
                 instrumental_threshold=params.get("instrumentalness", 0.75),
@@ -0,0 +1,85 @@
+"""
+Redis value codec benchmark.
+
+Encodes and decodes synthetic audio features and a mix of strategy configs (legacy
+parameters, rules and chains) with each format the codecs can write, and reports the
+encoded size and the per-object encode/decode time. Pydantic JSON is what was stored
+before the codec layer (and is still what the text/JSON modes are compared against).
+
+    uv run python -m benchmarks.codecs --objects 20000
+"""
+import argparse
+import statistics
+import time
+
+from app.models.strategy import StrategyConfig
+from app.services.codec import AudioFeaturesCodec, StrategyConfigCodec
+from app.services.spotify.workload import SyntheticCatalog
+from benchmarks.common import silence_logging
+
+
+class PydanticJson:
+    def encode(self, value) -> bytes:
+        return value.model_dump_json().encode()
+
+
+def strategies() -> list[StrategyConfig]:
+    return [
+        StrategyConfig(id="focus", name="Focus Guard", description="Skips songs with lyrics or high energy.",
+                       parameters={"instrumentalness": 0.75, "energy": 0.5}),
+        StrategyConfig(id="gym", name="Gym", description="Keeps the energy up.",
+                       parameters={"skip_if": {"any": [{"field": "energy", "op": "<", "value": 0.7},
+                                                       {"field": "tempo", "op": "between", "value": [0, 110]}]}}),
+        StrategyConfig(id="evening", name="Evening", description="Calm, then quiet.",
+                       parameters={"chain": ["focus", "gym"]}),
+    ]
+
+
+def measure(objects: list, codec, key_of) -> dict:
+    started = time.perf_counter()
+    encoded = [codec.encode(value) for value in objects]
+    encode_us = (time.perf_counter() - started) / len(objects) * 1e6
+    decode_us = None
+    if hasattr(codec, "decode"):
+        started = time.perf_counter()
+        for value, data in zip(objects, encoded):
+            codec.decode(key_of(value), data)
+        decode_us = (time.perf_counter() - started) / len(objects) * 1e6
+    return {"bytes": statistics.mean(len(data) for data in encoded), "encode_us": encode_us, "decode_us": decode_us}
+
+
+def report(kind: str, objects: list, codecs: dict, key_of):
+    results = {name: measure(objects, codec, key_of) for name, codec in codecs.items()}
+    baseline = results["pydantic json"]["bytes"]
+    print(f"\n{kind} ({len(objects)} objects)")
+    print(f"{'format':<22}{'bytes':>8}{'vs json':>9}{'encode us':>11}{'decode us':>11}")
+    for name, result in results.items():
+        decode = "-" if result["decode_us"] is None else f"{result['decode_us']:.2f}"
+        print(f"{name:<22}{result['bytes']:>8.1f}{result['bytes'] / baseline:>8.0%} "
+              f"{result['encode_us']:>10.2f}{decode:>11}")
+
+
+def main(args):
+    catalog = SyntheticCatalog(size=args.objects, seed=args.seed, missing_features=0.0)
+    features = [catalog.features(catalog.track_id(index)) for index in range(args.objects)]
+    report("AudioFeatures", features, {
+        "pydantic json": PydanticJson(),
+        "text v1 (legacy)": AudioFeaturesCodec(binary=False),
+        "struct v1": AudioFeaturesCodec(),
+    }, key_of=lambda value: value.id)
+
+    configs = strategies() * (args.objects // 3)
+    report("StrategyConfig", configs, {
+        "pydantic json": PydanticJson(),
+        "json (legacy)": StrategyConfigCodec(binary=False),
+        "msgpack v1": StrategyConfigCodec(),
+    }, key_of=lambda value: value.id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    silence_logging()
+    main(args)
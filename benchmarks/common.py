@@ -0,0 +1,33 @@
+import logging
+
+import structlog
+
+from app.models.strategy import StrategyConfig
+
+
+def silence_logging(level: int = logging.WARNING):
+    """Drops everything below `level` so log output does not dominate the measurements"""
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(level))
+
+
+class StaticStrategyManager:
+    """
+    Serves a fixed active strategy without Redis, so benchmarks measure the engine itself
+    """
+
+    def __init__(self, config: StrategyConfig | None = None):
+        self.config = config or StrategyConfig(
+            id="focus",
+            name="Focus Guard",
+            description="Skips songs with lyrics or high energy.",
+            parameters={"instrumentalness": 0.75, "energy": 0.5},
+        )
+
+    async def get_version(self) -> int:
+        return 0
+
+    async def get_active_strategy(self) -> StrategyConfig:
+        return self.config
+
+    async def get_catalog(self, only_active: bool = False) -> list[StrategyConfig]:
+        return [self.config]
@@ -0,0 +1,102 @@
+"""
+Decision log write-path benchmark.
+
+Appends decisions at each target rate for `--duration` seconds, paced in 5 ms slices
+the way engine ticks arrive, while the DecisionLog writer task flushes them to the
+stream. Reports the rate sustained, the time an append costs the tick, the batches
+written and any entries dropped. For comparison, `awaited XADD` writes each decision
+with its own round trip, as a tick would without the buffer.
+
+Uses (and flushes) the database given by `--redis-url`.
+
+    uv run python -m benchmarks.decision_log --rates 1000 5000 20000 --duration 3
+"""
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+
+import redis.asyncio as redis
+
+from app.core.redis import redis_manager
+from app.services.decision_log import STREAM_KEY, DecisionLog
+from app.services.spotify.mock import mock_features
+from app.strategies.base import StrategyAction
+from app.strategies.strategy_factory import StrategyFactory
+from benchmarks.common import StaticStrategyManager, silence_logging
+
+CONFIG = StaticStrategyManager().config
+STRATEGY = StrategyFactory.get(CONFIG)
+FEATURES = [mock_features(f"track_{i}") for i in range(100)]
+
+
+async def buffered(rate: int, duration: float, batch_size: int, flush_interval: float) -> dict:
+    log = DecisionLog(batch_size=batch_size, flush_interval=flush_interval)
+    writer = asyncio.create_task(log.run())
+    append_seconds = 0.0
+    sent = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < duration:
+        due = int(elapsed * rate)
+        append_started = time.perf_counter()
+        for i in range(sent, due):
+            features = FEATURES[i % len(FEATURES)]
+            log.append(features.id, CONFIG, STRATEGY, None, StrategyAction.KEEP, "live", features, 0.001)
+        append_seconds += time.perf_counter() - append_started
+        sent = due
+        await asyncio.sleep(0.005)
+    log.stop()
+    await writer
+    elapsed = time.perf_counter() - started
+    return {"sent": sent, "rate": log.stats.written / elapsed, "append_us": append_seconds / max(sent, 1) * 1e6,
+            "flushes": log.stats.flushes, "dropped": log.stats.dropped}
+
+
+async def awaited(rate: int, duration: float, client: redis.Redis) -> dict:
+    """One XADD awaited per decision, so the writes hold up the (sequential) ticks"""
+    sent = 0
+    write_seconds = 0.0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < duration:
+        due = int(elapsed * rate)
+        for i in range(sent, due):
+            features = FEATURES[i % len(FEATURES)]
+            write_started = time.perf_counter()
+            await client.xadd(STREAM_KEY, {"track": features.id, "strategy": CONFIG.id, "action": "keep"},
+                              maxlen=1_000_000, approximate=True)
+            write_seconds += time.perf_counter() - write_started
+        sent = due
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - started
+    return {"sent": sent, "rate": sent / elapsed, "append_us": write_seconds / max(sent, 1) * 1e6,
+            "flushes": sent, "dropped": 0}
+
+
+async def main(args):
+    client = redis.Redis.from_url(args.redis_url)
+    print(f"{args.duration}s per run, batch size {args.batch_size}, flush interval {args.flush_interval * 1000:.0f} ms\n")
+    print(f"{'writer':<14}{'target/s':>10}{'written/s':>11}{'us/append':>11}{'round trips':>13}{'dropped':>9}")
+    with patch.object(redis_manager, "get_binary_client", return_value=client):
+        for rate in args.rates:
+            for name in ("DecisionLog", "awaited XADD"):
+                await client.flushdb()
+                if name == "DecisionLog":
+                    result = await buffered(rate, args.duration, args.batch_size, args.flush_interval)
+                else:
+                    result = await awaited(rate, args.duration, client)
+                print(f"{name:<14}{rate:>10}{result['rate']:>11.0f}{result['append_us']:>11.1f}"
+                      f"{result['flushes']:>13}{result['dropped']:>9}")
+    await client.flushdb()
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--rates", type=int, nargs="+", default=[1000, 5000, 20000], help="target decisions per second")
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--flush-interval", type=float, default=0.5, help="in seconds")
+    args = parser.parse_args()
+    silence_logging()
+    asyncio.run(main(args))
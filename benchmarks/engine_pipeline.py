@@ -0,0 +1,72 @@
+"""
+Engine pipeline benchmark.
+
+Runs one tick for each of N sessions against MockSpotifyService with an injected
+per-call latency, first one after the other with apply_strategy, then through the
+EnginePipeline at increasing stage concurrency, and reports ticks/second and the
+busiest stage.
+
+    uv run python -m benchmarks.engine_pipeline --sessions 500 --latency-ms 20 --concurrency 1 4 16 64
+"""
+import argparse
+import asyncio
+import time
+
+from app.services.engine import SyncStreamEngine
+from app.services.pipeline import EnginePipeline
+from app.services.spotify.mock import MockSpotifyService
+from benchmarks.common import StaticStrategyManager, silence_logging
+
+
+def make_engines(sessions: int, latency: float) -> list[SyncStreamEngine]:
+    spotify = MockSpotifyService(latency=latency)
+    strategy_manager = StaticStrategyManager()
+    return [SyncStreamEngine(spotify=spotify, strategy_manager=strategy_manager) for _ in range(sessions)]
+
+
+async def run_sequential(args) -> dict:
+    engines = make_engines(args.sessions, args.latency_ms / 1000)
+    started = time.perf_counter()
+    for engine in engines:
+        await engine.apply_strategy()
+    return {"ticks_per_sec": args.sessions / (time.perf_counter() - started)}
+
+
+async def run_pipeline(concurrency: int, args) -> dict:
+    engines = make_engines(args.sessions, args.latency_ms / 1000)
+    pipeline = EnginePipeline(concurrency=concurrency, queue_size=args.queue_size)
+    task = asyncio.create_task(pipeline.run())
+    started = time.perf_counter()
+    await asyncio.gather(*(pipeline.run_tick(engine) for engine in engines))
+    elapsed = time.perf_counter() - started
+    pipeline.stop()
+    await task
+
+    busiest = max(pipeline.stages, key=lambda stage: stage.stats.busy_time)
+    return {
+        "ticks_per_sec": args.sessions / elapsed,
+        "avg_tick_ms": pipeline.as_dict()["avg_tick_ms"],
+        "busiest_stage": busiest.step,
+        "max_depth": max(stage.stats.max_depth for stage in pipeline.stages),
+    }
+
+
+async def main(args):
+    silence_logging()
+    print(f"{args.sessions} sessions, {args.latency_ms} ms per Spotify call, queue size {args.queue_size}\n")
+    print(f"{'mode':>22} {'ticks/s':>10} {'avg tick ms':>12} {'busiest stage':>16} {'max depth':>10}")
+    result = await run_sequential(args)
+    print(f"{'sequential':>22} {result['ticks_per_sec']:>10.1f} {'-':>12} {'-':>16} {'-':>10}")
+    for concurrency in args.concurrency:
+        result = await run_pipeline(concurrency, args)
+        print(f"{f'pipeline x{concurrency}':>22} {result['ticks_per_sec']:>10.1f} {result['avg_tick_ms']:>12.1f} "
+              f"{result['busiest_stage']:>16} {result['max_depth']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Injected latency of every Spotify call")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64], help="Workers per stage")
+    parser.add_argument("--queue-size", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
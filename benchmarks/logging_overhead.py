@@ -0,0 +1,77 @@
+"""
+Logging overhead benchmark.
+
+Runs engine ticks back to back against MockSpotifyService (every tick logs at INFO) and
+reports ticks/second under each logging setup. Log lines go to a temporary file, like
+container logs would. Each setup runs in its own process, since structlog caches the
+logger configuration on first use.
+
+    uv run python -m benchmarks.logging_overhead --ticks 20000
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SETUPS = {
+    "dev (sync, full callsite)": ["--mode", "dev", "--callsite", "full"],
+    "dev, cached callsite": ["--mode", "dev", "--callsite", "cached"],
+    "production, no sampling": ["--mode", "production", "--event-rate", "0"],
+    "production": ["--mode", "production"],
+    "production, callsite off": ["--mode", "production", "--callsite", "off"],
+}
+
+
+async def run_ticks(ticks: int) -> float:
+    from app.services.engine import SyncStreamEngine
+    from app.services.spotify.mock import MockSpotifyService
+    from benchmarks.common import StaticStrategyManager
+
+    engine = SyncStreamEngine(spotify=MockSpotifyService(), strategy_manager=StaticStrategyManager())
+    started = time.perf_counter()
+    for _ in range(ticks):
+        await engine.apply_strategy()
+    return ticks / (time.perf_counter() - started)
+
+
+def run_setup(args):
+    from app.core.logging import setup_logging, shutdown_logging
+
+    with open(args.output, "a") as stream:
+        setup_logging(mode=args.mode, callsite=args.callsite, event_rate=args.event_rate, stream=stream)
+        ticks_per_sec = asyncio.run(run_ticks(args.ticks))
+        shutdown_logging()
+    print(f"{ticks_per_sec:.1f}")
+
+
+def main(args):
+    print(f"{args.ticks} ticks per setup\n")
+    print(f"{'setup':>28} {'ticks/s':>10} {'log lines':>10} {'vs dev':>8}")
+    baseline = None
+    for name, options in SETUPS.items():
+        with tempfile.NamedTemporaryFile(suffix=".log", delete=False) as output:
+            path = output.name
+        try:
+            result = subprocess.run([sys.executable, "-m", "benchmarks.logging_overhead", "--ticks", str(args.ticks),
+                                     "--output", path, *options], capture_output=True, text=True, check=True)
+            with open(path) as log:
+                lines = sum(1 for _ in log)
+        finally:
+            os.unlink(path)
+        ticks_per_sec = float(result.stdout.strip().splitlines()[-1])
+        baseline = baseline or ticks_per_sec
+        print(f"{name:>28} {ticks_per_sec:>10.1f} {lines:>10} {ticks_per_sec / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=20_000)
+    parser.add_argument("--mode", help="Runs a single setup and prints its ticks/second")
+    parser.add_argument("--callsite")
+    parser.add_argument("--event-rate", type=float)
+    parser.add_argument("--output", default=os.devnull)
+    parsed = parser.parse_args()
+    run_setup(parsed) if parsed.mode else main(parsed)
@@ -0,0 +1,97 @@
+"""
+Queue lookahead benchmark.
+
+Plays a simulated session (virtual clock, so hours run in seconds) of focus/noise tracks
+under FocusGuard and reports how long rejected tracks were audible, with and without
+queue lookahead, for the fixed and adaptive poll schedulers. Also reports the number of
+Spotify calls per hour, since lookahead trades queue requests for earlier skips.
+
+    uv run python -m benchmarks.lookahead --hours 4 --poll-interval 5
+"""
+import argparse
+import asyncio
+
+from app.services.engine import SyncStreamEngine
+from app.services.lookahead import QueueLookahead
+from app.services.polling import AdaptivePollScheduler, FixedPollScheduler
+from app.services.spotify.mock import MockSpotifyService, SimulatedPlayer
+from app.services.strategy_resolver import ActiveStrategyResolver
+from benchmarks.common import StaticStrategyManager, silence_logging
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingSpotify(MockSpotifyService):
+    def __init__(self, player: SimulatedPlayer):
+        super().__init__(player)
+        self.calls = 0
+
+    async def get_current_playback(self):
+        self.calls += 1
+        return await super().get_current_playback()
+
+    async def get_queue(self):
+        self.calls += 1
+        return await super().get_queue()
+
+    async def get_audio_features(self, track_id):
+        self.calls += 1
+        return await super().get_audio_features(track_id)
+
+    async def get_audio_features_batch(self, track_ids):
+        self.calls += 1
+        return await super().get_audio_features_batch(track_ids)
+
+    async def skip_next(self):
+        self.calls += 1
+        return await super().skip_next()
+
+
+async def run_scenario(poll_mode: str, depth: int, args) -> dict:
+    clock = VirtualClock()
+    player = SimulatedPlayer(focus_ratio=args.focus_ratio, seed=args.seed, clock=clock)
+    spotify = CountingSpotify(player)
+    scheduler = (AdaptivePollScheduler(args.poll_interval) if poll_mode == "adaptive"
+                 else FixedPollScheduler(args.poll_interval))
+    strategy_manager = StaticStrategyManager()
+    engine = SyncStreamEngine(spotify=spotify, strategy_manager=strategy_manager, poll_interval=args.poll_interval,
+                              poll_scheduler=scheduler, strategy_resolver=ActiveStrategyResolver(strategy_manager),
+                              lookahead=QueueLookahead(spotify, depth=depth) if depth else None)
+
+    while clock.now < args.hours * 3600:
+        await engine.apply_strategy()
+        clock.now += engine.next_poll_delay()
+
+    rejected = [played.audible for played in player.history if not played.is_focus]
+    return {
+        "avg_audible": sum(rejected) / len(rejected),
+        "max_audible": max(rejected),
+        "rejected": len(rejected),
+        "calls_per_hour": spotify.calls / args.hours,
+    }
+
+
+async def main(args):
+    silence_logging()
+    print(f"{'poll mode':<10} {'lookahead':>9} {'avg audible':>12} {'max audible':>12} {'rejected':>9} {'calls/h':>8}")
+    for poll_mode in ("fixed", "adaptive"):
+        for depth in (0, args.depth):
+            result = await run_scenario(poll_mode, depth, args)
+            print(f"{poll_mode:<10} {depth or 'off':>9} {result['avg_audible'] * 1000:>10.0f}ms "
+                  f"{result['max_audible'] * 1000:>10.0f}ms {result['rejected']:>9} {result['calls_per_hour']:>8.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=4)
+    parser.add_argument("--poll-interval", type=float, default=5)
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--focus-ratio", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
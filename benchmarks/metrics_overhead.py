@@ -0,0 +1,54 @@
+"""
+Metrics overhead benchmark.
+
+Runs engine ticks back to back against MockSpotifyService with instrumentation on and off,
+and reports the added cost per tick next to the cost of a single histogram observation.
+
+    uv run python -m benchmarks.metrics_overhead --ticks 50000
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+import timeit
+
+from app.core.metrics import MetricsRegistry, metrics
+from app.services.engine import SyncStreamEngine
+from app.services.spotify.mock import MockSpotifyService
+from benchmarks.common import StaticStrategyManager, silence_logging
+
+
+async def tick_seconds(ticks: int, enabled: bool) -> float:
+    metrics.enabled = enabled
+    random.seed(0)  # Same sequence of mock tracks on both sides
+    engine = SyncStreamEngine(spotify=MockSpotifyService(), strategy_manager=StaticStrategyManager())
+    started = time.perf_counter()
+    for _ in range(ticks):
+        await engine.apply_strategy()
+    return (time.perf_counter() - started) / ticks
+
+
+async def main(args):
+    silence_logging(logging.CRITICAL)  # Logging would dwarf the difference
+    histogram = MetricsRegistry().histogram("observe_seconds", "Benchmark", ["step"]).labels("decide")
+    observe_ns = timeit.timeit(lambda: histogram.observe(0.003), number=1_000_000) * 1000
+
+    results = {}
+    for _ in range(args.rounds):  # Interleaved, so drift affects both sides alike
+        for enabled in (False, True):
+            results.setdefault(enabled, []).append(await tick_seconds(args.ticks, enabled))
+    plain, instrumented = min(results[False]), min(results[True])
+
+    print(f"single histogram observation: {observe_ns:.0f} ns")
+    print(f"{'metrics':>10} {'ticks/s':>10} {'us/tick':>10}")
+    print(f"{'off':>10} {1 / plain:>10.0f} {plain * 1e6:>10.2f}")
+    print(f"{'on':>10} {1 / instrumented:>10.0f} {instrumented * 1e6:>10.2f}")
+    print(f"overhead: {(instrumented - plain) * 1e6:.2f} us/tick ({(instrumented / plain - 1) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=50_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
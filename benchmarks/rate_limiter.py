@@ -0,0 +1,110 @@
+"""
+Spotify rate limiter overload benchmark.
+
+Drives a synthetic Spotify API that allows `--server-rate` requests/second (429 + Retry-After
+beyond that) with far more concurrent callers than it can serve, mixing skip, playback and bulk
+feature requests. Compares throughput, per-priority queueing delay and 429 counts with and
+without the client-side limiter.
+
+    uv run python -m benchmarks.rate_limiter --duration 10
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+
+from app.services.spotify.prod import ProdSpotifyService
+from app.services.spotify.rate_limit import LocalTokenBucket, RequestPriority, SpotifyRateLimiter
+from benchmarks.common import silence_logging
+
+
+class OverloadedSpotify:
+    """Fixed-window rate limited API answering 429 with a Retry-After once the window is full"""
+
+    def __init__(self, rate: int):
+        self.rate = rate
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.served = 0
+        self.throttled = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        now = time.monotonic()
+        if now - self.window_start >= 1:
+            self.window_start, self.window_count = now, 0
+        if self.window_count >= self.rate:
+            self.throttled += 1
+            return httpx.Response(429, headers={"Retry-After": f"{1 - (now - self.window_start):.3f}"})
+        self.window_count += 1
+        self.served += 1
+        if request.url.path.endswith("/next"):
+            return httpx.Response(204)
+        if request.url.path.endswith("/player"):
+            return httpx.Response(200, json={"is_playing": False})
+        return httpx.Response(200, json={"audio_features": []})
+
+
+async def run_scenario(use_limiter: bool, args) -> dict:
+    spotify = OverloadedSpotify(args.server_rate)
+    limiter = SpotifyRateLimiter(LocalTokenBucket(args.client_rate, burst=args.client_rate // 10)) if use_limiter else None
+    latencies = {priority: [] for priority in RequestPriority}
+    failures = 0
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(spotify.handler)) as http_client:
+        service = ProdSpotifyService("id", "secret", "refresh", http_client=http_client, rate_limiter=limiter)
+        service._get_access_token = AsyncMock(return_value="token")
+        calls = {
+            RequestPriority.SKIP: service.skip_next,
+            RequestPriority.PLAYBACK: service.get_current_playback,
+            RequestPriority.BULK: lambda: service.get_audio_features_batch(["a", "b"]),
+        }
+        deadline = time.monotonic() + args.duration
+
+        async def caller():
+            nonlocal failures
+            rng = random.Random()
+            while time.monotonic() < deadline:
+                priority = rng.choices(list(RequestPriority), weights=[1, 4, 5])[0]
+                started = time.monotonic()
+                try:
+                    await calls[priority]()
+                    latencies[priority].append(time.monotonic() - started)
+                except httpx.HTTPStatusError:
+                    failures += 1
+
+        await asyncio.gather(*(caller() for _ in range(args.callers)))
+
+    def percentile(values, p):
+        return sorted(values)[int(len(values) * p / 100)] * 1000 if values else 0.0
+
+    return {
+        "served_per_sec": spotify.served / args.duration,
+        "server_429s": spotify.throttled,
+        "failed_requests": failures,
+        "latency": {priority.name: (percentile(latencies[priority], 50), percentile(latencies[priority], 99))
+                    for priority in RequestPriority},
+        "limiter": limiter.stats.as_dict() if limiter else None,
+    }
+
+
+async def main(args):
+    silence_logging(logging.CRITICAL)  # 429 warnings are the point of the overload
+    for use_limiter in (False, True):
+        result = await run_scenario(use_limiter, args)
+        print(f"--- {'with' if use_limiter else 'without'} client-side limiter ---")
+        print(f"served/s: {result['served_per_sec']:.1f}  429s: {result['server_429s']}  failed: {result['failed_requests']}")
+        for priority, (p50, p99) in result["latency"].items():
+            print(f"  {priority:<9} p50 {p50:8.1f}ms  p99 {p99:8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--callers", type=int, default=200)
+    parser.add_argument("--server-rate", type=int, default=100, help="Requests/second the fake API accepts")
+    parser.add_argument("--client-rate", type=int, default=90, help="Client-side limiter budget (requests/second)")
+    asyncio.run(main(parser.parse_args()))
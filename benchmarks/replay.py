@@ -0,0 +1,117 @@
+"""
+Replay harness.
+
+Replays listening sessions on a virtual clock for several engine configurations and
+compares Spotify calls per listening hour and how long rejected tracks stayed audible.
+Without --recordings, one session per user is first recorded from SimulatedPlayer
+(polled at every track change, so nothing is skipped in the recording).
+
+    uv run python -m benchmarks.replay --users 1000 --hours 24
+    uv run python -m benchmarks.replay --recordings ./recordings --hours 24
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.clock import VirtualClock
+from app.core.metrics import metrics
+from app.services.engine import SyncStreamEngine
+from app.services.lookahead import QueueLookahead
+from app.services.polling import AdaptivePollScheduler, FixedPollScheduler
+from app.services.spotify.mock import SimulatedPlayer, mock_features
+from app.services.spotify.recording import Recording, RecordingWriter
+from app.services.spotify.replay import ReplaySpotifyService
+from app.services.strategy_resolver import ActiveStrategyResolver
+from benchmarks.common import StaticStrategyManager, silence_logging
+
+ENGINES = {
+    "fixed": lambda spotify, args: dict(poll_scheduler=FixedPollScheduler(args.poll_interval)),
+    "adaptive": lambda spotify, args: dict(poll_scheduler=AdaptivePollScheduler(args.poll_interval)),
+    "adaptive+lookahead": lambda spotify, args: dict(poll_scheduler=AdaptivePollScheduler(args.poll_interval),
+                                                     lookahead=QueueLookahead(spotify)),
+}
+
+
+def record_synthetic(directory: Path, users: int, hours: float, seed: int) -> list[Path]:
+    paths = []
+    for user in range(users):
+        clock = VirtualClock(start=1_700_000_000.0)
+        player = SimulatedPlayer(seed=seed + user, clock=clock)
+        path = directory / f"user_{user}.jsonl"
+        writer = RecordingWriter(path, user_id=f"user_{user}", clock=clock)
+        end = clock() + hours * 3600
+        while clock.now < end:
+            playback = player.playback()
+            writer.playback(playback)
+            writer.features(playback.item.id, mock_features(playback.item.id))
+            # Next poll right after the track change
+            clock.now += (playback.item.duration_ms - playback.progress_ms) / 1000 + 0.1
+        writer.close()
+        paths.append(path)
+    return paths
+
+
+async def replay(recordings: list[Recording], engine_name: str, strategy_manager, args) -> dict:
+    clock = VirtualClock()
+    services, engines = [], []
+    for recording in recordings:
+        spotify = ReplaySpotifyService(recording, clock)
+        resolver = ActiveStrategyResolver(strategy_manager)
+        engine = SyncStreamEngine(spotify=spotify, strategy_manager=strategy_manager, poll_interval=args.poll_interval,
+                                  strategy_resolver=resolver, clock=clock, sleep=clock.sleep,
+                                  **ENGINES[engine_name](spotify, args))
+        services.append(spotify)
+        engines.append(engine)
+
+    started = time.perf_counter()
+    await clock.run([engine.run() for engine in engines], until=args.hours * 3600)
+    elapsed = time.perf_counter() - started
+
+    user_hours = len(recordings) * args.hours
+    calls = sum(sum(spotify.calls.values()) for spotify in services)
+    rejected = sum(engine.skip_stats.rejected for engine in engines)
+    audible = sum(engine.skip_stats.audible_total for engine in engines)
+    return {
+        "calls_per_user_hour": calls / user_hours,
+        "playback_polls_per_user_hour": sum(spotify.calls["playback"] for spotify in services) / user_hours,
+        "rejected": rejected,
+        "avg_rejected_audible_ms": audible / rejected * 1000 if rejected else 0.0,
+        "wall_seconds": elapsed,
+        "speedup": user_hours * 3600 / elapsed,
+    }
+
+
+async def main(args):
+    silence_logging(logging.CRITICAL)
+    metrics.enabled = False  # Measures the engine logic, not its instrumentation
+    if args.recordings:
+        paths = sorted(Path(args.recordings).glob("*.jsonl"))
+    else:
+        directory = Path(tempfile.mkdtemp(prefix="syncstream-recordings-"))
+        started = time.perf_counter()
+        paths = record_synthetic(directory, args.users, args.hours, args.seed)
+        print(f"Recorded {len(paths)} synthetic sessions in {time.perf_counter() - started:.1f}s ({directory})")
+    recordings = [Recording.load(path) for path in paths]
+
+    strategy_manager = StaticStrategyManager()
+    print(f"{len(recordings)} users x {args.hours}h\n")
+    print(f"{'engine':>20} {'calls/user-h':>13} {'polls/user-h':>13} {'rejected':>9} {'audible ms':>11} {'wall s':>8} {'x realtime':>11}")
+    for engine_name in args.engines:
+        result = await replay(recordings, engine_name, strategy_manager, args)
+        print(f"{engine_name:>20} {result['calls_per_user_hour']:>13.1f} {result['playback_polls_per_user_hour']:>13.1f} "
+              f"{result['rejected']:>9} {result['avg_rejected_audible_ms']:>11.0f} {result['wall_seconds']:>8.1f} "
+              f"{result['speedup']:>11.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recordings", help="Directory of recordings (*.jsonl) to replay")
+    parser.add_argument("--users", type=int, default=200, help="Synthetic sessions, without --recordings")
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,70 @@
+"""
+Rule DSL evaluation benchmark.
+
+Compares the per-track cost of a compiled rule strategy with the hand-written
+FocusGuardStrategy it is equivalent to, a richer composite rule, and the vectorized
+batch path of both.
+
+    uv run python -m benchmarks.rule_strategy --tracks 200000
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from app.models.strategy import StrategyConfig
+from app.strategies.base import StrategyAction
+from app.strategies.batch import FeatureMatrix
+from app.strategies.implementations.focus_guard import FocusGuardStrategy
+from app.strategies.strategy_factory import StrategyFactory
+from benchmarks.batch_evaluation import as_tracks, synthetic_columns
+from benchmarks.common import silence_logging
+
+RULES = {
+    "focus (rule)": {"keep_if": {"all": [
+        {"field": "instrumentalness", "op": ">=", "value": 0.75},
+        {"field": "energy", "op": "<=", "value": 0.5},
+    ]}},
+    "composite (rule)": {"keep_if": {"all": [
+        {"field": "instrumentalness", "op": ">=", "value": 0.5},
+        {"field": "tempo", "op": "between", "value": [90, 120]},
+        {"not": {"field": "explicit", "op": "==", "value": True}},
+        {"any": [{"field": "valence", "op": ">", "value": 0.4}, {"field": "energy", "op": "<", "value": 0.3}]},
+    ]}},
+}
+
+
+async def per_track_ns(strategy, tracks) -> tuple[float, list[bool]]:
+    started = time.perf_counter_ns()
+    decisions = [await strategy.evaluate(track) == StrategyAction.SKIP for track in tracks]
+    return (time.perf_counter_ns() - started) / len(tracks), decisions
+
+
+def batch_ns(strategy, matrix: FeatureMatrix) -> tuple[float, np.ndarray]:
+    started = time.perf_counter_ns()
+    mask = strategy.evaluate_batch(matrix)
+    return (time.perf_counter_ns() - started) / len(matrix), mask
+
+
+async def main(args):
+    silence_logging()
+    tracks = as_tracks(synthetic_columns(args.tracks, args.seed), args.tracks)
+    matrix = FeatureMatrix.from_tracks(tracks)
+    strategies = {"focus (hand-written)": FocusGuardStrategy(instrumental_threshold=0.75, energy_threshold=0.5)}
+    for name, parameters in RULES.items():
+        strategies[name] = StrategyFactory.make(StrategyConfig(id=name, name=name, description="", parameters=parameters))
+
+    print(f"{'strategy':<22} {'per-track':>12} {'batch':>12} {'skipped':>9}")
+    for name, strategy in strategies.items():
+        track_cost, decisions = await per_track_ns(strategy, tracks)
+        vector_cost, mask = batch_ns(strategy, matrix)
+        assert decisions == mask.tolist(), f"{name}: batch and per-track results differ"
+        print(f"{name:<22} {track_cost:>9.0f} ns {vector_cost:>9.1f} ns {mask.mean():>8.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracks", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,73 @@
+"""
+Session scheduler benchmark.
+
+Runs N user sessions against MockSpotifyService in a single event loop and reports
+ticks/second, scheduling jitter and memory per session as the session count grows.
+
+    uv run python -m benchmarks.session_scheduler --sessions 100 1000 10000 --duration 10
+"""
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+
+from app.services.engine import SyncStreamEngine
+from app.services.session_scheduler import SessionScheduler
+from app.services.spotify.mock import MockSpotifyService
+from benchmarks.common import StaticStrategyManager, silence_logging
+
+
+async def run_scenario(sessions: int, duration: float, poll_interval: float, max_concurrent_ticks: int) -> dict:
+    strategy_manager = StaticStrategyManager()
+    spotify = MockSpotifyService()  # Stateless, so it is shared the way the HTTP client would be
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    scheduler = SessionScheduler(max_concurrent_ticks=max_concurrent_ticks)
+    for i in range(sessions):
+        engine = SyncStreamEngine(spotify=spotify, strategy_manager=strategy_manager, poll_interval=poll_interval)
+        # Spread the first ticks over one interval, like sessions joining over time
+        scheduler.add_session(f"user_{i}", engine, delay=poll_interval * i / sessions)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    task = asyncio.create_task(scheduler.run())
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    scheduler.stop()
+    await task
+    elapsed = time.perf_counter() - started
+
+    stats = scheduler.stats.as_dict()
+    return {
+        "sessions": sessions,
+        "ticks_per_sec": stats["ticks"] / elapsed,
+        "expected_ticks_per_sec": sessions / poll_interval,
+        "lateness_avg_ms": stats["lateness_avg_ms"],
+        "lateness_p99_ms": stats["lateness_p99_ms"],
+        "lateness_max_ms": stats["lateness_max_ms"],
+        "bytes_per_session": (allocated - baseline) / sessions,
+        "errors": stats["errors"],
+    }
+
+
+async def main(args):
+    silence_logging()
+    header = f"{'sessions':>9} {'ticks/s':>10} {'target/s':>10} {'avg late ms':>12} {'p99 late ms':>12} {'max late ms':>12} {'B/session':>10}"
+    print(header)
+    for sessions in args.sessions:
+        result = await run_scenario(sessions, args.duration, args.poll_interval, args.max_concurrent_ticks)
+        print(f"{result['sessions']:>9} {result['ticks_per_sec']:>10.1f} {result['expected_ticks_per_sec']:>10.1f} "
+              f"{result['lateness_avg_ms']:>12.2f} {result['lateness_p99_ms']:>12.2f} {result['lateness_max_ms']:>12.2f} "
+              f"{result['bytes_per_session']:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run each scenario")
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument("--max-concurrent-ticks", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,190 @@
+"""
+End-to-end Spotify client load test.
+
+Starts the fake Spotify API (app.services.spotify.fake_api) in a subprocess, or uses a
+running one with --url, and drives many concurrent engine sessions through
+ProdSpotifyService against it over real HTTP: token refresh, 401 retry, 429 back-off
+and the client-side rate limiter included. Reports p50/p99 latency and errors per
+call as the engine sees it, and what the server answered.
+
+    uv run python -m benchmarks.spotify_load --sessions 500 --duration 30
+    uv run python -m benchmarks.spotify_load --sessions 2000 --server-args="--rate-limit 300 --error-rate 500=0.01"
+"""
+import argparse
+import asyncio
+import logging
+import random
+import shlex
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+from app.services.engine import SyncStreamEngine
+from app.services.spotify.base import SpotifyService
+from app.services.spotify.batching import BatchLoader
+from app.services.spotify.fake_api import refresh_token_for
+from app.services.spotify.http import build_http_client
+from app.services.spotify.prod import ProdSpotifyService
+from app.services.spotify.rate_limit import LocalTokenBucket, SpotifyRateLimiter
+from app.services.strategy_resolver import ActiveStrategyResolver
+from benchmarks.common import StaticStrategyManager, silence_logging
+
+
+class TimedSpotify:
+    """Times every call end to end (retries and token refreshes included) and counts failures"""
+
+    def __init__(self, spotify: SpotifyService, latencies: dict[str, list[float]], errors: Counter):
+        self.spotify = spotify
+        self.latencies = latencies
+        self.errors = errors
+
+    async def _timed(self, name: str, call):
+        started = time.perf_counter()
+        try:
+            return await call
+        except httpx.HTTPStatusError as e:
+            self.errors[f"{name} {e.response.status_code}"] += 1
+            raise
+        except httpx.HTTPError as e:
+            self.errors[f"{name} {type(e).__name__}"] += 1
+            raise
+        finally:
+            self.latencies[name].append(time.perf_counter() - started)
+
+    async def get_current_playback(self):
+        return await self._timed("playback", self.spotify.get_current_playback())
+
+    async def get_queue(self):
+        return await self._timed("queue", self.spotify.get_queue())
+
+    async def get_audio_features(self, track_id: str):
+        return await self._timed("audio_features", self.spotify.get_audio_features(track_id))
+
+    async def get_audio_features_batch(self, track_ids: list[str]):
+        return await self._timed("audio_features_batch", self.spotify.get_audio_features_batch(track_ids))
+
+    async def skip_next(self):
+        return await self._timed("skip", self.spotify.skip_next())
+
+
+def start_server(args) -> subprocess.Popen:
+    command = [sys.executable, "-m", "app.services.spotify.fake_api", "--port", str(args.port),
+               "--listeners", str(args.sessions), *shlex.split(args.server_args)]
+    return subprocess.Popen(command)
+
+
+async def wait_until_up(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                (await client.get(f"{url}/stats")).raise_for_status()
+                return
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+
+def percentile(values: list[float], p: float) -> float:
+    return sorted(values)[min(int(len(values) * p / 100), len(values) - 1)] * 1000 if values else 0.0
+
+
+async def run(url: str, args) -> dict:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: Counter[str] = Counter()
+    http_client = build_http_client(max_connections=args.max_connections,
+                                    max_keepalive_connections=args.max_connections)
+    rate_limiter = SpotifyRateLimiter(LocalTokenBucket(args.client_rate, args.client_burst)) if args.client_rate else None
+    strategy_manager = StaticStrategyManager()
+    services, engines = [], []
+    features_loader = None
+    for session in range(args.sessions):
+        service = ProdSpotifyService("load-test", "secret", refresh_token_for(session), user_id=f"load-{session}",
+                                     http_client=http_client, api_base_url=f"{url}/v1", auth_url=f"{url}/api/token",
+                                     rate_limiter=rate_limiter, features_loader=features_loader)
+        if features_loader is None and args.batch_window_ms:
+            # Features are not user specific: one loader batches the lookups of every session
+            features_loader = service.features_loader = BatchLoader(
+                service.get_audio_features_batch, max_batch_size=ProdSpotifyService.FEATURES_BATCH_LIMIT,
+                max_wait=args.batch_window_ms / 1000)
+        services.append(service)
+        engines.append(SyncStreamEngine(spotify=TimedSpotify(service, latencies, errors),
+                                        strategy_manager=strategy_manager,
+                                        strategy_resolver=ActiveStrategyResolver(strategy_manager),
+                                        poll_interval=args.poll_interval))
+
+    async def session(engine: SyncStreamEngine):
+        # Sessions start spread over one poll interval, like users connecting over time
+        await asyncio.sleep(random.uniform(0, args.poll_interval))
+        await engine.run()
+
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(session(engine)) for engine in engines]
+    await asyncio.sleep(args.duration)
+    for engine in engines:
+        engine.stop()
+    for task in tasks:
+        task.cancel()  # Sessions still waiting for their first tick
+    await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    await http_client.aclose()
+
+    async with httpx.AsyncClient() as client:
+        server_stats = (await client.get(f"{url}/stats")).json()
+    return {
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "errors": errors,
+        "token_refreshes": sum(service.tokens.refresh_count for service in services),
+        "limiter": rate_limiter.stats.as_dict() if rate_limiter else None,
+        "server": server_stats,
+    }
+
+
+async def main(args):
+    silence_logging(logging.CRITICAL)  # Engine errors are counted, not logged
+    server = None if args.url else start_server(args)
+    url = args.url or f"http://127.0.0.1:{args.port}"
+    try:
+        await wait_until_up(url)
+        result = await run(url, args)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    elapsed = result["elapsed"]
+    calls = sum(len(values) for values in result["latencies"].values())
+    print(f"{args.sessions} sessions for {elapsed:.1f}s: {calls / elapsed:,.0f} calls/s, "
+          f"{result['token_refreshes']} token refreshes\n")
+    print(f"{'call':>22} {'count':>8} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}")
+    for name, values in sorted(result["latencies"].items()):
+        failed = sum(count for key, count in result["errors"].items() if key.split(" ")[0] == name)
+        print(f"{name:>22} {len(values):>8} {percentile(values, 50):>9.1f} {percentile(values, 99):>9.1f} "
+              f"{max(values) * 1000:>9.1f} {failed:>7}")
+    if result["errors"]:
+        print("\nerrors: " + ", ".join(f"{key}: {count}" for key, count in result["errors"].most_common()))
+    if result["limiter"]:
+        print(f"limiter: {result['limiter']}")
+    print("\nserver:")
+    for key, count in sorted(result["server"].items()):
+        print(f"  {key:<32} {count:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Fake API already running at this URL; started on --port otherwise")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--server-args", default="", help="Extra fake_api options, e.g. '--rate-limit 300'")
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--poll-interval", type=int, default=5)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--client-rate", type=float, default=0.0, help="Client-side limiter budget, 0 disables it")
+    parser.add_argument("--client-burst", type=int, default=20)
+    parser.add_argument("--batch-window-ms", type=float, default=5.0, help="Audio features batching, 0 disables it")
+    asyncio.run(main(parser.parse_args()))
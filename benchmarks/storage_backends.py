@@ -0,0 +1,105 @@
+"""
+Storage backend per-tick benchmark.
+
+Runs engine ticks back to back against MockSpotifyService with the strategy catalog in
+each StorageBackend: local Redis, Redis behind a TCP proxy adding `--delay` ms each way
+(a Redis on another host), and the in-process backend. Each backend runs twice: with
+the resolver checking the catalog version on every tick (what a tick costs while the
+change subscription is down), and with the subscription up. Reports the time per tick
+and what the storage adds to it compared with the in-memory backend.
+
+Uses (and flushes) the database given by `--redis-url`.
+
+    uv run python -m benchmarks.storage_backends --ticks 2000 --delay 0.5
+"""
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+import redis.asyncio as redis
+
+from app.core.redis import redis_manager
+from app.services.engine import SyncStreamEngine
+from app.services.spotify.mock import MockSpotifyService
+from app.services.storage.base import StorageBackend
+from app.services.storage.memory import InMemoryStorage
+from app.services.storage.redis import RedisStorage
+from app.services.strategy_manager import StrategyManager
+from app.services.strategy_resolver import ActiveStrategyResolver
+from benchmarks.common import StaticStrategyManager, silence_logging
+from benchmarks.strategy_round_trips import DelayProxy
+
+
+async def run_ticks(storage: StorageBackend, ticks: int, subscribed: bool) -> float:
+    """Returns the mean time per tick in microseconds, best of three runs"""
+    strategy_manager = StrategyManager(storage=storage)
+    await strategy_manager.upsert_strategies([StaticStrategyManager().config])
+    await strategy_manager.set_active_strategy("focus")
+    resolver = ActiveStrategyResolver(strategy_manager, reconnect_interval=0.05)
+    listener = None
+    if subscribed:
+        listener = asyncio.create_task(resolver.run())
+        while not resolver.subscribed:
+            await asyncio.sleep(0.01)
+    engine = SyncStreamEngine(spotify=MockSpotifyService(), strategy_manager=strategy_manager,
+                              strategy_resolver=resolver)
+    await engine.apply_strategy()  # Warms the resolver and loads scripts
+
+    elapsed = float("inf")  # A stray pause should not decide the comparison
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(ticks):
+            await engine.apply_strategy()
+        elapsed = min(elapsed, time.perf_counter() - started)
+    if listener:
+        resolver.stop()
+        await listener
+    return elapsed / ticks * 1e6
+
+
+async def main(args):
+    url = urlparse(args.redis_url)
+    host, port, db = url.hostname or "localhost", url.port or 6379, int(url.path.lstrip("/") or 0)
+    proxy = DelayProxy(host, port, args.delay / 1000)
+    proxy_port = await proxy.start()
+    clients = {"redis": (redis.Redis(host=host, port=port, db=db, decode_responses=True),
+                         redis.Redis(host=host, port=port, db=db)),
+               f"redis +{args.delay} ms": (redis.Redis(host="127.0.0.1", port=proxy_port, db=db, decode_responses=True),
+                                           redis.Redis(host="127.0.0.1", port=proxy_port, db=db))}
+
+    results = {}
+    for subscribed in (False, True):
+        for name, (client, binary_client) in clients.items():
+            await client.flushdb()
+            with patch.object(redis_manager, "get_client", return_value=client), \
+                    patch.object(redis_manager, "get_binary_client", return_value=binary_client):
+                results[name, subscribed] = await run_ticks(RedisStorage(), args.ticks, subscribed)
+        results["memory", subscribed] = await run_ticks(InMemoryStorage(), args.ticks, subscribed)
+
+    print(f"{args.ticks} ticks per run, MockSpotifyService without latency\n")
+    print(f"{'backend':<20}{'resolver':<14}{'us/tick':>10}{'storage us/tick':>17}")
+    for subscribed in (False, True):
+        baseline = results["memory", subscribed]
+        for name in (*clients, "memory"):
+            per_tick = results[name, subscribed]
+            print(f"{name:<20}{'subscribed' if subscribed else 'version check':<14}"
+                  f"{per_tick:>10.1f}{per_tick - baseline:>17.1f}")
+
+    for client, binary_client in clients.values():
+        await client.flushdb()
+        await client.aclose()
+        await binary_client.aclose()
+    proxy.server.close()
+    await proxy.server.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--delay", type=float, default=0.5, help="one-way network delay in ms of the proxied Redis")
+    parser.add_argument("--ticks", type=int, default=2000)
+    args = parser.parse_args()
+    silence_logging()
+    asyncio.run(main(args))
@@ -0,0 +1,148 @@
+"""
+Active-strategy round-trip benchmark.
+
+Puts a TCP proxy in front of a local Redis that delays every chunk by `--delay` ms in each
+direction, standing in for the network between the app and a remote Redis. Compares the
+per-call latency of resolving and setting the active strategy, and of seeding a catalog,
+with the previous command sequences (GET then HGET; HGET, then MULTI SET/INCR, then PUBLISH;
+one write per strategy) against the server-side scripts StrategyManager now runs.
+
+Uses (and flushes) the database given by `--redis-url`.
+
+    uv run python -m benchmarks.strategy_round_trips --delay 2 --calls 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+import redis.asyncio as redis
+
+from app.core.redis import redis_manager
+from app.models.strategy import StrategyConfig
+from app.services.codec import StrategyConfigCodec
+from app.services.storage.redis import RedisStorage
+from app.services.strategy_manager import StrategyManager
+from benchmarks.common import silence_logging
+
+
+class DelayProxy:
+    """Forwards TCP traffic to `target`, delivering each chunk `delay` seconds after it was read"""
+
+    def __init__(self, target_host: str, target_port: int, delay: float):
+        self.target_host = target_host
+        self.target_port = target_port
+        self.delay = delay
+
+    async def _pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Chunks keep their order and are delayed independently, like packets on a link with fixed latency
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def deliver():
+            while (item := await queue.get()) is not None:
+                due, data = item
+                await asyncio.sleep(due - time.monotonic())
+                writer.write(data)
+                await writer.drain()
+            writer.close()
+
+        delivery = asyncio.create_task(deliver())
+        while data := await reader.read(65536):
+            queue.put_nowait((time.monotonic() + self.delay, data))
+        queue.put_nowait(None)
+        await delivery
+
+    async def _handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter):
+        server_reader, server_writer = await asyncio.open_connection(self.target_host, self.target_port)
+        await asyncio.gather(self._pipe(client_reader, server_writer), self._pipe(server_reader, client_writer),
+                             return_exceptions=True)
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+
+async def legacy_get_active_strategy(client: redis.Redis) -> StrategyConfig:
+    active_id = await client.get(RedisStorage.ACTIVE_STRATEGY_KEY)
+    strategy = await client.hget(RedisStorage.STRATEGIES_CATALOG_KEY, active_id)
+    return StrategyConfig.model_validate_json(strategy)
+
+
+async def legacy_set_active_strategy(client: redis.Redis, strategy_id: str):
+    strategy = await client.hget(RedisStorage.STRATEGIES_CATALOG_KEY, strategy_id)
+    if not StrategyConfig.model_validate_json(strategy).is_active:
+        raise ValueError(f"Strategy id: '{strategy_id}' is dsabled")
+    async with client.pipeline(transaction=True) as pipe:
+        _, version = await pipe.set(RedisStorage.ACTIVE_STRATEGY_KEY, strategy_id).incr(
+            RedisStorage.VERSION_KEY).execute()
+    await client.publish(RedisStorage.CHANGES_CHANNEL, version)
+
+
+async def legacy_seed(client: redis.Redis, strategies: list[StrategyConfig]):
+    for strategy in strategies:
+        async with client.pipeline(transaction=True) as pipe:
+            _, version = await pipe.hset(RedisStorage.STRATEGIES_CATALOG_KEY, strategy.id,
+                                         strategy.model_dump_json()).incr(RedisStorage.VERSION_KEY).execute()
+        await client.publish(RedisStorage.CHANGES_CHANNEL, version)
+
+
+async def measure(call, calls: int) -> dict:
+    await call()  # Warms the connection and loads scripts
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {"p50_ms": statistics.median(latencies) * 1000, "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000}
+
+
+async def main(args):
+    url = urlparse(args.redis_url)
+    proxy = DelayProxy(url.hostname or "localhost", url.port or 6379, args.delay / 1000)
+    port = await proxy.start()
+    db = int(url.path.lstrip("/") or 0)
+    client = redis.Redis(host="127.0.0.1", port=port, db=db, decode_responses=True)
+    binary_client = redis.Redis(host="127.0.0.1", port=port, db=db)
+    await client.flushdb()
+    strategies = [StrategyConfig(id=f"s{i}", name=f"S{i}", description="Benchmark strategy",
+                                 parameters={"energy": i / args.strategies}) for i in range(args.strategies)]
+    # JSON configs, as the previous command sequences parse them
+    manager = StrategyManager(StrategyConfigCodec(binary=False))
+
+    with patch.object(redis_manager, "get_client", return_value=client), \
+            patch.object(redis_manager, "get_binary_client", return_value=binary_client):
+        await manager.upsert_strategies(strategies)
+        await manager.set_active_strategy("s0")
+        scenarios = {
+            "get_active (GET + HGET)": lambda: legacy_get_active_strategy(client),
+            "get_active (script)": manager.get_active_strategy,
+            "set_active (HGET + MULTI + PUBLISH)": lambda: legacy_set_active_strategy(client, "s0"),
+            "set_active (script)": lambda: manager.set_active_strategy("s0"),
+            f"seed {args.strategies} (one write each)": lambda: legacy_seed(client, strategies),
+            f"seed {args.strategies} (bulk script)": lambda: manager.upsert_strategies(strategies),
+        }
+        print(f"{'scenario':<40}{'p50 ms':>10}{'p99 ms':>10}   (one-way delay {args.delay} ms)")
+        for name, call in scenarios.items():
+            calls = args.calls if "seed" not in name else max(args.calls // 10, 5)
+            result = await measure(call, calls)
+            print(f"{name:<40}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}")
+
+    await client.flushdb()
+    await client.aclose()
+    await binary_client.aclose()
+    proxy.server.close()
+    await proxy.server.wait_closed()  # Lets the proxied connections drain
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--delay", type=float, default=2.0, help="one-way network delay in ms")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--strategies", type=int, default=20)
+    args = parser.parse_args()
+    silence_logging()
+    asyncio.run(main(args))
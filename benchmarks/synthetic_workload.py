@@ -0,0 +1,105 @@
+"""
+Synthetic workload benchmark.
+
+Builds a seeded catalog and a pool of virtual listeners, reports the memory they take
+and how fast the pool answers playback polls, then runs engines for a slice of the
+listeners on a virtual clock against MockSpotifyService with injected latency,
+429s and 401s.
+
+    uv run python -m benchmarks.synthetic_workload --listeners 100000 --engine-listeners 5000 --minutes 60
+    uv run python -m benchmarks.synthetic_workload --rate-429 0.05 --rate-401 0.01 --latency-ms 150
+"""
+import argparse
+import asyncio
+import logging
+import time
+import tracemalloc
+
+from app.core.clock import VirtualClock
+from app.core.metrics import metrics
+from app.services.engine import SyncStreamEngine
+from app.services.polling import AdaptivePollScheduler
+from app.services.spotify.mock import MockSpotifyService
+from app.services.spotify.workload import FaultInjector, ListenerPool, SyntheticCatalog
+from app.services.strategy_resolver import ActiveStrategyResolver
+from benchmarks.common import StaticStrategyManager, silence_logging
+
+
+def build(args, clock: VirtualClock) -> ListenerPool:
+    tracemalloc.start()
+    started = time.perf_counter()
+    catalog = SyntheticCatalog(size=args.catalog, seed=args.seed)
+    catalog_bytes = tracemalloc.get_traced_memory()[0]
+    pool = ListenerPool(catalog, listeners=args.listeners, seed=args.seed, pause_rate=args.pause_rate, clock=clock)
+    elapsed = time.perf_counter() - started
+    pool_bytes = tracemalloc.get_traced_memory()[0] - catalog_bytes
+    tracemalloc.stop()
+    print(f"catalog: {catalog.size} tracks, {catalog_bytes / 2 ** 20:.1f} MiB")
+    print(f"pool:    {pool.listeners} listeners, {pool_bytes / 2 ** 20:.1f} MiB "
+          f"({pool_bytes / pool.listeners:.0f} B/listener), built in {elapsed:.2f}s")
+    return pool
+
+
+def poll_sweep(pool: ListenerPool, clock: VirtualClock, rounds: int, interval: float):
+    """Polls every listener once per round, `interval` virtual seconds apart"""
+    started = time.perf_counter()
+    idle = 0
+    for _ in range(rounds):
+        clock.now += interval
+        for listener in range(pool.listeners):
+            idle += pool.playback(listener) is None
+    elapsed = time.perf_counter() - started
+    polls = rounds * pool.listeners
+    print(f"polls:   {polls / elapsed:,.0f}/s over {rounds} rounds ({idle / polls:.1%} with nothing playing)")
+
+
+async def run_engines(pool: ListenerPool, clock: VirtualClock, args):
+    strategy_manager = StaticStrategyManager()
+    faults = FaultInjector(rate_429=args.rate_429, rate_401=args.rate_401, seed=args.seed)
+    services, engines = [], []
+    for listener in range(min(args.engine_listeners, pool.listeners)):
+        spotify = MockSpotifyService(pool.listener(listener), latency=args.latency_ms / 1000, faults=faults,
+                                     sleep=clock.sleep)
+        services.append(spotify)
+        engines.append(SyncStreamEngine(spotify=spotify, strategy_manager=strategy_manager,
+                                        strategy_resolver=ActiveStrategyResolver(strategy_manager),
+                                        poll_interval=args.poll_interval,
+                                        poll_scheduler=AdaptivePollScheduler(args.poll_interval),
+                                        clock=clock, sleep=clock.sleep))
+
+    started = time.perf_counter()
+    await clock.run([engine.run() for engine in engines], until=clock() + args.minutes * 60)
+    elapsed = time.perf_counter() - started
+
+    calls = sum(sum(spotify.calls.values()) for spotify in services)
+    ticks = sum(spotify.calls["/me/player"] for spotify in services)
+    rejected = sum(engine.skip_stats.rejected for engine in engines)
+    print(f"engines: {len(engines)} listeners x {args.minutes:g} min in {elapsed:.1f}s "
+          f"({len(engines) * args.minutes * 60 / elapsed:,.0f}x realtime)")
+    print(f"         {ticks / elapsed:,.0f} ticks/s, {calls / elapsed:,.0f} calls/s, {rejected} skips, "
+          f"injected 429: {faults.injected[429]}, 401: {faults.injected[401]}")
+
+
+async def main(args):
+    silence_logging(logging.CRITICAL)
+    metrics.enabled = False
+    clock = VirtualClock()
+    pool = build(args, clock)
+    poll_sweep(pool, clock, args.rounds, args.poll_interval)
+    await run_engines(pool, clock, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--listeners", type=int, default=100_000)
+    parser.add_argument("--catalog", type=int, default=50_000, help="Tracks in the catalog")
+    parser.add_argument("--pause-rate", type=float, default=0.05, help="Share of plays with a pause")
+    parser.add_argument("--rounds", type=int, default=3, help="Poll sweeps over every listener")
+    parser.add_argument("--engine-listeners", type=int, default=2000, help="Listeners driven by an engine")
+    parser.add_argument("--minutes", type=float, default=60.0, help="Virtual time the engines run")
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Virtual latency per Spotify call")
+    parser.add_argument("--rate-429", type=float, default=0.01)
+    parser.add_argument("--rate-401", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
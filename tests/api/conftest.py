@@ -38,6 +38,7 @@ def mock_engine(mock_strategy_manager):
     # 3. Attributes accessed by the router
     mock_engine.last_evaluation = None
     mock_engine.current_track = None
+    mock_engine.polls_avoided = 0
 
     # 4. Methods
     mock_engine.run = AsyncMock(return_value=None)
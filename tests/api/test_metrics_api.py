@@ -0,0 +1,19 @@
+import pytest
+
+from app.core.metrics import STRATEGY_DECISIONS_TOTAL
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposition(client):
+    """
+    Scenario: GET /metrics
+    Expected: Returns the registered metrics in the Prometheus text format.
+    """
+    STRATEGY_DECISIONS_TOTAL.labels("focus", "keep").inc()
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE syncstream_engine_tick_seconds histogram" in response.text
+    assert 'syncstream_strategy_decisions_total{strategy="focus",action="keep"}' in response.text
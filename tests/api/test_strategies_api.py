@@ -93,3 +93,51 @@ async def test_update_strategy(client, mock_strategy_manager):
     assert updated_strategy["id"] == "s1"
     assert updated_strategy["name"] == "Updated Strategy"
 
+
+@pytest.mark.asyncio
+async def test_update_strategy_rejects_invalid_rule(client, mock_strategy_manager):
+    """
+    Scenario: PUT /api/v1/strategies/{id} with a malformed rule
+    Expected: Returns 422 and nothing is stored.
+    """
+    payload = create_strategy("s1").model_dump()
+    payload["parameters"] = {"skip_if": {"field": "lyrics", "op": "==", "value": 1}}
+
+    response = await client.put("/api/v1/strategies/s1", json=payload)
+    assert response.status_code == 422
+    mock_strategy_manager.upsert_strategy.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_update_strategy_rejects_chain_with_missing_members(client, mock_strategy_manager):
+    """
+    Scenario: PUT /api/v1/strategies/{id} with a chain whose members do not exist
+    Expected: Returns 422 instead of storing a chain the engine cannot build.
+    """
+    mock_strategy_manager.upsert_strategy.side_effect = ValueError("Chain 'stack' members: ['ghost'] do not exist")
+    payload = create_strategy("stack").model_dump()
+    payload["parameters"] = {"chain": ["ghost"]}
+
+    response = await client.put("/api/v1/strategies/stack", json=payload)
+    assert response.status_code == 422
+    assert "do not exist" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_set_active_strategy_rejects_invalid_id(client, mock_strategy_manager):
+    """
+    Scenario: POST /api/v1/strategies/active with a strategy that cannot be activated
+    Expected: Returns 400 with the reason.
+    """
+    mock_strategy_manager.set_active_strategy.side_effect = ValueError("Strategy id: 'ghost' does not exist")
+
+    response = await client.post("/api/v1/strategies/active", json={"id": "ghost"})
+    assert response.status_code == 400
+    assert "does not exist" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_update_strategy_rejects_mismatched_id(client, mock_strategy_manager):
+    """
+    Scenario: PUT /api/v1/strategies/{id} with a different id in the payload
+    Expected: Returns 400, not a server error.
+    """
+    response = await client.put("/api/v1/strategies/other", json=create_strategy("s1").model_dump())
+    assert response.status_code == 400
@@ -5,6 +5,8 @@ import pytest
 import redis.asyncio as redis
 
 from app.core.redis import redis_manager
+from app.services.storage.memory import InMemoryStorage
+from app.services.storage.redis import RedisStorage
 from app.services.strategy_manager import StrategyManager
 
 
@@ -22,14 +24,34 @@ async def redis_client():
     yield client
     await client.aclose()  # Clean up after tests
 
+@pytest.fixture
+async def binary_redis_client(redis_client):
+    """
+    Same database as redis_client, without decoding replies.
+    """
+    host = os.getenv("REDIS_HOST", "localhost")
+    port = int(os.getenv("REDIS_PORT", "6379"))
+
+    client = redis.Redis(host=host, port=port, db=1)
+    yield client
+    await client.aclose()
+
 @pytest.fixture(autouse=True)
-def patch_global_redis_manager(redis_client):
+def patch_global_redis_manager(redis_client, binary_redis_client):
     """
     Patch the global redis_manager to use the test redis_client.
     """
-    with patch.object(redis_manager, 'get_client', return_value=redis_client):
+    with patch.object(redis_manager, 'get_client', return_value=redis_client), \
+            patch.object(redis_manager, 'get_binary_client', return_value=binary_redis_client):
         yield
 
+@pytest.fixture(params=["redis", "memory"])
+def storage(request):
+    """
+    Each StorageBackend implementation; the Redis one uses the patched redis_manager.
+    """
+    return RedisStorage() if request.param == "redis" else InMemoryStorage()
+
 @pytest.fixture
 def strategy_manager():
     """
@@ -0,0 +1,9 @@
+import asyncio
+
+
+async def wait_until(condition, timeout: float = 2.0):
+    """Polls `condition` until it holds, failing the test after `timeout` seconds"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
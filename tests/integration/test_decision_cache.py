@@ -0,0 +1,27 @@
+import pytest
+
+from app.models.strategy import StrategyConfig
+from app.services.decision_cache import DecisionCache
+from app.strategies.base import StrategyAction
+
+FOCUS = StrategyConfig(id="focus", name="Focus Guard", description="", parameters={"energy": 0.5})
+
+
+@pytest.mark.asyncio
+class TestDecisionCacheSharedTier:
+
+    async def test_verdicts_are_shared_between_workers(self, storage):
+        await DecisionCache(ttl=60, storage=storage).put("track_1", FOCUS.fingerprint(), StrategyAction.SKIP)
+        second_worker = DecisionCache(ttl=60, storage=storage)
+
+        assert await second_worker.get("track_1", FOCUS.fingerprint(), FOCUS.id) == StrategyAction.SKIP
+        assert await second_worker.get("track_1", FOCUS.fingerprint(), FOCUS.id) == StrategyAction.SKIP
+        assert second_worker.stats.of(FOCUS.id).as_dict() == {"local_hits": 1, "redis_hits": 1, "misses": 0, "hit_rate": 1.0}
+        _, ttl = await storage.get_with_ttl(f"{DecisionCache.KEY_PREFIX}{FOCUS.fingerprint()}:track_1")
+        assert 0 < ttl <= 60
+
+    async def test_config_change_invalidates_verdicts(self, storage):
+        await DecisionCache(storage=storage).put("track_1", FOCUS.fingerprint(), StrategyAction.SKIP)
+        tuned = FOCUS.model_copy(update={"parameters": {"energy": 0.9}})
+
+        assert await DecisionCache(storage=storage).get("track_1", tuned.fingerprint(), tuned.id) is None
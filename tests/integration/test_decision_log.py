@@ -0,0 +1,154 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.core.redis import redis_manager
+from app.models.strategy import StrategyConfig
+from app.services.decision_cache import DecisionCache
+from app.services.decision_log import STREAM_KEY, DecisionLog, DecisionLogReader
+from app.services.engine import SyncStreamEngine
+from app.services.spotify.mock import MockSpotifyService, SimulatedPlayer, mock_features
+from app.strategies.base import StrategyAction
+from app.strategies.strategy_factory import StrategyFactory
+
+FOCUS = StrategyConfig(id="focus", name="Focus Guard", description="", parameters={"instrumentalness": 0.75, "energy": 0.5})
+
+
+class StaticResolver:
+    def __init__(self):
+        self.strategy = StrategyFactory.get(FOCUS)
+
+    async def resolve(self):
+        return FOCUS, self.strategy
+
+
+def append(log: DecisionLog, count: int, start: int = 0):
+    strategy = StrategyFactory.get(FOCUS)
+    for i in range(start, start + count):
+        log.append(f"track_{i}", FOCUS, strategy, None, StrategyAction.KEEP, "live", mock_features(f"track_{i}"), 0.002)
+
+
+@pytest.mark.asyncio
+class TestDecisionLog:
+
+    async def test_entries_round_trip_through_a_consumer_group(self):
+        log = DecisionLog()
+        reader = DecisionLogReader("analytics", "worker_1")
+        await reader.create_group()
+        append(log, 3)
+
+        await log.flush()
+
+        entries = await reader.read(count=10)
+        assert [entry.track_id for entry in entries] == ["track_0", "track_1", "track_2"]
+        entry = entries[0]
+        assert (entry.strategy_id, entry.fingerprint, entry.action, entry.source) == (
+            "focus", FOCUS.fingerprint(), StrategyAction.KEEP, "live")
+        assert entry.features == mock_features("track_0")
+        assert entry.latency == 0.002
+        assert abs(entry.timestamp_ms - time.time() * 1000) < 5000
+        assert log.stats.as_dict() == {"appended": 3, "written": 3, "dropped": 0, "flushes": 1, "write_errors": 0}
+
+    async def test_flushes_on_batch_size_and_on_interval(self, redis_client):
+        log = DecisionLog(batch_size=10, flush_interval=0.2)
+        writer = asyncio.create_task(log.run())
+
+        append(log, 5)
+        await asyncio.sleep(0.05)
+        assert await redis_client.xlen(STREAM_KEY) == 0
+        await asyncio.sleep(0.2)
+        assert await redis_client.xlen(STREAM_KEY) == 5  # After the interval
+
+        append(log, 12, start=5)
+        await asyncio.sleep(0.05)
+        assert await redis_client.xlen(STREAM_KEY) == 17  # A full batch, without waiting
+
+        append(log, 3, start=17)
+        log.stop()
+        await writer
+        assert await redis_client.xlen(STREAM_KEY) == 20
+
+    async def test_stream_length_is_capped(self, redis_client):
+        log = DecisionLog(max_length=100, batch_size=50)
+        append(log, 1000)
+
+        await log.flush()
+
+        # MAXLEN ~ trims whole stream nodes, so the length only stays close to the cap
+        assert 100 <= await redis_client.xlen(STREAM_KEY) < 300
+
+    async def test_failed_writes_are_retried_and_a_full_buffer_drops(self, binary_redis_client):
+        log = DecisionLog(batch_size=2, buffer_size=4)
+        append(log, 3)
+        with patch.object(redis_manager, "get_binary_client", side_effect=ConnectionError("Redis is down")):
+            assert not await log.flush()
+        append(log, 2, start=3)
+
+        assert await log.flush()
+
+        entries = await binary_redis_client.xrange(STREAM_KEY)
+        assert [fields[b"track"] for _, fields in entries] == [b"track_0", b"track_1", b"track_2", b"track_3"]
+        assert (log.stats.write_errors, log.stats.dropped, log.stats.written) == (1, 1, 4)
+
+    async def test_groups_read_independently_and_reclaim_unacknowledged_entries(self):
+        log = DecisionLog()
+        analytics, crashed = DecisionLogReader("analytics", "a"), DecisionLogReader("audit", "crashed")
+        await analytics.create_group()
+        await crashed.create_group()
+        await analytics.create_group()  # Already exists
+        append(log, 4)
+        await log.flush()
+
+        read = await analytics.read(count=10)
+        await analytics.ack(read)
+        assert len(read) == 4 and await analytics.read(count=10, block=0.01) == []
+        assert len(await crashed.read(count=2)) == 2  # Never acknowledged
+
+        takeover = DecisionLogReader("audit", "b")
+        assert await takeover.claim_stale(min_idle=10) == []
+        await asyncio.sleep(0.02)
+        assert [entry.track_id for entry in await takeover.claim_stale(min_idle=0.01)] == ["track_0", "track_1"]
+        assert [entry.track_id for entry in await takeover.read(count=10)] == ["track_2", "track_3"]
+
+    async def test_engine_logs_every_decision(self):
+        log = DecisionLog()
+        reader = DecisionLogReader("analytics", "a")
+        await reader.create_group()
+        engine = SyncStreamEngine(spotify=MockSpotifyService(SimulatedPlayer(seed=1)), strategy_manager=AsyncMock(),
+                                  strategy_resolver=StaticResolver(), decision_cache=DecisionCache(use_redis=False),
+                                  decision_log=log)
+
+        await engine.apply_strategy()
+        if engine.last_action == StrategyAction.SKIP:
+            await engine.apply_strategy()
+        track_id = engine.current_playback.item.id
+        await engine.apply_strategy()  # Same track, verdict from the decision cache
+        await log.flush()
+
+        *_, live, cached = await reader.read(count=10)
+        assert (live.track_id, live.source, live.action) == (track_id, "live", StrategyAction.KEEP)
+        assert (cached.track_id, cached.source, cached.fingerprint) == (track_id, "cache", FOCUS.fingerprint())
+        assert live.features is not None and live.latency > 0
+
+    async def test_sustains_the_target_event_rate(self, redis_client):
+        # 10k sessions polled every 5 seconds
+        rate, duration = 2000, 1.0
+        log = DecisionLog(batch_size=256, flush_interval=0.05, buffer_size=1000)
+        writer = asyncio.create_task(log.run())
+
+        started = time.perf_counter()
+        sent = 0
+        while (elapsed := time.perf_counter() - started) < duration:
+            due = int(elapsed * rate)
+            append(log, due - sent, start=sent)
+            sent = due
+            await asyncio.sleep(0.005)
+        log.stop()
+        await writer
+
+        assert sent >= rate * duration * 0.95
+        assert log.stats.dropped == 0 and log.stats.write_errors == 0
+        assert await redis_client.xlen(STREAM_KEY) == sent
@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.spotify.fake_api import FakeSpotifyAPI, LatencyModel, refresh_token_for
+from app.services.spotify.prod import ProdSpotifyService
+from app.services.spotify.workload import ListenerPool, SyntheticCatalog
+
+
+@pytest.fixture
+def fake_api():
+    catalog = SyntheticCatalog(size=2000, seed=1, missing_features=0.0)
+    return FakeSpotifyAPI(ListenerPool(catalog, listeners=10, seed=1, pause_rate=0.0))
+
+
+@pytest.fixture
+async def connect(fake_api):
+    clients = []
+
+    def connect(listener: int = 0, **options) -> ProdSpotifyService:
+        http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_api.build_app()))
+        clients.append(http_client)
+        return ProdSpotifyService("id", "secret", refresh_token_for(listener), user_id=f"listener-{listener}",
+                                  http_client=http_client, api_base_url="http://fake/v1",
+                                  auth_url="http://fake/api/token", **options)
+
+    yield connect
+    for client in clients:
+        await client.aclose()
+
+
+def test_latency_model_matches_median_and_p99():
+    model = LatencyModel(median_ms=40, p99_ms=400)
+    samples = sorted(model.sample() for _ in range(20_000))
+
+    assert samples[10_000] == pytest.approx(0.040, rel=0.1)
+    assert samples[19_800] == pytest.approx(0.400, rel=0.25)
+    assert LatencyModel().sample() == 0.0
+
+
+@pytest.mark.asyncio
+class TestFakeSpotifyAPI:
+
+    async def test_prod_client_round_trip(self, fake_api, connect):
+        spotify = connect(listener=3)
+
+        playback = await spotify.get_current_playback()
+        queue = await spotify.get_queue()
+        features = await spotify.get_audio_features(playback.item.id)
+        batch = await spotify.get_audio_features_batch([track.id for track in queue.queue[:5]] + ["unknown"])
+        assert await spotify.skip_next() is True
+
+        assert playback.item.id == queue.currently_playing.id
+        assert features == fake_api.pool.catalog.features(playback.item.id)
+        assert batch["unknown"] is None and len(batch) == 6
+        assert (await spotify.get_current_playback()).item.id == queue.queue[0].id
+        assert fake_api.stats["POST /api/token 200"] == 1
+
+    async def test_expired_token_is_refreshed_and_retried(self, fake_api, connect):
+        spotify = connect(token_refresh_margin=0)
+        await spotify.get_current_playback()
+
+        fake_api._tokens.clear()  # Every issued token is now unknown to the server
+        playback = await spotify.get_current_playback()
+
+        assert playback is not None
+        assert fake_api.stats["GET /me/player 401"] == 1
+        assert fake_api.stats["POST /api/token 200"] == 2
+
+    async def test_expired_tokens_are_dropped_when_new_ones_are_issued(self, fake_api):
+        fake_api.token_lifetime = 0.05
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_api.build_app())) as client:
+            async def issue(listener: int):
+                response = await client.post("http://fake/api/token", data={
+                    "grant_type": "refresh_token", "refresh_token": refresh_token_for(listener)})
+                return response.json()["access_token"]
+
+            for listener in range(5):
+                await issue(listener)
+            await asyncio.sleep(0.06)
+            token = await issue(0)
+
+        assert list(fake_api._tokens) == [token]
+
+    async def test_rate_limit_answers_429_with_retry_after(self, fake_api, connect):
+        fake_api.rate_limit, fake_api.burst, fake_api._allowance = 0.5, 2, 2.0
+        spotify = connect(max_retries=0)
+
+        await spotify.skip_next()
+        await spotify.skip_next()
+        with pytest.raises(httpx.HTTPStatusError) as error:
+            await spotify.skip_next()
+
+        assert error.value.response.status_code == 429
+        assert error.value.response.headers["Retry-After"] == "2"
+
+    async def test_injected_errors(self, fake_api, connect):
+        fake_api.error_rates = {500: 1.0}
+        spotify = connect()
+
+        with pytest.raises(httpx.HTTPStatusError, match="500"):
+            await spotify.get_current_playback()
+        assert fake_api.stats["GET /me/player 500"] == 1
+
+    async def test_unknown_refresh_token_is_rejected(self, connect):
+        spotify = connect(listener=99)
+
+        with pytest.raises(httpx.HTTPStatusError, match="400"):
+            await spotify.get_current_playback()
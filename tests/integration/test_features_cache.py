@@ -0,0 +1,77 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models.spotify import AudioFeatures
+from app.services.codec import encode_features
+from app.services.spotify.cache import CachedSpotifyService
+
+
+@pytest.mark.asyncio
+class TestFeaturesCacheSharedTier:
+
+    async def test_features_are_shared_between_workers(self, storage):
+        spotify = AsyncMock()
+        spotify.get_audio_features.return_value = AudioFeatures(id="track_1", energy=0.3, instrumentalness=0.85, valence=0.4)
+
+        first_worker = CachedSpotifyService(spotify, storage=storage)
+        second_worker = CachedSpotifyService(spotify, storage=storage)
+        await first_worker.get_audio_features("track_1")
+        features = await second_worker.get_audio_features("track_1")
+
+        assert features == spotify.get_audio_features.return_value
+        spotify.get_audio_features.assert_called_once()
+        assert second_worker.stats.redis_hits == 1
+        _, ttl = await storage.get_with_ttl(CachedSpotifyService.KEY_PREFIX + "track_1")
+        assert ttl > 0
+
+    async def test_negative_entries_are_shared_with_short_ttl(self, storage):
+        spotify = AsyncMock()
+        spotify.get_audio_features.return_value = None
+
+        await CachedSpotifyService(spotify, negative_ttl=60, storage=storage).get_audio_features("podcast")
+        second_worker = CachedSpotifyService(spotify, negative_ttl=60, storage=storage)
+
+        assert await second_worker.get_audio_features("podcast") is None
+        spotify.get_audio_features.assert_called_once()
+        assert second_worker.stats.negative_hits == 1
+        _, ttl = await storage.get_with_ttl(CachedSpotifyService.KEY_PREFIX + "podcast")
+        assert 0 < ttl <= 60
+
+    async def test_batches_are_shared_between_workers(self, storage):
+        spotify = AsyncMock()
+        spotify.get_audio_features_batch.return_value = {
+            "track_1": AudioFeatures(id="track_1", energy=0.3, instrumentalness=0.85, valence=0.4)}
+
+        await CachedSpotifyService(spotify, storage=storage).get_audio_features_batch(["track_1", "podcast"])
+        second_worker = CachedSpotifyService(spotify, storage=storage)
+
+        assert await second_worker.get_audio_features_batch(["track_1", "podcast"]) == {
+            "track_1": spotify.get_audio_features_batch.return_value["track_1"], "podcast": None}
+        spotify.get_audio_features_batch.assert_called_once()
+        assert (second_worker.stats.redis_hits, second_worker.stats.negative_hits) == (2, 1)
+
+    async def test_legacy_text_entries_are_read(self, redis_client):
+        features = AudioFeatures(id="track_1", energy=0.3, instrumentalness=0.85, valence=0.4)
+        await redis_client.set(CachedSpotifyService.KEY_PREFIX + "track_1", encode_features(features))
+        spotify = AsyncMock()
+
+        assert await CachedSpotifyService(spotify).get_audio_features("track_1") == features
+        spotify.get_audio_features.assert_not_called()
+
+    async def test_unreadable_entries_are_misses(self, binary_redis_client):
+        # A corrupt value, and one written by a newer codec version
+        await binary_redis_client.set(CachedSpotifyService.KEY_PREFIX + "track_1", b"\xc1\x01garbage")
+        await binary_redis_client.set(CachedSpotifyService.KEY_PREFIX + "track_2", b"\xc1\x09")
+        spotify = AsyncMock()
+        spotify.get_audio_features.side_effect = lambda track_id: AudioFeatures(id=track_id, energy=0.3, instrumentalness=0.8, valence=0.4)
+        spotify.get_audio_features_batch.side_effect = lambda track_ids: {
+            track_id: AudioFeatures(id=track_id, energy=0.3, instrumentalness=0.8, valence=0.4) for track_id in track_ids}
+        cached = CachedSpotifyService(spotify)
+
+        assert (await cached.get_audio_features("track_1")).energy == 0.3
+        assert (await cached.get_audio_features_batch(["track_2"]))["track_2"].energy == 0.3
+        assert cached.stats.redis_errors == 2
+        assert cached.stats.misses == 2
+        # Overwritten with the fetched features
+        assert (await CachedSpotifyService(AsyncMock()).get_audio_features("track_1")).energy == 0.3
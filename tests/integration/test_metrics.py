@@ -0,0 +1,22 @@
+import pytest
+
+from app.core.metrics import REDIS_COMMAND_SECONDS
+from app.core.redis import InstrumentedRedis
+
+
+@pytest.mark.asyncio
+class TestInstrumentedRedis:
+
+    async def test_commands_and_pipelines_are_timed(self, redis_client):
+        client = InstrumentedRedis(connection_pool=redis_client.connection_pool)
+        sets = REDIS_COMMAND_SECONDS.labels("SET").count
+        transactions = REDIS_COMMAND_SECONDS.labels("MULTI").count
+
+        await client.set("metrics:key", "1")
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.incr("metrics:key")
+            pipe.get("metrics:key")
+            assert await pipe.execute() == [2, "2"]
+
+        assert REDIS_COMMAND_SECONDS.labels("SET").count == sets + 1
+        assert REDIS_COMMAND_SECONDS.labels("MULTI").count == transactions + 1
@@ -0,0 +1,29 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.spotify.rate_limit import RedisTokenBucket, RequestPriority, SpotifyRateLimiter
+
+
+@pytest.mark.asyncio
+class TestRedisTokenBucket:
+
+    async def test_budget_is_shared_between_workers(self):
+        workers = [SpotifyRateLimiter(RedisTokenBucket(rate=50, burst=5)) for _ in range(2)]
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker.acquire(RequestPriority.BULK) for worker in workers for _ in range(15)))
+
+        # 30 requests: 5 from the shared burst, the other 25 at 50/s for both workers together
+        assert time.monotonic() - started >= 0.45
+
+    async def test_retry_after_blocks_every_worker(self, redis_client):
+        first, second = (SpotifyRateLimiter(RedisTokenBucket(rate=1000, burst=100)) for _ in range(2))
+        await first.report_throttled(0.2)
+
+        started = time.monotonic()
+        await second.acquire(RequestPriority.SKIP)
+
+        assert time.monotonic() - started >= 0.15
+        assert await redis_client.pttl(RedisTokenBucket.BLOCKED_KEY) == -2
@@ -0,0 +1,126 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+import redis.asyncio as redis
+
+from app.core.redis import redis_manager
+from app.services.sharding import ShardLeaseManager, shard_for
+
+NUM_SHARDS = 16
+LEASE_TTL = 1.0
+RENEW_INTERVAL = 0.2
+
+
+def run_replica(replica_id: str):
+    """Child process entry point: runs a lease manager against the test Redis until killed"""
+    async def main():
+        client = redis.Redis(host=os.getenv("REDIS_HOST", "localhost"), port=int(os.getenv("REDIS_PORT", "6379")),
+                             db=1, decode_responses=True)
+        with patch.object(redis_manager, "get_client", return_value=client):
+            manager = ShardLeaseManager(NUM_SHARDS, LEASE_TTL, RENEW_INTERVAL, replica_id=replica_id)
+            await manager.run()
+
+    asyncio.run(main())
+
+
+async def live_owners(redis_client) -> dict[int, str]:
+    """Shard -> owner for every unexpired lease"""
+    seconds, micros = await redis_client.time()
+    now_ms = seconds * 1000 + micros // 1000
+    owners = {}
+    for shard, lease in (await redis_client.hgetall(ShardLeaseManager.LEASES_KEY)).items():
+        owner, expires_at = lease.rsplit("|", 1)
+        if int(expires_at) > now_ms:
+            owners[int(shard)] = owner
+    return owners
+
+
+async def wait_for(predicate, timeout: float) -> float:
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        if await predicate():
+            return time.monotonic() - started
+        await asyncio.sleep(0.05)
+    raise AssertionError("Condition not met before timeout")
+
+
+@pytest.mark.asyncio
+class TestShardLeaseManager:
+
+    async def test_single_replica_claims_all_shards(self):
+        manager = ShardLeaseManager(NUM_SHARDS, LEASE_TTL, RENEW_INTERVAL, replica_id="solo")
+        owned = await manager.renew()
+        assert owned == frozenset(range(NUM_SHARDS))
+        assert manager.owns("any_user")
+
+    async def test_replicas_split_shards_without_overlap(self, redis_client):
+        replicas = [ShardLeaseManager(NUM_SHARDS, LEASE_TTL, RENEW_INTERVAL, replica_id=f"r{i}") for i in range(2)]
+        for _ in range(3):
+            for replica in replicas:
+                await replica.renew()
+
+        assert replicas[0].owned_shards.isdisjoint(replicas[1].owned_shards)
+        assert replicas[0].owned_shards | replicas[1].owned_shards == frozenset(range(NUM_SHARDS))
+        assert len(replicas[0].owned_shards) == len(replicas[1].owned_shards) == NUM_SHARDS // 2
+
+        user_owners = [replica.owns("user_42") for replica in replicas]
+        assert user_owners.count(True) == 1
+        assert shard_for("user_42", NUM_SHARDS) in replicas[user_owners.index(True)].owned_shards
+
+    async def test_release_hands_over_immediately(self):
+        first = ShardLeaseManager(NUM_SHARDS, LEASE_TTL, RENEW_INTERVAL, replica_id="first")
+        second = ShardLeaseManager(NUM_SHARDS, LEASE_TTL, RENEW_INTERVAL, replica_id="second")
+        await first.renew()
+        await first.release()
+
+        assert await second.renew() == frozenset(range(NUM_SHARDS))
+        assert not first.owns("any_user")
+
+    async def test_renewal_cost_is_flat(self, redis_client):
+        for num_shards in (16, 1024):
+            await redis_client.config_resetstat()
+            manager = ShardLeaseManager(num_shards, LEASE_TTL, RENEW_INTERVAL, replica_id=f"flat-{num_shards}")
+            await manager.renew()
+            await manager.renew()
+            stats = await redis_client.info("commandstats")
+            calls = sum(value["calls"] for name, value in stats.items() if name.startswith("cmdstat_eval"))
+            assert calls == 2  # One script call per renewal, whatever the shard count
+            await redis_client.delete(ShardLeaseManager.LEASES_KEY, ShardLeaseManager.REPLICAS_KEY)
+
+    async def test_claims_thousands_of_shards(self, redis_client):
+        manager = ShardLeaseManager(5000, LEASE_TTL, RENEW_INTERVAL, replica_id="large")
+
+        assert await manager.renew() == frozenset(range(5000))
+        assert await manager.renew() == frozenset(range(5000))
+        assert len(await live_owners(redis_client)) == 5000
+
+    async def test_killed_replica_shards_are_taken_over(self, redis_client):
+        context = multiprocessing.get_context("spawn")
+        replicas = {name: context.Process(target=run_replica, args=(name,), daemon=True) for name in ("a", "b", "c")}
+        for process in replicas.values():
+            process.start()
+        try:
+            async def balanced():
+                owners = await live_owners(redis_client)
+                return len(owners) == NUM_SHARDS and set(owners.values()) == set(replicas)
+            await wait_for(balanced, timeout=20)
+
+            replicas["c"].kill()
+            killed_at = time.monotonic()
+
+            async def rebalanced():
+                owners = await live_owners(redis_client)
+                return len(owners) == NUM_SHARDS and set(owners.values()) == {"a", "b"}
+            await wait_for(rebalanced, timeout=10)
+            rebalance_time = time.monotonic() - killed_at
+
+            # Leases expire after one TTL, survivors pick them up on their next renewal
+            assert rebalance_time < LEASE_TTL + 3 * RENEW_INTERVAL + 0.5
+        finally:
+            for process in replicas.values():
+                process.kill()
+                process.join()
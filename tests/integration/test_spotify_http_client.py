@@ -0,0 +1,81 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.metrics import SPOTIFY_REQUEST_SECONDS, metrics
+from app.services.spotify.prod import ProdSpotifyService
+
+
+class StandInSpotifyHandler(BaseHTTPRequestHandler):
+    """Serves GET /v1/audio-features/{id} over keep-alive HTTP/1.1"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        track_id = self.path.rsplit("/", 1)[-1]
+        body = json.dumps({"id": track_id, "energy": 0.3, "instrumentalness": 0.8, "valence": 0.5}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInSpotifyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def create_service(base_url: str) -> ProdSpotifyService:
+    service = ProdSpotifyService("id", "secret", "refresh", api_base_url=base_url)
+    service._get_access_token = AsyncMock(return_value="token")
+    return service
+
+
+@pytest.mark.asyncio
+class TestPooledHttpClient:
+
+    async def test_pooled_client_reuses_one_connection(self, stand_in_server):
+        service = create_service(stand_in_server)
+        await service.open()
+        try:
+            for i in range(20):
+                features = await service.get_audio_features(f"track_{i}")
+                assert features.id == f"track_{i}"
+        finally:
+            await service.aclose()
+
+        assert service.http_timings.requests == 20
+        assert service.http_timings.new_connections == 1
+        assert service.http_timings.last.connect_ms == 0.0
+        assert service.http_timings.last.ttfb_ms > 0.0
+        assert service.http_client is None
+
+    async def test_unpooled_client_connects_on_every_call(self, stand_in_server):
+        service = create_service(stand_in_server)
+        for i in range(5):
+            await service.get_audio_features(f"track_{i}")
+
+        assert service.http_timings.new_connections == 5
+        assert service.http_timings.last.connect_ms > 0.0
+
+    async def test_requests_are_timed_only_with_metrics_enabled(self, stand_in_server):
+        service = create_service(stand_in_server)
+        timed = SPOTIFY_REQUEST_SECONDS.labels("GET /audio-features/{id}", "200")
+        count = timed.count
+
+        await service.get_audio_features("track_1")
+        with patch.object(metrics, "enabled", False):
+            await service.get_audio_features("track_2")
+
+        assert timed.count == count + 1
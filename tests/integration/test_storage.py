@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from app.models.strategy import StrategyConfig
+from app.services.codec import StrategyConfigCodec
+from app.services.storage.memory import InMemoryStorage
+
+
+def encode_strategy(strategy_id: str, active: bool = True) -> bytes:
+    return StrategyConfigCodec().encode(StrategyConfig(id=strategy_id, name=strategy_id.title(),
+                                                       description="Storage test strategy", is_active=active))
+
+
+@pytest.mark.asyncio
+class TestStorageBackend:
+
+    async def test_values_with_and_without_ttl(self, storage):
+        await storage.set("plain", "value")
+        await storage.set("expiring", b"\x00\xff", ttl=60)
+
+        assert await storage.get("plain") == b"value"
+        assert await storage.get_with_ttl("plain") == (b"value", None)
+        value, ttl = await storage.get_with_ttl("expiring")
+        assert value == b"\x00\xff" and 59 < ttl <= 60
+        assert await storage.get_with_ttl("missing") == (None, None)
+
+    async def test_values_expire(self, storage):
+        await storage.set_many({"a": "1", "b": "2"}, ttl=0.05)
+        assert await storage.get_many(["a", "missing", "b"]) == [b"1", None, b"2"]
+
+        await asyncio.sleep(0.1)
+
+        assert await storage.get_many(["a", "b"]) == [None, None]
+
+    async def test_only_if_absent_and_delete_if_equal(self, storage):
+        assert await storage.set("lock", "me", ttl=10, only_if_absent=True)
+        assert not await storage.set("lock", "other", ttl=10, only_if_absent=True)
+
+        assert not await storage.delete_if_equal("lock", "other")
+        assert await storage.delete_if_equal("lock", "me")
+        assert await storage.get("lock") is None
+
+        await storage.set("key", "value")
+        await storage.delete("key")
+        assert await storage.get("key") is None
+
+    async def test_strategy_writes_bump_the_version(self, storage):
+        assert await storage.load_strategies() == (0, {}, None)
+
+        assert await storage.upsert_strategies({"a": encode_strategy("a"), "b": encode_strategy("b", False)}) == 1
+        assert await storage.set_active_strategy("a") == 2
+        assert await storage.set_active_strategy("b") == "disabled"
+        assert await storage.set_active_strategy("ghost") == "missing"
+
+        version, catalog, active_id = await storage.load_strategies()
+        assert (version, sorted(catalog), active_id) == (2, ["a", "b"], "a")
+        assert await storage.get_active_strategy() == ("a", catalog["a"])
+        assert await storage.get_strategies(["b", "ghost"]) == [catalog["b"], None]
+        assert await storage.get_catalog() == catalog
+        assert await storage.get_version() == 2
+
+    async def test_subscribers_are_notified_of_changes(self, storage):
+        subscription = await storage.subscribe_changes()
+        assert not await subscription.wait(timeout=0.05)
+
+        await storage.upsert_strategies({"a": encode_strategy("a")})
+
+        assert await subscription.wait(timeout=1)
+        await subscription.close()
+
+
+@pytest.mark.asyncio
+class TestInMemoryStorage:
+
+    async def test_state_survives_a_restart_through_the_snapshot(self, tmp_path):
+        path = str(tmp_path / "state.msgpack")
+        storage = InMemoryStorage(path)
+        await storage.open()
+        await storage.upsert_strategies({"a": encode_strategy("a")})
+        await storage.set_active_strategy("a")
+        await storage.set("token", "secret", ttl=60)
+        await storage.set("gone", "soon", ttl=0.01)
+        await storage.close()
+        await asyncio.sleep(0.02)
+
+        restarted = InMemoryStorage(path)
+        await restarted.open()
+
+        assert await restarted.load_strategies() == await storage.load_strategies()
+        value, ttl = await restarted.get_with_ttl("token")
+        assert value == b"secret" and 59 < ttl <= 60
+        assert "gone" not in restarted._values
+        await restarted.close()
+
+    async def test_snapshot_is_written_periodically_only_when_changed(self, tmp_path):
+        path = tmp_path / "state.msgpack"
+        storage = InMemoryStorage(str(path), snapshot_interval=0.02)
+        await storage.open()
+
+        await storage.set("key", "value")
+        await asyncio.sleep(0.05)
+        assert path.exists()
+        written = path.stat().st_mtime_ns
+        await asyncio.sleep(0.05)
+
+        assert path.stat().st_mtime_ns == written
+        await storage.close()
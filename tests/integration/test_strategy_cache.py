@@ -0,0 +1,156 @@
+import asyncio
+import multiprocessing
+import os
+from unittest.mock import patch
+
+import pytest
+import redis.asyncio as redis
+
+from app.core.redis import redis_manager
+from app.models.strategy import StrategyConfig
+from app.services.storage.redis import RedisStorage
+from app.services.strategy_cache import CachedStrategyManager
+from app.services.strategy_manager import StrategyManager
+from tests.integration.helpers import wait_until
+
+
+def create_strategy(strategy_id: str, energy_floor: float = 0.7) -> StrategyConfig:
+    return StrategyConfig(id=strategy_id, name=strategy_id.title(), description="Ensures music energy stays high.",
+                          parameters={"energy_floor": energy_floor})
+
+
+@pytest.fixture
+async def seeded_manager(strategy_manager):
+    await strategy_manager.upsert_strategy(create_strategy("energy"))
+    await strategy_manager.upsert_strategy(create_strategy("calm", 0.2))
+    await strategy_manager.set_active_strategy("energy")
+    return strategy_manager
+
+
+@pytest.fixture
+async def cached_manager(seeded_manager):
+    manager = CachedStrategyManager(reconnect_interval=0.05)
+    task = asyncio.create_task(manager.run())
+    await wait_until(lambda: manager.subscribed)
+    yield manager
+    manager.stop()
+    await task
+
+
+@pytest.mark.asyncio
+class TestCachedStrategyManager:
+
+    async def test_steady_state_reads_without_redis(self, cached_manager, redis_client, binary_redis_client):
+        catalog = await cached_manager.get_catalog()
+
+        with patch.object(binary_redis_client, "execute_command", side_effect=AssertionError("Redis was called")), \
+                patch.object(redis_client, "execute_command", side_effect=AssertionError("Redis was called")):
+            for _ in range(100):
+                assert await cached_manager.get_catalog() == catalog
+                assert (await cached_manager.get_active_strategy()).id == "energy"
+                assert [config.id for config in await cached_manager.get_strategies(["calm"])] == ["calm"]
+
+        assert cached_manager.stats.reloads == 1
+        assert cached_manager.stats.hits == 300
+
+    async def test_change_from_another_replica_is_picked_up(self, cached_manager):
+        assert (await cached_manager.get_active_strategy()).id == "energy"
+
+        await StrategyManager().set_active_strategy("calm")
+        await wait_until(lambda: cached_manager.stale)
+
+        assert (await cached_manager.get_active_strategy()).id == "calm"
+
+    async def test_own_writes_are_read_back_immediately(self, cached_manager):
+        await cached_manager.get_catalog()
+
+        await cached_manager.upsert_strategy(create_strategy("energy", 0.9))
+
+        assert (await cached_manager.get_active_strategy()).parameters == {"energy_floor": 0.9}
+
+    async def test_reload_only_parses_changed_configs(self, cached_manager):
+        calm = (await cached_manager.get_strategies(["calm"]))[0]
+
+        await cached_manager.upsert_strategy(create_strategy("energy", 0.9))
+        await cached_manager.get_catalog()
+
+        assert (await cached_manager.get_strategies(["calm"]))[0] is calm
+
+    async def test_falls_back_to_version_checks_without_subscription(self, seeded_manager):
+        manager = CachedStrategyManager()
+        await manager.get_catalog()
+        await manager.get_catalog()
+
+        await StrategyManager().upsert_strategy(create_strategy("focus"))
+
+        assert "focus" in [config.id for config in await manager.get_catalog()]
+        assert manager.stats.version_checks == 2
+        assert manager.stats.reloads == 2
+
+    async def test_missing_strategies_raise_like_the_uncached_manager(self, cached_manager):
+        with pytest.raises(ValueError, match="do not exist"):
+            await cached_manager.get_strategies(["energy", "ghost"])
+
+    async def test_concurrent_reads_share_one_reload(self, cached_manager):
+        await cached_manager.get_catalog()
+        await StrategyManager().upsert_strategy(create_strategy("focus"))
+        await wait_until(lambda: cached_manager.stale)
+
+        await asyncio.gather(*(cached_manager.get_catalog() for _ in range(50)))
+
+        assert cached_manager.stats.reloads == 2
+
+
+def replica(name: str, writes: int, barrier, results):
+    asyncio.run(run_replica(name, writes, barrier, results))
+
+
+async def run_replica(name: str, writes: int, barrier, results):
+    """Writes and reads concurrently with another process, then reports its converged snapshot"""
+    client = redis.Redis(host=os.getenv("REDIS_HOST", "localhost"), port=int(os.getenv("REDIS_PORT", "6379")),
+                         db=1, decode_responses=True)
+    binary_client = redis.Redis(host=os.getenv("REDIS_HOST", "localhost"), port=int(os.getenv("REDIS_PORT", "6379")),
+                                db=1)
+    with patch.object(redis_manager, "get_client", return_value=client), \
+            patch.object(redis_manager, "get_binary_client", return_value=binary_client):
+        manager = CachedStrategyManager(reconnect_interval=0.05)
+        task = asyncio.create_task(manager.run())
+        await wait_until(lambda: manager.subscribed)
+        barrier.wait()
+        for i in range(writes):
+            await manager.upsert_strategy(create_strategy(f"shared_{i % 4}", energy_floor=i / writes))
+            if i % 3 == 0:
+                await manager.set_active_strategy(f"shared_{i % 4}")
+            await manager.get_catalog()
+        barrier.wait()
+        target = int(await client.get(RedisStorage.VERSION_KEY))
+        # Reads reload the snapshot until the last change notification has arrived
+        while await manager.get_version() != target:
+            await asyncio.sleep(0.01)
+        snapshot = await manager.snapshot()
+        results.put((name, snapshot.version, snapshot.active_id, snapshot.raw, manager.stats.reloads))
+        manager.stop()
+        await task
+    await client.aclose()
+    await binary_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_replicas_converge_after_concurrent_writes(seeded_manager, redis_client, binary_redis_client):
+    context = multiprocessing.get_context("spawn")
+    barrier, results = context.Barrier(2), context.Queue()
+    processes = [context.Process(target=replica, args=(name, 50, barrier, results)) for name in ("a", "b")]
+    for process in processes:
+        process.start()
+    reports = [await asyncio.to_thread(results.get, timeout=60) for _ in processes]
+    for process in processes:
+        process.join(timeout=10)
+
+    version = int(await redis_client.get(RedisStorage.VERSION_KEY))
+    catalog = {strategy_id.decode(): strategy for strategy_id, strategy
+               in (await binary_redis_client.hgetall(RedisStorage.STRATEGIES_CATALOG_KEY)).items()}
+    active_id = await redis_client.get(RedisStorage.ACTIVE_STRATEGY_KEY)
+    assert version == 3 + 2 * (50 + 17)
+    for _, snapshot_version, snapshot_active_id, raw, reloads in reports:
+        assert (snapshot_version, snapshot_active_id, raw) == (version, active_id, catalog)
+        assert reloads < 2 * (50 + 17) + 2  # At most one reload per change
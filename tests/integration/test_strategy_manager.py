@@ -1,5 +1,9 @@
+import asyncio
+
 import pytest
 from app.models.strategy import StrategyConfig
+from app.services.codec import MAGIC, StrategyConfigCodec
+from app.services.storage.redis import RedisStorage
 from app.services.strategy_manager import StrategyManager
 
 
@@ -13,15 +17,25 @@ def create_strategy(id: str, active: bool = True):
         parameters={"param1": "value1", "param2": 10}
     )
 
+def create_chain(id: str, members: list[str]):
+    return StrategyConfig(id=id, name=f"Chain {id}", description="", parameters={"chain": members})
+
+@pytest.fixture
+def strategy_manager(storage):
+    """
+    Runs every TestStrategyManager test against each storage backend.
+    """
+    return StrategyManager(storage=storage)
+
 @pytest.mark.asyncio
 class TestStrategyManager:
 
-    async def test_create_and_update_strategy(self, strategy_manager, redis_client):
+    async def test_create_and_update_strategy(self, strategy_manager, storage):
         strategy = create_strategy("focus")
         await strategy_manager.upsert_strategy(strategy)
-        saved_strategy = await redis_client.hget(StrategyManager.STRATEGIES_CATALOG_KEY, strategy.id)
+        [saved_strategy] = await storage.get_strategies([strategy.id])
         assert saved_strategy is not None
-        assert StrategyConfig.model_validate_json(saved_strategy).id == strategy.id
+        assert StrategyConfigCodec().decode(strategy.id, saved_strategy).id == strategy.id
 
     async def test_get_catalog(self, strategy_manager):
         strategy1 = create_strategy("s1")
@@ -33,10 +47,153 @@ class TestStrategyManager:
         assert len(catalog) == 1
         assert catalog[0].id == "s1"
 
-    async def test_set_and_get_active_strategy(self, strategy_manager, redis_client):
+    async def test_set_and_get_active_strategy(self, strategy_manager, storage):
         await strategy_manager.upsert_strategy(create_strategy("my_vibe", active=True))
 
         await strategy_manager.set_active_strategy("my_vibe")
 
-        active_id = await redis_client.get("strategies:active_id")
+        active_id, _ = await storage.get_active_strategy()
         assert active_id == "my_vibe"
+        assert (await strategy_manager.get_active_strategy()).id == "my_vibe"
+
+    async def test_integers_beyond_64_bits_are_stored(self, strategy_manager):
+        strategy = StrategyConfig(id="fast", name="Fast", description="", parameters={"min_tempo": 10**20})
+        await strategy_manager.upsert_strategy(strategy)
+
+        await strategy_manager.set_active_strategy("fast")
+
+        assert await strategy_manager.get_active_strategy() == strategy
+
+    async def test_no_active_strategy(self, strategy_manager):
+        with pytest.raises(ValueError, match="No active strategy configured"):
+            await strategy_manager.get_active_strategy()
+
+    async def test_set_active_strategy_rejects_missing_and_disabled(self, strategy_manager, storage):
+        await strategy_manager.upsert_strategy(create_strategy("off", active=False))
+        version = await strategy_manager.get_version()
+
+        with pytest.raises(ValueError, match="Strategy id: 'ghost' does not exist"):
+            await strategy_manager.set_active_strategy("ghost")
+        with pytest.raises(ValueError, match="Strategy id: 'off' is dsabled"):
+            await strategy_manager.set_active_strategy("off")
+
+        assert await storage.get_active_strategy() == (None, None)
+        assert await strategy_manager.get_version() == version
+
+    async def test_writes_bump_the_version_and_notify(self, strategy_manager, storage):
+        subscription = await storage.subscribe_changes()
+
+        await strategy_manager.upsert_strategies([create_strategy("a"), create_strategy("b"), create_strategy("c")])
+        assert await subscription.wait(timeout=1)
+        await strategy_manager.set_active_strategy("b")
+        assert await subscription.wait(timeout=1)
+
+        assert not await subscription.wait(timeout=0.05)
+        assert await strategy_manager.get_version() == 2
+        assert sorted(s.id for s in await strategy_manager.get_catalog()) == ["a", "b", "c"]
+        await subscription.close()
+
+    async def test_bulk_upsert_has_no_size_limit(self, strategy_manager):
+        await strategy_manager.upsert_strategies([create_strategy(f"s{i}") for i in range(5000)])
+
+        assert await strategy_manager.get_version() == 1
+        assert len(await strategy_manager.get_catalog()) == 5000
+
+    async def test_set_active_strategy_is_atomic_with_a_concurrent_disable(self, strategy_manager):
+        await strategy_manager.upsert_strategy(create_strategy("flaky"))
+
+        results = await asyncio.gather(
+            *(strategy_manager.set_active_strategy("flaky") for _ in range(20)),
+            strategy_manager.upsert_strategy(create_strategy("flaky", active=False)),
+            *(strategy_manager.set_active_strategy("flaky") for _ in range(20)),
+            return_exceptions=True)
+
+        # Rejected activations wrote nothing; the others each bumped the version exactly once
+        rejected = [result for result in results if isinstance(result, ValueError)]
+        assert all("is dsabled" in str(error) for error in rejected)
+        assert await strategy_manager.get_version() == 2 + 40 - len(rejected)
+
+    async def test_legacy_json_configs_are_read_and_migrated_on_write(self, strategy_manager, storage):
+        legacy = StrategyManager(StrategyConfigCodec(binary=False), storage)
+        await legacy.upsert_strategies([create_strategy("old"), create_strategy("old_off", active=False)])
+
+        assert sorted(s.id for s in await strategy_manager.get_catalog()) == ["old", "old_off"]
+        with pytest.raises(ValueError, match="is dsabled"):
+            await strategy_manager.set_active_strategy("old_off")
+        await strategy_manager.set_active_strategy("old")
+        assert (await strategy_manager.get_active_strategy()).id == "old"
+
+        await strategy_manager.upsert_strategy(create_strategy("old_off", active=False))
+        [stored] = await storage.get_strategies(["old_off"])
+        assert stored[0] == MAGIC
+        with pytest.raises(ValueError, match="is dsabled"):
+            await strategy_manager.set_active_strategy("old_off")
+
+    async def test_chains_need_existing_plain_members(self, strategy_manager):
+        await strategy_manager.upsert_strategies([create_strategy("a"), create_strategy("b")])
+        stack = create_chain("stack", ["a", "b"])
+
+        with pytest.raises(ValueError, match=r"members: \['ghost'\] do not exist"):
+            await strategy_manager.upsert_strategy(create_chain("broken", ["a", "ghost"]))
+        await strategy_manager.upsert_strategy(stack)
+        with pytest.raises(ValueError, match=r"members: \['stack'\] are chains"):
+            await strategy_manager.upsert_strategy(create_chain("outer", ["a", "stack"]))
+        with pytest.raises(ValueError, match=r"is a member of chains \['stack'\]"):
+            await strategy_manager.upsert_strategy(create_chain("a", ["b"]))
+        # Members written along with their chain are fine
+        await strategy_manager.upsert_strategies([create_strategy("c"), create_chain("other", ["b", "c"])])
+
+        assert sorted(s.id for s in await strategy_manager.get_catalog()) == ["a", "b", "c", "other", "stack"]
+
+    async def test_activating_a_chain_checks_its_members(self, strategy_manager, storage):
+        # Stored without going through the manager, e.g. before members were checked on write
+        await storage.upsert_strategies({"stack": StrategyConfigCodec().encode(create_chain("stack", ["a", "ghost"]))})
+        await strategy_manager.upsert_strategy(create_strategy("a"))
+
+        with pytest.raises(ValueError, match=r"members: \['ghost'\] do not exist"):
+            await strategy_manager.set_active_strategy("stack")
+        assert await storage.get_active_strategy() == (None, None)
+
+        await strategy_manager.upsert_strategy(create_strategy("ghost"))
+        await strategy_manager.set_active_strategy("stack")
+        assert (await strategy_manager.get_active_strategy()).id == "stack"
+
+
+@pytest.mark.asyncio
+class TestRedisStrategyManager:
+
+    async def test_active_strategy_without_config(self, redis_client):
+        await redis_client.set(RedisStorage.ACTIVE_STRATEGY_KEY, "ghost")
+
+        with pytest.raises(ValueError, match="Active strategy id: 'ghost' does not exist"):
+            await StrategyManager().get_active_strategy()
+
+    async def test_get_active_strategy_is_one_round_trip(self, binary_redis_client):
+        strategy_manager = StrategyManager()
+        await strategy_manager.upsert_strategy(create_strategy("my_vibe"))
+        await strategy_manager.set_active_strategy("my_vibe")
+        await strategy_manager.get_active_strategy()  # Loads the script
+        calls = []
+        execute_command = binary_redis_client.execute_command
+
+        async def counting(*args, **options):
+            calls.append(args[0])
+            return await execute_command(*args, **options)
+
+        binary_redis_client.execute_command = counting
+        try:
+            assert (await strategy_manager.get_active_strategy()).id == "my_vibe"
+        finally:
+            del binary_redis_client.execute_command
+        assert calls == ["EVALSHA"]
+
+    async def test_writes_publish_the_new_version(self, redis_client):
+        pubsub = redis_client.pubsub()
+        await pubsub.subscribe(RedisStorage.CHANGES_CHANNEL)
+        await pubsub.get_message(timeout=1)  # Subscribe confirmation
+
+        await StrategyManager().upsert_strategies([create_strategy("a"), create_strategy("b")])
+        await StrategyManager().set_active_strategy("b")
+
+        assert [(await pubsub.get_message(timeout=1))["data"] for _ in range(2)] == ["1", "2"]
+        await pubsub.aclose()
@@ -0,0 +1,86 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.models.strategy import StrategyConfig
+from app.services.strategy_manager import StrategyManager
+from app.services.strategy_resolver import ActiveStrategyResolver
+from app.strategies.chain import StrategyChain
+from tests.integration.helpers import wait_until
+
+
+def create_strategy(energy_floor: float) -> StrategyConfig:
+    return StrategyConfig(id="energy", name="Energy Floor", description="Ensures music energy stays high.",
+                          parameters={"energy_floor": energy_floor})
+
+
+@pytest.fixture
+async def seeded_manager(strategy_manager):
+    await strategy_manager.upsert_strategy(create_strategy(0.7))
+    await strategy_manager.set_active_strategy("energy")
+    return strategy_manager
+
+
+@pytest.fixture
+async def listening_resolver(seeded_manager):
+    resolver = ActiveStrategyResolver(seeded_manager, reconnect_interval=0.05)
+    task = asyncio.create_task(resolver.run())
+    await wait_until(lambda: resolver.subscribed)
+    yield resolver
+    resolver.stop()
+    await task
+
+
+@pytest.mark.asyncio
+class TestActiveStrategyResolver:
+
+    async def test_steady_state_resolves_without_redis(self, listening_resolver, redis_client):
+        config, strategy = await listening_resolver.resolve()
+
+        with patch.object(redis_client, "execute_command", side_effect=AssertionError("Redis was called")):
+            for _ in range(100):
+                assert await listening_resolver.resolve() == (config, strategy)
+
+        assert listening_resolver.stats.hits == 100
+        assert listening_resolver.stats.reloads == 1
+
+    async def test_published_change_is_picked_up_on_the_next_resolve(self, listening_resolver):
+        _, strategy = await listening_resolver.resolve()
+        assert strategy.energy_floor == 0.7
+
+        # Written through another manager, as another replica or the API would
+        await StrategyManager().upsert_strategy(create_strategy(0.9))
+        await wait_until(lambda: listening_resolver._stale)
+
+        config, strategy = await listening_resolver.resolve()
+        assert config.parameters == {"energy_floor": 0.9}
+        assert strategy.energy_floor == 0.9
+
+    async def test_falls_back_to_version_checks_without_subscription(self, seeded_manager):
+        resolver = ActiveStrategyResolver(seeded_manager)
+        first = await resolver.resolve()
+        assert await resolver.resolve() == first
+        assert resolver.stats.reloads == 1
+
+        await seeded_manager.upsert_strategy(create_strategy(0.9))
+        _, strategy = await resolver.resolve()
+
+        assert strategy.energy_floor == 0.9
+        assert resolver.stats.version_checks == 3
+
+    async def test_chain_is_built_from_its_member_configs(self, seeded_manager):
+        await seeded_manager.upsert_strategy(StrategyConfig(
+            id="no_explicit", name="No Explicit", description="",
+            parameters={"skip_if": {"field": "explicit", "op": "==", "value": True}},
+        ))
+        await seeded_manager.upsert_strategy(StrategyConfig(
+            id="stack", name="Stack", description="", parameters={"chain": ["energy", "no_explicit"]},
+        ))
+        await seeded_manager.set_active_strategy("stack")
+
+        config, strategy = await ActiveStrategyResolver(seeded_manager).resolve()
+
+        assert config.id == "stack"
+        assert isinstance(strategy, StrategyChain)
+        assert strategy.order == ["no_explicit", "energy"]
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.spotify.prod import ProdSpotifyService
+
+
+class FakeSpotify:
+    """Accepts only the latest issued token; counts calls to the token endpoint"""
+
+    def __init__(self, expires_in: int = 3600):
+        self.expires_in = expires_in
+        self.valid_token = "token_0"
+        self.refresh_calls = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/token":
+            self.refresh_calls += 1
+            await asyncio.sleep(0.05)  # Keep the refresh in flight while the herd piles up
+            self.valid_token = f"token_{self.refresh_calls}"
+            return httpx.Response(200, json={"access_token": self.valid_token, "expires_in": self.expires_in})
+        if request.headers["Authorization"] != f"Bearer {self.valid_token}":
+            return httpx.Response(401)
+        return httpx.Response(204)
+
+
+def create_service(fake: FakeSpotify, http_client: httpx.AsyncClient, storage) -> ProdSpotifyService:
+    return ProdSpotifyService("id", "secret", "refresh", http_client=http_client,
+                              api_base_url="https://api.test/v1", auth_url="https://accounts.test/api/token",
+                              storage=storage)
+
+
+@pytest.mark.asyncio
+class TestSpotifyTokenManager:
+
+    async def test_thundering_herd_of_401s_refreshes_once(self, storage):
+        fake = FakeSpotify()
+        await storage.set(ProdSpotifyService.ACCESS_TOKEN_KEY, "revoked", ttl=3600)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(fake.handler)) as http_client:
+            service = create_service(fake, http_client, storage)
+            results = await asyncio.gather(*(service.skip_next() for _ in range(300)))
+
+        assert all(results)
+        assert fake.refresh_calls == 1
+        assert await storage.get(ProdSpotifyService.ACCESS_TOKEN_KEY) == b"token_1"
+
+    async def test_replicas_share_one_refresh(self, storage):
+        fake = FakeSpotify()
+        await storage.set(ProdSpotifyService.ACCESS_TOKEN_KEY, "revoked", ttl=3600)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(fake.handler)) as http_client:
+            replicas = [create_service(fake, http_client, storage) for _ in range(5)]
+            await asyncio.gather(*(replica.skip_next() for replica in replicas for _ in range(20)))
+
+        assert fake.refresh_calls == 1
+        assert sum(replica.tokens.refresh_count for replica in replicas) == 1
+
+    async def test_token_is_kept_in_memory_until_close_to_expiry(self, storage):
+        fake = FakeSpotify(expires_in=3600)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(fake.handler)) as http_client:
+            service = create_service(fake, http_client, storage)
+            await service.skip_next()
+            await storage.delete(ProdSpotifyService.ACCESS_TOKEN_KEY)
+            for _ in range(10):
+                await service.skip_next()
+
+            assert fake.refresh_calls == 1
+            assert 3400 < service.tokens.seconds_until_refresh() <= 3540
+
+            # A token about to expire is refreshed before it is used
+            fake.expires_in = 30
+            await service.apply_refresh_token()
+            await service.skip_next()
+            assert fake.refresh_calls == 3
@@ -0,0 +1,39 @@
+import random
+
+from app.models.spotify import AudioFeatures, PlaybackState, SpotifyTrack
+from app.models.strategy import StrategyConfig
+from app.strategies.implementations.focus_guard import FocusGuardStrategy
+
+FOCUS = StrategyConfig(id="focus", name="Focus Guard", description="", parameters={})
+
+
+class StaticResolver:
+    """Always resolves the focus strategy, so engine tests need no storage"""
+
+    def __init__(self):
+        self.strategy = FocusGuardStrategy()
+
+    async def resolve(self):
+        return FOCUS, self.strategy
+
+
+def playing(track: SpotifyTrack) -> PlaybackState:
+    return PlaybackState(timestamp=0, progress_ms=1000, is_playing=True, currently_playing_type="track", item=track)
+
+
+def create_tracks(count: int, seed: int = 7) -> list[SpotifyTrack]:
+    """`count` tracks with seeded random features"""
+    rng = random.Random(seed)
+    # Coarse values so thresholds are hit exactly, plus some tracks without features
+    value = lambda: rng.choice([0.0, 0.25, 0.5, 0.6, 0.7, 0.75, 0.9, 1.0, rng.random()])
+    return [
+        SpotifyTrack(
+            id=f"track_{i}", name=f"Track {i}", uri=f"spotify:track:{i}", duration_ms=200000,
+            explicit=False, popularity=50, artists=[],
+            features=None if i % 10 == 0 else AudioFeatures(
+                id=f"track_{i}", energy=value(), instrumentalness=value(), valence=value(),
+                tempo=rng.choice([None, 120.0]),
+            ),
+        )
+        for i in range(count)
+    ]
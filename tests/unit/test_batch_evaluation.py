@@ -0,0 +1,43 @@
+import pytest
+
+from app.models.spotify import SpotifyTrack
+from app.strategies.base import StrategyAction
+from app.strategies.batch import FeatureMatrix, evaluate_batch
+from app.strategies.implementations.energy_floor import EnergyFloorStrategy
+from app.strategies.implementations.focus_guard import FocusGuardStrategy
+from app.strategies.implementations.vibe_shift import VibeShiftStrategy
+from tests.unit.helpers import create_tracks
+
+
+class PerTrackOnlyStrategy:
+    async def evaluate(self, track: SpotifyTrack) -> StrategyAction:
+        return StrategyAction.SKIP if track.id.endswith("3") else StrategyAction.KEEP
+
+
+@pytest.mark.asyncio
+class TestBatchEvaluation:
+
+    @pytest.mark.parametrize("strategy", [
+        FocusGuardStrategy(instrumental_threshold=0.75, energy_threshold=0.5),
+        EnergyFloorStrategy(energy_floor=0.7),
+        VibeShiftStrategy(min_valence=0.6, max_valence=0.9),
+        PerTrackOnlyStrategy(),
+    ], ids=lambda strategy: type(strategy).__name__)
+    async def test_batch_matches_per_track_evaluate(self, strategy):
+        tracks = create_tracks(500)
+
+        skip_mask = await evaluate_batch(strategy, FeatureMatrix.from_tracks(tracks))
+
+        expected = [await strategy.evaluate(track) == StrategyAction.SKIP for track in tracks]
+        assert skip_mask.tolist() == expected
+
+    async def test_missing_values_are_nan_columns(self):
+        matrix = FeatureMatrix.from_tracks(create_tracks(20))
+
+        assert matrix.has_features.tolist() == [i % 10 != 0 for i in range(20)]
+        assert matrix.column("energy").flags["C_CONTIGUOUS"]
+        assert all(value != value for value in matrix.column("loudness"))
+
+    async def test_per_track_fallback_needs_tracks(self):
+        with pytest.raises(ValueError):
+            await evaluate_batch(PerTrackOnlyStrategy(), FeatureMatrix.from_columns(3, energy=[0.1, 0.2, 0.3]))
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.services.spotify.batching import BatchLoader
+from app.services.spotify.prod import ProdSpotifyService
+
+
+class RecordingBatchFn:
+    """Batch function recording the keys of every call"""
+
+    def __init__(self, fail: bool = False):
+        self.calls: list[list[str]] = []
+        self.fail = fail
+
+    async def __call__(self, keys: list[str]) -> dict[str, str | None]:
+        self.calls.append(keys)
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("Spotify API Down")
+        return {key: f"value_{key}" for key in keys if key != "unknown"}
+
+
+@pytest.mark.asyncio
+class TestBatchLoader:
+
+    async def test_concurrent_loads_are_merged(self):
+        batch_fn = RecordingBatchFn()
+        loader = BatchLoader(batch_fn, max_wait=0.01)
+
+        results = await asyncio.gather(*(loader.load(f"t{i}") for i in range(10)), loader.load("unknown"))
+
+        assert len(batch_fn.calls) == 1
+        assert results[:10] == [f"value_t{i}" for i in range(10)]
+        assert results[10] is None
+
+    async def test_duplicate_keys_share_one_fetch(self):
+        batch_fn = RecordingBatchFn()
+        loader = BatchLoader(batch_fn, max_wait=0.01)
+
+        first = asyncio.create_task(loader.load("t1"))
+        await asyncio.sleep(0.015)  # Dispatched and now in flight
+        results = await asyncio.gather(first, loader.load("t1"), loader.load("t1"))
+
+        assert batch_fn.calls == [["t1"]]
+        assert results == ["value_t1"] * 3
+        assert loader.stats.coalesced == 2
+
+    async def test_batches_are_capped(self):
+        batch_fn = RecordingBatchFn()
+        loader = BatchLoader(batch_fn, max_batch_size=100, max_wait=0.01)
+
+        await asyncio.gather(*(loader.load(f"t{i}") for i in range(250)))
+
+        assert [len(call) for call in batch_fn.calls] == [100, 100, 50]
+
+    async def test_lone_request_latency_is_bounded(self):
+        loader = BatchLoader(RecordingBatchFn(), max_wait=0.02)
+
+        started = time.perf_counter()
+        await loader.load("t1")
+
+        # max_wait window + the 10ms batch call, with some scheduling slack
+        assert time.perf_counter() - started < 0.02 + 0.01 + 0.02
+
+    async def test_errors_reach_every_caller(self):
+        loader = BatchLoader(RecordingBatchFn(fail=True), max_wait=0.01)
+
+        results = await asyncio.gather(loader.load("t1"), loader.load("t2"), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_prod_service_batches_audio_features_requests():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        ids = request.url.params["ids"].split(",")
+        return httpx.Response(200, json={"audio_features": [
+            None if track_id == "unknown" else {"id": track_id, "energy": 0.3, "instrumentalness": 0.8, "valence": 0.5}
+            for track_id in ids
+        ]})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        service = ProdSpotifyService("id", "secret", "refresh", http_client=http_client, features_batch_window=0.01)
+        service._get_access_token = AsyncMock(return_value="token")
+
+        results = await asyncio.gather(*(service.get_audio_features(track_id) for track_id in ["a", "b", "a", "unknown"]))
+
+    assert len(requests) == 1
+    assert requests[0].url.path == "/v1/audio-features"
+    assert requests[0].url.params["ids"] == "a,b,unknown"
+    assert [features.id if features else None for features in results] == ["a", "b", "a", None]
@@ -0,0 +1,63 @@
+import pytest
+
+from app.models.spotify import AudioFeatures
+from app.models.strategy import StrategyConfig
+from app.services.codec import MAGIC, AudioFeaturesCodec, StrategyConfigCodec, encode_features
+
+
+def create_features(track_id: str = "track_1"):
+    return AudioFeatures(id=track_id, energy=0.812, instrumentalness=1.57e-05, valence=0.4, key=-1, loudness=-5.883,
+                         tempo=118.211, duration_ms=215_000)
+
+
+def create_strategy():
+    return StrategyConfig(id="focus", name="Focus", description="Keeps the focus.", is_active=False,
+                          parameters={"skip_if": {"all": [{"field": "energy", "op": ">", "value": 0.7}]}})
+
+
+class TestAudioFeaturesCodec:
+
+    def test_round_trip_keeps_missing_fields(self):
+        features = create_features()
+        encoded = AudioFeaturesCodec().encode(features)
+
+        assert len(encoded) == 83
+        assert AudioFeaturesCodec().decode(features.id, encoded) == features
+
+    def test_reads_legacy_text_values(self):
+        features = create_features()
+
+        assert AudioFeaturesCodec().decode(features.id, encode_features(features).encode()) == features
+
+    def test_text_writes_for_mixed_fleets(self):
+        features = create_features()
+
+        assert AudioFeaturesCodec(binary=False).encode(features) == encode_features(features).encode()
+
+    def test_unknown_binary_version_is_rejected(self):
+        with pytest.raises(ValueError, match="Unsupported audio features encoding version: 9"):
+            AudioFeaturesCodec().decode("track_1", bytes((MAGIC, 9)))
+
+
+class TestStrategyConfigCodec:
+
+    def test_round_trip(self):
+        strategy = create_strategy()
+        encoded = StrategyConfigCodec().encode(strategy)
+
+        assert len(encoded) < len(strategy.model_dump_json())
+        assert StrategyConfigCodec().decode(strategy.id, encoded) == strategy
+
+    def test_reads_legacy_json(self):
+        strategy = create_strategy()
+        encoded = StrategyConfigCodec(binary=False).encode(strategy)
+
+        assert encoded == strategy.model_dump_json().encode()
+        assert StrategyConfigCodec().decode(strategy.id, encoded) == strategy
+
+    def test_integers_beyond_msgpack_fall_back_to_json(self):
+        strategy = StrategyConfig(id="focus", name="Focus", description="", parameters={"min_tempo": 10**20})
+        encoded = StrategyConfigCodec().encode(strategy)
+
+        assert encoded == strategy.model_dump_json().encode()
+        assert StrategyConfigCodec().decode(strategy.id, encoded) == strategy
@@ -0,0 +1,76 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models.strategy import StrategyConfig
+from app.services.decision_cache import DecisionCache, decision_fingerprint
+from app.services.engine import SyncStreamEngine
+from app.services.spotify.mock import MockSpotifyService, mock_track
+from app.strategies.base import StrategyAction
+from app.strategies.strategy_factory import StrategyFactory
+from tests.unit.helpers import StaticResolver, playing
+
+NOISE = "mock_id_noise"
+
+
+@pytest.mark.asyncio
+class TestDecisionCache:
+
+    async def test_local_tier_lru(self):
+        cache = DecisionCache(max_entries=2, use_redis=False)
+        for track_id in ("a", "b", "c"):
+            await cache.put(track_id, "fp", StrategyAction.KEEP)
+
+        assert await cache.get("a", "fp", "focus") is None
+        assert await cache.get("c", "fp", "focus") == StrategyAction.KEEP
+        assert cache.stats.evictions == 1
+        assert cache.stats.of("focus").hit_rate == 0.5
+
+    async def test_verdicts_are_scoped_to_the_fingerprint(self):
+        cache = DecisionCache(use_redis=False)
+        await cache.put("a", "fp_1", StrategyAction.SKIP)
+
+        assert await cache.get("a", "fp_1", "focus") == StrategyAction.SKIP
+        assert await cache.get("a", "fp_2", "focus") is None
+
+    async def test_chain_fingerprint_follows_members(self):
+        focus = StrategyConfig(id="focus", name="Focus", description="", parameters={"energy": 0.5})
+        energy = StrategyConfig(id="energy", name="Energy", description="", parameters={})
+        chain = StrategyConfig(id="deep", name="Deep", description="", parameters={"chain": ["focus", "energy"]})
+        tuned = focus.model_copy(update={"parameters": {"energy": 0.4}})
+
+        fingerprint = decision_fingerprint(chain, StrategyFactory.make_chain([focus, energy]))
+
+        assert fingerprint == decision_fingerprint(chain, StrategyFactory.make_chain([energy, focus]))
+        assert fingerprint != decision_fingerprint(chain, StrategyFactory.make_chain([tuned, energy]))
+
+    async def test_engine_skips_features_fetch_and_evaluation_on_hit(self):
+        spotify = MockSpotifyService()
+        spotify.get_current_playback = AsyncMock(side_effect=lambda: playing(mock_track(NOISE, is_focus=False)))
+        spotify.get_audio_features = AsyncMock(wraps=spotify.get_audio_features)
+        resolver = StaticResolver()
+        resolver.strategy = AsyncMock(wraps=resolver.strategy)
+        engine = SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), strategy_resolver=resolver,
+                                  decision_cache=DecisionCache(use_redis=False))
+
+        await engine.apply_strategy()
+        await engine.apply_strategy()
+
+        assert engine.last_action == StrategyAction.SKIP
+        spotify.get_audio_features.assert_called_once_with(NOISE)
+        resolver.strategy.evaluate.assert_called_once()
+        assert engine.decision_cache.stats.of("focus").local_hits == 1
+
+    async def test_undecided_tracks_are_not_cached(self):
+        spotify = MockSpotifyService()
+        spotify.get_current_playback = AsyncMock(side_effect=lambda: playing(mock_track(NOISE, is_focus=False)))
+        spotify.get_audio_features = AsyncMock(return_value=None)
+        engine = SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), strategy_resolver=StaticResolver(),
+                                  decision_cache=DecisionCache(use_redis=False))
+
+        await engine.apply_strategy()
+        await engine.apply_strategy()
+
+        assert engine.last_action is None
+        assert spotify.get_audio_features.await_count == 2
+        assert engine.decision_cache.stats.of("focus").misses == 2
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.engine import SyncStreamEngine
+from app.services.pipeline import EnginePipeline
+from app.services.spotify.mock import MockSpotifyService
+from tests.unit.helpers import StaticResolver
+
+
+def make_engines(count: int, latency: float) -> list[SyncStreamEngine]:
+    spotify = MockSpotifyService(latency=latency)
+    return [SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), strategy_resolver=StaticResolver())
+            for _ in range(count)]
+
+
+async def run_ticks(pipeline: EnginePipeline, engines: list[SyncStreamEngine]) -> float:
+    task = asyncio.create_task(pipeline.run())
+    started = time.perf_counter()
+    await asyncio.gather(*(pipeline.run_tick(engine) for engine in engines))
+    elapsed = time.perf_counter() - started
+    pipeline.stop()
+    await task
+    return elapsed
+
+
+@pytest.mark.asyncio
+class TestEnginePipeline:
+
+    async def test_ticks_go_through_every_needed_stage(self):
+        engines = make_engines(20, latency=0.0)
+        pipeline = EnginePipeline(concurrency=2)
+
+        await run_ticks(pipeline, engines)
+
+        playing = sum(engine.current_playback is not None for engine in engines)
+        assert pipeline.ticks == 20
+        assert pipeline.stage("poll_playback").stats.processed == 20
+        assert pipeline.stage("act").stats.processed == playing
+        assert all(engine.last_action is not None for engine in engines if engine.current_playback)
+
+    async def test_throughput_scales_with_stage_concurrency(self):
+        sequential = await run_ticks(EnginePipeline(concurrency=1), make_engines(40, latency=0.01))
+        concurrent = await run_ticks(EnginePipeline(concurrency=8), make_engines(40, latency=0.01))
+
+        assert sequential / concurrent > 3
+
+    async def test_full_queues_hold_back_upstream_stages(self):
+        engines = make_engines(30, latency=0.0)
+        features = engines[0].spotify.get_audio_features
+
+        async def slow_features(track_id):
+            await asyncio.sleep(0.01)
+            return await features(track_id)
+
+        engines[0].spotify.get_audio_features = slow_features
+        pipeline = EnginePipeline(concurrency={"fetch_features": 1}, queue_size=2)
+
+        await run_ticks(pipeline, engines)
+
+        assert pipeline.stage("fetch_features").stats.max_depth == 2
+        assert all(stage.stats.max_depth <= 2 for stage in pipeline.stages)
+        assert pipeline.stage("fetch_features").stats.avg_wait > pipeline.stage("decide").stats.avg_wait
+
+    async def test_step_errors_reach_the_caller(self):
+        engine = make_engines(1, latency=0.0)[0]
+        engine.spotify.get_current_playback = AsyncMock(side_effect=RuntimeError("Spotify API Down"))
+        pipeline = EnginePipeline()
+        task = asyncio.create_task(pipeline.run())
+
+        with pytest.raises(RuntimeError, match="Spotify API Down"):
+            await pipeline.run_tick(engine)
+
+        pipeline.stop()
+        await task
+        assert pipeline.stage("poll_playback").stats.errors == 1
+
+    async def test_ticks_after_stop_are_rejected(self):
+        pipeline = EnginePipeline()
+        task = asyncio.create_task(pipeline.run())
+        pipeline.stop()
+        await task
+
+        with pytest.raises(RuntimeError, match="stopped"):
+            await pipeline.run_tick(make_engines(1, latency=0.0)[0])
+
+    async def test_cancelling_the_pipeline_fails_unfinished_ticks(self):
+        engines = make_engines(5, latency=0.0)
+        blocked = asyncio.Event()
+        for engine in engines:
+            engine.spotify.get_current_playback = AsyncMock(side_effect=blocked.wait)
+        pipeline = EnginePipeline(queue_size=2)
+        task = asyncio.create_task(pipeline.run())
+        ticks = [asyncio.create_task(pipeline.run_tick(engine)) for engine in engines]
+        await asyncio.sleep(0.01)  # One tick in the stage, two queued, two waiting for room
+
+        task.cancel()
+        results = await asyncio.wait_for(asyncio.gather(*ticks, return_exceptions=True), 1)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,89 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models.spotify import AudioFeatures
+from app.services.codec import decode_features, encode_features
+from app.services.spotify.cache import CachedSpotifyService
+
+
+def create_features(track_id: str = "track_1"):
+    return AudioFeatures(id=track_id, energy=0.3, instrumentalness=0.85, valence=0.4, tempo=110.0, key=5, loudness=-12.5)
+
+@pytest.fixture
+def spotify():
+    spotify = AsyncMock()
+    spotify.get_audio_features.side_effect = lambda track_id: None if track_id == "podcast" else create_features(track_id)
+    return spotify
+
+def test_compact_encoding_round_trip():
+    features = create_features()
+    encoded = encode_features(features)
+    assert len(encoded) < len(features.model_dump_json()) / 2
+    assert decode_features(features.id, encoded) == features
+
+@pytest.mark.asyncio
+class TestCachedSpotifyService:
+
+    async def test_repeated_lookups_hit_local_cache(self, spotify):
+        cached = CachedSpotifyService(spotify, max_entries=10, use_redis=False)
+        for _ in range(5):
+            features = await cached.get_audio_features("track_1")
+
+        assert features.id == "track_1"
+        spotify.get_audio_features.assert_called_once_with("track_1")
+        assert cached.stats.misses == 1
+        assert cached.stats.local_hits == 4
+
+    async def test_missing_features_are_cached_negatively(self, spotify):
+        cached = CachedSpotifyService(spotify, max_entries=10, use_redis=False)
+        assert await cached.get_audio_features("podcast") is None
+        assert await cached.get_audio_features("podcast") is None
+
+        spotify.get_audio_features.assert_called_once()
+        assert cached.stats.negative_hits == 1
+
+    async def test_local_negative_entries_expire(self, spotify):
+        now = [0.0]
+        cached = CachedSpotifyService(spotify, max_entries=10, use_redis=False, negative_ttl=60, clock=lambda: now[0])
+        await cached.get_audio_features("podcast")
+        now[0] = 59.0
+        await cached.get_audio_features("podcast")
+        assert spotify.get_audio_features.call_count == 1
+
+        # Features published later are picked up once the negative entry expires
+        spotify.get_audio_features.side_effect = create_features
+        now[0] = 61.0
+        assert (await cached.get_audio_features("podcast")).id == "podcast"
+        assert (await cached.get_audio_features_batch(["podcast"]))["podcast"].id == "podcast"
+        assert spotify.get_audio_features.call_count == 2
+
+    async def test_least_recently_used_entry_is_evicted(self, spotify):
+        cached = CachedSpotifyService(spotify, max_entries=2, use_redis=False)
+        await cached.get_audio_features("a")
+        await cached.get_audio_features("b")
+        await cached.get_audio_features("a")  # "b" becomes the least recently used
+        await cached.get_audio_features("c")
+
+        assert cached.stats.evictions == 1
+        await cached.get_audio_features("a")
+        assert cached.stats.misses == 3
+        await cached.get_audio_features("b")
+        assert cached.stats.misses == 4
+
+    async def test_other_calls_are_delegated(self, spotify):
+        cached = CachedSpotifyService(spotify, use_redis=False)
+        spotify.skip_next.return_value = True
+        assert await cached.skip_next() is True
+        await cached.apply_refresh_token()
+        spotify.apply_refresh_token.assert_called_once()
+
+    async def test_batch_fetches_only_uncached_ids(self, spotify):
+        spotify.get_audio_features_batch.side_effect = lambda ids: {track_id: create_features(track_id) for track_id in ids}
+        cached = CachedSpotifyService(spotify, use_redis=False)
+        await cached.get_audio_features("a")
+
+        results = await cached.get_audio_features_batch(["a", "b", "c", "b"])
+
+        assert list(results) == ["a", "b", "c"]
+        spotify.get_audio_features_batch.assert_called_once_with(["b", "c"])
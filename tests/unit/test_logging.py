@@ -0,0 +1,99 @@
+import io
+import threading
+
+import structlog
+
+from app.core.logging import CALLSITE_PARAMETERS, CachedCallsiteAdder, EventSampler, QueueLogWriter
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def passed(sampler: EventSampler, event: str, level: str = "info") -> dict | None:
+    try:
+        return sampler(None, level, {"event": event})
+    except structlog.DropEvent:
+        return None
+
+
+class TestEventSampler:
+
+    def test_events_are_rate_limited_per_event_name(self):
+        clock = ManualClock()
+        sampler = EventSampler(rate=2, clock=clock)
+
+        skips = [passed(sampler, "Policy violated, skipping track") for _ in range(5)]
+        other = passed(sampler, "No active playback found or playback is paused")
+        clock.now += 1
+        resumed = passed(sampler, "Policy violated, skipping track")
+
+        assert sum(event is not None for event in skips) == 2
+        assert other is not None
+        assert resumed["sampled_out"] == 3
+        assert sampler.dropped == 3
+
+    def test_warnings_are_never_sampled(self):
+        sampler = EventSampler(rate=1, clock=ManualClock())
+
+        assert all(passed(sampler, "Missing audio features", level) for level in ("warning", "warn", "error") * 10)
+
+
+class TestCachedCallsiteAdder:
+
+    def test_matches_structlog_callsite_parameters(self):
+        adder = structlog.processors.CallsiteParameterAdder(CALLSITE_PARAMETERS)
+        expected, actual = adder(None, "info", {}), CachedCallsiteAdder()(None, "info", {})
+
+        assert actual == expected
+
+    def test_call_sites_are_resolved_once(self):
+        cached = CachedCallsiteAdder()
+        for _ in range(3):
+            cached(None, "info", {})
+
+        assert len(cached._cache) == 1
+
+
+class TestQueueLogWriter:
+
+    def test_lines_are_written_in_order_on_close(self):
+        stream = io.StringIO()
+        writer = QueueLogWriter(stream)
+        for i in range(500):
+            writer.write(f"line {i}")
+        writer.close()
+
+        assert stream.getvalue().splitlines() == [f"line {i}" for i in range(500)]
+
+    def test_full_queue_drops_and_reports(self):
+        class BlockedStream(io.StringIO):
+            def __init__(self):
+                super().__init__()
+                self.release = threading.Event()
+
+            def write(self, text):
+                self.release.wait()
+                return super().write(text)
+
+        stream = BlockedStream()
+        writer = QueueLogWriter(stream, max_size=10, batch_size=1)
+        for i in range(50):
+            writer.write(f"line {i}")
+        stream.release.set()
+        writer.close()
+
+        assert writer.dropped > 0
+        assert "Log lines dropped" in stream.getvalue()
+
+    def test_lines_after_close_are_written_directly(self):
+        stream = io.StringIO()
+        writer = QueueLogWriter(stream)
+        writer.close()
+        writer.write("after close")
+
+        assert stream.getvalue() == "after close\n"
@@ -0,0 +1,119 @@
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.models.spotify import PlaybackState, SpotifyQueue, SpotifyTrack
+from app.services.engine import SyncStreamEngine
+from app.services.lookahead import QueueLookahead
+from app.services.spotify.mock import MockSpotifyService, SimulatedPlayer, mock_features, mock_track
+from app.services.spotify.prod import ProdSpotifyService
+from app.strategies.implementations.focus_guard import FocusGuardStrategy
+from tests.unit.helpers import StaticResolver
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def episode_queue_spotify(current: SpotifyTrack, queue: SpotifyQueue) -> AsyncMock:
+    """Plays `current` with `queue` queued; after the first skip an episode plays, which the queue does not show"""
+    spotify = AsyncMock()
+    spotify.get_current_playback.return_value = PlaybackState(is_playing=True, progress_ms=1000, item=current)
+    spotify.get_queue.side_effect = [queue, SpotifyQueue(currently_playing=None, queue=[])]
+    spotify.get_audio_features.side_effect = mock_features
+    spotify.get_audio_features_batch.side_effect = lambda track_ids: {track_id: mock_features(track_id)
+                                                                      for track_id in track_ids}
+    return spotify
+
+
+async def simulate(lookahead_depth: int, minutes: float = 30) -> tuple[SimulatedPlayer, SyncStreamEngine]:
+    clock = ManualClock()
+    player = SimulatedPlayer(duration_ms=(20000, 40000), seed=3, clock=clock)
+    spotify = MockSpotifyService(player)
+    engine = SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), poll_interval=5,
+                              strategy_resolver=StaticResolver(),
+                              lookahead=QueueLookahead(spotify, depth=lookahead_depth) if lookahead_depth else None)
+    while clock.now < minutes * 60:
+        await engine.apply_strategy()
+        clock.now += engine.next_poll_delay()
+    return player, engine
+
+
+def avg_rejected_audible(player: SimulatedPlayer) -> float:
+    rejected = [played.audible for played in player.history if not played.is_focus]
+    return sum(rejected) / len(rejected)
+
+
+@pytest.mark.asyncio
+class TestQueueLookahead:
+
+    async def test_rejected_tracks_are_barely_audible(self):
+        baseline, _ = await simulate(lookahead_depth=0)
+        player, engine = await simulate(lookahead_depth=5)
+
+        assert avg_rejected_audible(baseline) > 1.5
+        assert avg_rejected_audible(player) < 0.5
+        assert engine.skip_stats.chained > 0
+        assert engine.skip_stats.preemptive > 0
+        # Good tracks still play to the end
+        assert all(not played.skipped for played in player.history if played.is_focus)
+
+    async def test_strategy_change_drops_verdicts(self):
+        spotify = MockSpotifyService(SimulatedPlayer(seed=1))
+        lookahead = QueueLookahead(spotify, depth=5)
+        strategy = FocusGuardStrategy()
+        await lookahead.refresh(strategy)
+        queued = lookahead.upcoming[0]
+
+        assert lookahead.verdict(queued.id, strategy) is not None
+        assert lookahead.verdict(queued.id, FocusGuardStrategy()) is None
+
+    async def test_prod_queue_skips_episodes(self):
+        track = mock_track("t1", True).model_dump()
+        episode = {"id": "e1", "type": "episode", "name": "Podcast"}
+
+        def handler(request):
+            assert request.url.path == "/v1/me/player/queue"
+            return httpx.Response(200, json={"currently_playing": track, "queue": [episode, track]})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            service = ProdSpotifyService("id", "secret", "refresh", http_client=http_client)
+            service._get_access_token = AsyncMock(return_value="token")
+            queue = await service.get_queue()
+
+        assert queue.currently_playing.id == "t1"
+        assert [item and item.id for item in queue.queue] == [None, "t1"]
+
+    async def test_chain_stops_at_a_queued_episode(self):
+        bad, next_bad = mock_track("noise_1", False), mock_track("noise_2", False)
+        spotify = episode_queue_spotify(bad, SpotifyQueue(currently_playing=bad, queue=[None, next_bad]))
+        engine = SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), strategy_resolver=StaticResolver(),
+                                  lookahead=QueueLookahead(spotify, depth=5))
+        await engine.lookahead.refresh(engine.strategy_resolver.strategy)
+        assert engine.lookahead.rejected_after(bad.id) == 0
+
+        await engine.apply_strategy()
+
+        # The episode the user queued comes next, it must not be skipped along with the track
+        spotify.skip_next.assert_awaited_once()
+        assert engine.skip_stats.chained == 0
+
+    async def test_stale_snapshot_does_not_chain_skips(self):
+        bad, next_bad = mock_track("noise_1", False), mock_track("noise_2", False)
+        earlier = mock_track("focus_0", True)
+        spotify = episode_queue_spotify(bad, SpotifyQueue(currently_playing=earlier, queue=[bad, next_bad]))
+        engine = SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), strategy_resolver=StaticResolver(),
+                                  lookahead=QueueLookahead(spotify, depth=5))
+        await engine.lookahead.refresh(engine.strategy_resolver.strategy)
+        assert engine.lookahead.rejected_after(bad.id) == 1
+
+        await engine.apply_strategy()
+
+        # Read before `bad` started, the snapshot may no longer match the player queue
+        spotify.skip_next.assert_awaited_once()
+        assert engine.skip_stats.chained == 0
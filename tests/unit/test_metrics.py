@@ -0,0 +1,75 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.metrics import ENGINE_STEP_SECONDS, STRATEGY_DECISIONS_TOTAL, MetricsRegistry, metrics
+from app.services.engine import SyncStreamEngine
+from app.services.spotify.mock import MockSpotifyService, mock_track
+from tests.unit.helpers import StaticResolver, playing
+
+
+class TestMetricsRegistry:
+
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("request_seconds", "Request latency", ["endpoint"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.labels("/me/player").observe(value)
+
+        assert registry.render().splitlines() == [
+            "# HELP request_seconds Request latency",
+            "# TYPE request_seconds histogram",
+            'request_seconds_bucket{endpoint="/me/player",le="0.1"} 2',
+            'request_seconds_bucket{endpoint="/me/player",le="1"} 3',
+            'request_seconds_bucket{endpoint="/me/player",le="+Inf"} 4',
+            'request_seconds_sum{endpoint="/me/player"} 3.65',
+            'request_seconds_count{endpoint="/me/player"} 4',
+        ]
+
+    def test_counter_labels_are_escaped(self):
+        registry = MetricsRegistry()
+        decisions = registry.counter("decisions_total", "Decisions", ["strategy"])
+        decisions.labels('say "hi"').inc()
+        decisions.labels('say "hi"').inc(2)
+
+        assert 'decisions_total{strategy="say \\"hi\\""} 3' in registry.render()
+
+    def test_label_count_is_checked(self):
+        with pytest.raises(ValueError):
+            MetricsRegistry().counter("decisions_total", "Decisions", ["strategy", "action"]).labels("focus")
+
+    def test_names_are_unique(self):
+        registry = MetricsRegistry()
+        registry.counter("ticks_total", "Ticks")
+        with pytest.raises(ValueError):
+            registry.histogram("ticks_total", "Ticks")
+
+
+@pytest.mark.asyncio
+class TestEngineInstrumentation:
+
+    async def test_tick_records_steps_and_decision(self):
+        spotify = MockSpotifyService()
+        spotify.get_current_playback = AsyncMock(return_value=playing(mock_track("mock_id_noise", is_focus=False)))
+        engine = SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), strategy_resolver=StaticResolver())
+        skips = STRATEGY_DECISIONS_TOTAL.labels("focus", "skip").value
+        decided = ENGINE_STEP_SECONDS.labels("decide").count
+
+        await engine.apply_strategy()
+
+        assert STRATEGY_DECISIONS_TOTAL.labels("focus", "skip").value == skips + 1
+        assert ENGINE_STEP_SECONDS.labels("decide").count == decided + 1
+
+    async def test_disabled_metrics_record_nothing(self):
+        spotify = MockSpotifyService()
+        spotify.get_current_playback = AsyncMock(return_value=playing(mock_track("mock_id_noise", is_focus=False)))
+        engine = SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), strategy_resolver=StaticResolver())
+        skips = STRATEGY_DECISIONS_TOTAL.labels("focus", "skip").value
+        decided = ENGINE_STEP_SECONDS.labels("decide").count
+
+        with patch.object(metrics, "enabled", False):
+            await engine.apply_strategy()
+
+        assert engine.last_action is not None
+        assert STRATEGY_DECISIONS_TOTAL.labels("focus", "skip").value == skips
+        assert ENGINE_STEP_SECONDS.labels("decide").count == decided
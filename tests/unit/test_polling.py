@@ -0,0 +1,61 @@
+import pytest
+
+from app.models.spotify import PlaybackState, SpotifyTrack
+from app.services.polling import AdaptivePollScheduler, FixedPollScheduler
+from app.strategies.base import StrategyAction
+
+
+def create_playback(progress_ms=45000, duration_ms=210000, is_playing=True):
+    return PlaybackState(
+        is_playing=is_playing,
+        progress_ms=progress_ms,
+        item=SpotifyTrack(
+            id="test_track",
+            name="Test Track",
+            uri="spotify:track:test_track",
+            duration_ms=duration_ms,
+            explicit=False,
+            popularity=50,
+            artists=[],
+        )
+    )
+
+@pytest.fixture
+def scheduler():
+    return AdaptivePollScheduler(base_interval=5, min_interval=1, max_interval=60, max_idle_interval=40, boundary_margin=0.5)
+
+class TestFixedPollScheduler:
+    def test_always_returns_interval(self):
+        scheduler = FixedPollScheduler(interval=5)
+        assert scheduler.next_delay(None, None) == 5
+        assert scheduler.next_delay(create_playback(), StrategyAction.KEEP) == 5
+        assert scheduler.polls_avoided == 0
+
+class TestAdaptivePollScheduler:
+    @pytest.mark.parametrize(
+        "progress_ms,duration_ms,expected_delay", [
+            (200000, 210000, 10.5),   # Wake up just after the track ends
+            (209900, 210000, 1),      # Never poll faster than min_interval
+            (0, 600000, 60),          # Long tracks are capped by max_interval
+            (None, 210000, 5),        # Unknown progress falls back to the base interval
+        ])
+    def test_playing_track_boundary(self, scheduler, progress_ms, duration_ms, expected_delay):
+        playback = create_playback(progress_ms=progress_ms, duration_ms=duration_ms)
+        assert scheduler.next_delay(playback, StrategyAction.KEEP) == pytest.approx(expected_delay)
+
+    def test_fast_poll_after_skip(self, scheduler):
+        assert scheduler.next_delay(create_playback(), StrategyAction.SKIP) == 1
+
+    def test_idle_exponential_backoff(self, scheduler):
+        delays = [scheduler.next_delay(None, None) for _ in range(5)]
+        assert delays == [5, 10, 20, 40, 40]
+
+        # Playback resumes: the back-off is reset
+        scheduler.next_delay(create_playback(), StrategyAction.KEEP)
+        assert scheduler.next_delay(create_playback(is_playing=False), None) == 5
+
+    def test_polls_avoided(self, scheduler):
+        # A full 4 minute track at a 5s fixed interval would take 48 polls
+        for _ in range(4):
+            scheduler.next_delay(create_playback(progress_ms=0, duration_ms=240000), StrategyAction.KEEP)
+        assert scheduler.polls_avoided == 44
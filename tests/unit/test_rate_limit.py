@@ -0,0 +1,89 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.services.spotify.prod import ProdSpotifyService
+from app.services.spotify.rate_limit import LocalTokenBucket, RequestPriority, SpotifyRateLimiter
+
+
+def create_service(handler, rate_limiter=None, max_retries=3) -> tuple[ProdSpotifyService, httpx.AsyncClient]:
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service = ProdSpotifyService("id", "secret", "refresh", http_client=http_client,
+                                 rate_limiter=rate_limiter, max_retries=max_retries)
+    service._get_access_token = AsyncMock(return_value="token")
+    return service, http_client
+
+
+@pytest.mark.asyncio
+class TestSpotifyRateLimiter:
+
+    async def test_higher_priority_requests_jump_the_queue(self):
+        limiter = SpotifyRateLimiter(LocalTokenBucket(rate=200, burst=1))
+        served = []
+
+        async def request(name, priority):
+            await limiter.acquire(priority)
+            served.append(name)
+
+        tasks = [asyncio.create_task(request(f"bulk_{i}", RequestPriority.BULK)) for i in range(10)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(request("playback", RequestPriority.PLAYBACK)),
+                  asyncio.create_task(request("skip", RequestPriority.SKIP))]
+        await asyncio.gather(*tasks)
+
+        # The first bulk request took the only burst token, the skip goes next
+        assert served[:3] == ["bulk_0", "skip", "playback"]
+        assert limiter.stats.avg_queue_delay(RequestPriority.SKIP) < limiter.stats.avg_queue_delay(RequestPriority.BULK)
+
+    async def test_throughput_is_capped_by_the_bucket(self):
+        limiter = SpotifyRateLimiter(LocalTokenBucket(rate=100, burst=5))
+
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(RequestPriority.BULK) for _ in range(25)))
+
+        # 5 from the burst, the other 20 at 100/s
+        assert time.monotonic() - started >= 0.19
+
+    async def test_retry_after_holds_back_every_request(self):
+        limiter = SpotifyRateLimiter(LocalTokenBucket(rate=1000, burst=100))
+        await limiter.report_throttled(0.1)
+
+        started = time.monotonic()
+        await asyncio.gather(limiter.acquire(RequestPriority.SKIP), limiter.acquire(RequestPriority.BULK))
+
+        assert time.monotonic() - started >= 0.09
+        assert limiter.stats.throttled == 1
+
+
+@pytest.mark.asyncio
+class TestRateLimitedRequests:
+
+    async def test_throttled_request_is_retried(self):
+        responses = iter([httpx.Response(429, headers={"Retry-After": "0.01"}), httpx.Response(204)])
+        limiter = SpotifyRateLimiter(LocalTokenBucket(rate=1000, burst=10))
+        service, http_client = create_service(lambda request: next(responses), rate_limiter=limiter)
+        async with http_client:
+            assert await service.skip_next() is True
+
+        assert limiter.stats.throttled == 1
+        assert limiter.stats.acquired[RequestPriority.SKIP] == 2
+
+    async def test_retry_budget_is_bounded(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(429, headers={"Retry-After": "0"})
+
+        limiter = SpotifyRateLimiter(LocalTokenBucket(rate=1000, burst=10))
+        service, http_client = create_service(handler, rate_limiter=limiter, max_retries=2)
+        async with http_client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await service.skip_next()
+
+        assert len(calls) == 3
+        assert limiter.stats.throttled == 3
+        assert limiter.stats.retries_exhausted == 1
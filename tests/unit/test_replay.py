@@ -0,0 +1,114 @@
+import io
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.clock import VirtualClock
+from app.services.engine import SyncStreamEngine
+from app.services.lookahead import QueueLookahead
+from app.services.polling import AdaptivePollScheduler
+from app.services.spotify.mock import MockSpotifyService, SimulatedPlayer
+from app.services.spotify.recording import Recording, RecordingSpotifyService, RecordingWriter
+from app.services.spotify.replay import ReplaySpotifyService
+from tests.unit.helpers import StaticResolver
+
+
+async def record_session(path, minutes: float, poll_interval: float = 5.0) -> SimulatedPlayer:
+    """Records a listener polled by the engine, which skips the noise tracks"""
+    clock = VirtualClock(start=1_700_000_000.0)
+    player = SimulatedPlayer(duration_ms=(20000, 40000), seed=7, clock=clock)
+    writer = RecordingWriter(path, user_id="listener", clock=clock)
+    spotify = RecordingSpotifyService(MockSpotifyService(player), writer)
+    engine = SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), poll_interval=poll_interval,
+                              strategy_resolver=StaticResolver(), clock=clock, sleep=clock.sleep)
+    await clock.run([engine.run()], until=clock() + minutes * 60)
+    writer.close()
+    return player
+
+
+@pytest.mark.asyncio
+class TestVirtualClock:
+
+    async def test_sleepers_wake_in_due_order_without_waiting(self):
+        clock = VirtualClock()
+        log = []
+
+        async def poller(name: str, period: float):
+            while True:
+                log.append((clock(), name))
+                await clock.sleep(period)
+
+        await clock.run([poller("fast", 2), poller("slow", 3)], until=6)
+
+        assert log == [(0, "fast"), (0, "slow"), (2, "fast"), (3, "slow"), (4, "fast"), (6, "slow"), (6, "fast")]
+        assert clock() == 6
+
+    async def test_task_errors_are_raised(self):
+        clock = VirtualClock()
+
+        async def failing():
+            await clock.sleep(1)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await clock.run([failing()], until=10)
+        assert clock() == 1
+
+    async def test_engine_stop_interrupts_the_real_sleep(self):
+        engine = SyncStreamEngine(spotify=MockSpotifyService(), strategy_manager=AsyncMock(), poll_interval=3600,
+                                  strategy_resolver=StaticResolver())
+        engine.stop()
+
+        await engine._sleep_until_stopped(3600)  # Returns right away instead of in an hour
+
+
+@pytest.mark.asyncio
+class TestRecordingReplay:
+
+    async def test_recording_round_trip(self, tmp_path):
+        path = tmp_path / "listener.jsonl"
+        player = await record_session(path, minutes=10)
+        recording = Recording.load(path)
+
+        played = [played.track_id for played in player.history]
+        assert recording.user_id == "listener"
+        assert [track_id for track_id, _ in recording.timeline()][:len(played)] == played
+        assert all(recording.features[track_id] is not None for track_id in played)
+        assert len(recording.skips) == sum(played.skipped for played in player.history)
+
+    async def test_skipped_tracks_are_restored_to_full_length(self):
+        lines = [
+            '["h",1,"u",0]',
+            '["t","a","A",200000,false,50,[["x","X"]]]',
+            '["t","b","B",180000,false,50,[]]',
+            '["t","c","C",180000,false,50,[]]',
+            '["p",1000,"a",1000,true]',
+            '["s",1500]',              # The engine skipped "a"
+            '["p",6000,"b",4000,true]',
+            '["p",60000,"b",58000,true]',
+            '["p",70000,"c",1000,true]',   # The listener skipped "b" after ~67s
+            '["p",400000,null,null,false]',
+        ]
+        recording = Recording.parse(io.StringIO("\n".join(lines)))
+
+        assert recording.timeline() == [("a", 200.0), ("b", 67.0), ("c", 180.0)]
+
+    async def test_replay_on_virtual_clock_is_fast_and_deterministic(self, tmp_path):
+        path = tmp_path / "listener.jsonl"
+        await record_session(path, minutes=60)
+        recording = Recording.load(path)
+
+        async def replay() -> tuple[dict, float]:
+            clock = VirtualClock()
+            spotify = ReplaySpotifyService(recording, clock)
+            engine = SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), poll_interval=5,
+                                      poll_scheduler=AdaptivePollScheduler(5), strategy_resolver=StaticResolver(),
+                                      lookahead=QueueLookahead(spotify), clock=clock, sleep=clock.sleep)
+            await clock.run([engine.run()], until=3600)
+            return dict(spotify.calls), engine.skip_stats.avg_audible_ms
+
+        first, second = await replay(), await replay()
+
+        assert first == second
+        assert first[0]["playback"] < 3600 / 5  # Fewer polls than the recorded fixed interval
+        assert first[1] < 1000
@@ -0,0 +1,79 @@
+import pytest
+from pydantic import ValidationError
+
+from app.models.spotify import SpotifyTrack
+from app.models.strategy import StrategyConfig
+from app.strategies.base import StrategyAction
+from app.strategies.batch import FeatureMatrix
+from app.strategies.implementations.focus_guard import FocusGuardStrategy
+from app.strategies.implementations.rule_based import RuleStrategy
+from app.strategies.rules import parse_rule
+from app.strategies.strategy_factory import StrategyFactory
+from tests.unit.helpers import create_tracks
+
+FOCUS_RULE = {"keep_if": {"all": [
+    {"field": "instrumentalness", "op": ">=", "value": 0.75},
+    {"field": "energy", "op": "<=", "value": 0.5},
+]}}
+DEEP_WORK_RULE = {"skip_if": {"any": [
+    {"field": "explicit", "op": "==", "value": True},
+    {"not": {"all": [
+        {"field": "instrumentalness", "op": ">", "value": 0.5},
+        {"field": "tempo", "op": "between", "value": [90, 120]},
+    ]}},
+]}}
+
+
+def create_config(parameters: dict) -> StrategyConfig:
+    return StrategyConfig(id="deep_work", name="Deep Work", description="", parameters=parameters)
+
+
+def with_explicit(tracks: list[SpotifyTrack]) -> list[SpotifyTrack]:
+    return [track.model_copy(update={"explicit": i % 3 == 0}) for i, track in enumerate(tracks)]
+
+
+@pytest.mark.asyncio
+class TestRuleStrategy:
+
+    async def test_focus_rule_matches_hand_written_strategy(self):
+        tracks = create_tracks(500)
+        rule_strategy = StrategyFactory.make(create_config(FOCUS_RULE))
+        focus_guard = FocusGuardStrategy(instrumental_threshold=0.75, energy_threshold=0.5)
+
+        for track in tracks:
+            assert await rule_strategy.evaluate(track) == await focus_guard.evaluate(track)
+        matrix = FeatureMatrix.from_tracks(tracks)
+        assert rule_strategy.evaluate_batch(matrix).tolist() == focus_guard.evaluate_batch(matrix).tolist()
+
+    async def test_composite_rule_per_track_and_batch_agree(self):
+        tracks = with_explicit(create_tracks(500))
+        strategy = RuleStrategy(parse_rule(DEEP_WORK_RULE))
+
+        expected = [await strategy.evaluate(track) == StrategyAction.SKIP for track in tracks]
+        assert strategy.evaluate_batch(FeatureMatrix.from_tracks(tracks)).tolist() == expected
+        # Tracks without a tempo never satisfy the 'between', so the 'not' rejects them
+        no_tempo = next(track for track in tracks if track.features and track.features.tempo is None)
+        assert await strategy.evaluate(no_tempo) == StrategyAction.SKIP
+
+    async def test_metadata_only_rule_needs_no_features(self):
+        strategy = RuleStrategy(parse_rule({"skip_if": {"field": "explicit", "op": "==", "value": True}}))
+        track = with_explicit(create_tracks(1))[0].model_copy(update={"features": None})
+
+        assert strategy.needs_features is False
+        assert await strategy.evaluate(track) == StrategyAction.SKIP
+        assert RuleStrategy(parse_rule(DEEP_WORK_RULE)).needs_features is True
+
+    @pytest.mark.parametrize("parameters", [
+        {"skip_if": {"field": "lyrics", "op": "==", "value": 1}},
+        {"skip_if": {"field": "energy", "op": "~", "value": 1}},
+        {"skip_if": {"field": "energy", "op": ">", "value": "high"}},
+        {"skip_if": {"field": "tempo", "op": "between", "value": [120, 90]}},
+        {"skip_if": {"field": "tempo", "op": ">", "value": 10**400}},
+        {"skip_if": {"field": "tempo", "op": "in", "value": [120, -10**400]}},
+        {"skip_if": {"field": "explicit", "op": ">", "value": True}},
+        {"skip_if": {"all": []}},
+        {"skip_if": {"field": "energy", "op": ">", "value": 0.5}, "keep_if": {"not": {"field": "energy", "op": ">", "value": 0.5}}},
+    ])
+    async def test_invalid_rules_are_rejected_on_upsert(self, parameters):
+        with pytest.raises(ValidationError):
+            create_config(parameters)
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.services.session_scheduler import SessionScheduler
+
+
+class FakeEngine:
+    """Minimal engine stand-in recording tick order and concurrency"""
+
+    def __init__(self, name: str, log: list, delay: float = 0.05, work: float = 0.0, probe=None):
+        self.name = name
+        self.log = log
+        self.delay = delay
+        self.work = work
+        self.probe = probe
+        self.poll_interval = delay
+
+    async def apply_strategy(self):
+        self.log.append(self.name)
+        if self.probe:
+            self.probe["current"] += 1
+            self.probe["peak"] = max(self.probe["peak"], self.probe["current"])
+        await asyncio.sleep(self.work)
+        if self.probe:
+            self.probe["current"] -= 1
+
+    def next_poll_delay(self) -> float:
+        return self.delay
+
+
+async def run_for(scheduler: SessionScheduler, seconds: float):
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(seconds)
+    scheduler.stop()
+    await task
+
+
+@pytest.mark.asyncio
+class TestSessionScheduler:
+
+    async def test_sessions_tick_in_due_order(self):
+        log = []
+        scheduler = SessionScheduler()
+        scheduler.add_session("late", FakeEngine("late", log, delay=10), delay=0.02)
+        scheduler.add_session("early", FakeEngine("early", log, delay=10), delay=0.0)
+
+        await run_for(scheduler, 0.1)
+
+        assert log == ["early", "late"]
+        assert scheduler.stats.ticks == 2
+
+    async def test_sessions_are_rescheduled_by_engine_delay(self):
+        log = []
+        scheduler = SessionScheduler()
+        scheduler.add_session("fast", FakeEngine("fast", log, delay=0.02))
+        scheduler.add_session("slow", FakeEngine("slow", log, delay=10))
+
+        await run_for(scheduler, 0.15)
+
+        assert log.count("slow") == 1
+        assert log.count("fast") >= 4
+
+    async def test_removed_session_stops_ticking(self):
+        log = []
+        scheduler = SessionScheduler()
+        scheduler.add_session("user", FakeEngine("user", log, delay=0.01))
+        scheduler.remove_session("user")
+
+        await run_for(scheduler, 0.05)
+
+        assert log == []
+        assert len(scheduler) == 0
+
+    async def test_concurrent_ticks_are_capped(self):
+        probe = {"current": 0, "peak": 0}
+        scheduler = SessionScheduler(max_concurrent_ticks=3)
+        for i in range(20):
+            scheduler.add_session(f"user_{i}", FakeEngine(f"user_{i}", [], delay=10, work=0.02, probe=probe))
+
+        await run_for(scheduler, 0.3)
+
+        assert scheduler.stats.ticks == 20
+        assert probe["peak"] == 3
+
+    async def test_duplicate_session_rejected(self):
+        scheduler = SessionScheduler()
+        scheduler.add_session("user", FakeEngine("user", []))
+        with pytest.raises(ValueError):
+            scheduler.add_session("user", FakeEngine("user", []))
+
+    async def test_readded_session_ticks_once(self):
+        probe = {"current": 0, "peak": 0}
+        log = []
+        scheduler = SessionScheduler()
+        scheduler.add_session("user", FakeEngine("user", log, delay=10))
+        scheduler.remove_session("user")
+        scheduler.add_session("user", FakeEngine("user", log, delay=10, work=0.02, probe=probe))
+
+        await run_for(scheduler, 0.1)
+
+        # The removed session's heap entry is stale, it must not tick the new one
+        assert log == ["user"]
+        assert probe["peak"] == 1
@@ -2,10 +2,12 @@ import pytest
 import asyncio
 
 from app.models.spotify import AudioFeatures, SpotifyTrack
+from app.models.strategy import StrategyConfig
 from app.strategies.base import StrategyAction
 from app.strategies.implementations.energy_floor import EnergyFloorStrategy
 from app.strategies.implementations.focus_guard import FocusGuardStrategy
 from app.strategies.implementations.vibe_shift import VibeShiftStrategy
+from app.strategies.strategy_factory import StrategyFactory
 
 
 @pytest.fixture
@@ -71,4 +73,14 @@ class TestVibeShftStrategy:
         strategy = VibeShiftStrategy(min_valence=0.7, max_valence=0.9)
         track = mock_track_factory(valence=valence)
         action = await strategy.evaluate(track)
-        assert action == expected_action
\ No newline at end of file
+        assert action == expected_action
+
+class TestStrategyFactory:
+    def test_compiled_strategy_is_reused_until_parameters_change(self):
+        config = StrategyConfig(id="energy", name="Energy Floor", description="", parameters={"energy_floor": 0.7})
+        renamed = config.model_copy(update={"name": "Renamed"})
+        changed = config.model_copy(update={"parameters": {"energy_floor": 0.9}})
+
+        assert StrategyFactory.get(config) is StrategyFactory.get(renamed)
+        assert StrategyFactory.get(changed) is not StrategyFactory.get(config)
+        assert StrategyFactory.get(changed).energy_floor == 0.9
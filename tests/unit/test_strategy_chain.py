@@ -0,0 +1,108 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.spotify import PlaybackState, SpotifyTrack
+from app.models.strategy import StrategyConfig
+from app.services.engine import SyncStreamEngine
+from app.strategies.base import StrategyAction
+from app.strategies.chain import StrategyChain
+from app.strategies.implementations.energy_floor import EnergyFloorStrategy
+from app.strategies.implementations.rule_based import RuleStrategy
+from app.strategies.rules import parse_rule
+from tests.unit.helpers import create_tracks
+
+NO_EXPLICIT = RuleStrategy(parse_rule({"skip_if": {"field": "explicit", "op": "==", "value": True}}))
+
+
+class SlowKeepAll:
+    """Needs features, costs a lot and never rejects anything"""
+
+    async def evaluate(self, track: SpotifyTrack) -> StrategyAction:
+        await asyncio.sleep(0.001)
+        return StrategyAction.KEEP
+
+
+class StubResolver:
+    def __init__(self, strategy):
+        self.strategy = strategy
+
+    async def resolve(self):
+        return StrategyConfig(id="stack", name="Stack", description="", parameters={}), self.strategy
+
+
+@pytest.mark.asyncio
+class TestStrategyChain:
+
+    async def test_metadata_rule_decides_before_features_are_fetched(self):
+        chain = StrategyChain([("energy", EnergyFloorStrategy(energy_floor=0.7)), ("no_explicit", NO_EXPLICIT)])
+        track = create_tracks(2)[1].model_copy(update={"explicit": True})
+        features, track.features = track.features, None
+        load_features = AsyncMock(return_value=features)
+
+        assert chain.order == ["no_explicit", "energy"]
+        assert await chain.decide(track, load_features) == StrategyAction.SKIP
+        load_features.assert_not_called()
+
+        track.explicit = False
+        await chain.decide(track, load_features)
+        load_features.assert_awaited_once()
+        assert chain.features_fetches == 1
+        assert chain.features_fetches_avoided == 1
+
+    async def test_cheap_selective_rules_move_to_the_front(self):
+        chain = StrategyChain([("slow", SlowKeepAll()), ("energy", EnergyFloorStrategy(energy_floor=0.7))],
+                              reorder_interval=10)
+        tracks = [track for track in create_tracks(100) if track.features][:40]
+
+        for track in tracks:
+            await chain.decide(track)
+
+        assert chain.order == ["energy", "slow"]
+        assert chain.reorders == 1
+        stats = chain.as_dict()["rules"]
+        assert stats["energy"]["evaluations"] == 40
+        assert stats["slow"]["evaluations"] < 40
+
+    async def test_engine_skips_features_fetch_when_metadata_rule_rejects(self):
+        track = create_tracks(2)[1].model_copy(update={"explicit": True, "features": None})
+        spotify = AsyncMock()
+        spotify.get_current_playback.return_value = PlaybackState(is_playing=True, progress_ms=0, item=track)
+        chain = StrategyChain([("energy", EnergyFloorStrategy()), ("no_explicit", NO_EXPLICIT)])
+        engine = SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), strategy_resolver=StubResolver(chain))
+
+        await engine.apply_strategy()
+
+        assert engine.last_action == StrategyAction.SKIP
+        spotify.get_audio_features.assert_not_called()
+        spotify.skip_next.assert_awaited_once()
+
+    async def test_undecided_without_features_unless_a_rule_rejects(self):
+        chain = StrategyChain([("energy", EnergyFloorStrategy()), ("no_explicit", NO_EXPLICIT)])
+        track = create_tracks(2)[1].model_copy(update={"explicit": False, "features": None})
+
+        assert await chain.decide(track, AsyncMock(return_value=None)) is None
+        assert await chain.decide(track) is None
+        explicit = track.model_copy(update={"explicit": True})
+        assert await chain.decide(explicit, AsyncMock(return_value=None)) == StrategyAction.SKIP
+
+    async def test_engine_does_not_act_when_features_are_missing(self):
+        track = create_tracks(2)[1].model_copy(update={"explicit": False, "features": None})
+        spotify = AsyncMock()
+        spotify.get_current_playback.return_value = PlaybackState(is_playing=True, progress_ms=0, item=track)
+        spotify.get_audio_features.return_value = None
+        chain = StrategyChain([("energy", EnergyFloorStrategy()), ("no_explicit", NO_EXPLICIT)])
+        engine = SyncStreamEngine(spotify=spotify, strategy_manager=AsyncMock(), strategy_resolver=StubResolver(chain))
+
+        await engine.apply_strategy()
+
+        assert engine.last_action is None
+        spotify.get_audio_features.assert_awaited_once()
+        spotify.skip_next.assert_not_called()
+
+    @pytest.mark.parametrize("members", [[], ["a", "a"], ["a", ""], ["a", "stack"]])
+    async def test_invalid_chains_are_rejected(self, members):
+        with pytest.raises(ValidationError):
+            StrategyConfig(id="stack", name="Stack", description="", parameters={"chain": members})
@@ -0,0 +1,158 @@
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.core.clock import VirtualClock
+from app.services.engine import SyncStreamEngine
+from app.services.spotify.mock import MockSpotifyService
+from app.services.spotify.workload import FaultInjector, ListenerPool, SyntheticCatalog
+from tests.unit.helpers import StaticResolver
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return SyntheticCatalog(size=5000, seed=1)
+
+
+def find_play(pool: ListenerPool, listener: int, paused: bool) -> int:
+    """Play number of the listener's next play with (or without) a pause"""
+    play_no = int(pool.play_no[listener]) + 1
+    while bool(pool.play(listener, play_no)[3]) != paused:
+        play_no += 1
+    return play_no
+
+
+def start_play(pool: ListenerPool, listener: int, play_no: int):
+    pool.play_no[listener], pool.started[listener] = play_no, pool.clock()
+
+
+class TestSyntheticCatalog:
+
+    def test_same_seed_same_catalog(self, catalog):
+        assert SyntheticCatalog(size=5000, seed=1).features("syn_42") == catalog.features("syn_42")
+        assert SyntheticCatalog(size=5000, seed=2).features("syn_42") != catalog.features("syn_42")
+
+    def test_tracks_and_features_match(self, catalog):
+        track = catalog.track(7)
+        index = next(index for index in range(catalog.size) if not catalog.has_features[index])
+
+        assert track.id == "syn_7"
+        assert catalog.features(track.id).duration_ms == track.duration_ms
+        assert catalog.features(catalog.track_id(index)) is None
+        assert catalog.features("mock_id_focus") is None
+        assert catalog.features("syn_5000") is None
+
+    def test_feature_shapes(self, catalog):
+        assert 0.2 < (catalog.instrumentalness > 0.5).mean() < 0.4
+        assert 180_000 < catalog.duration_ms.mean() < 240_000
+        assert catalog.popularity[:100].mean() > catalog.popularity[-100:].mean()
+
+
+class TestListenerPool:
+
+    def test_state_is_a_few_bytes_per_listener(self, catalog):
+        pool = ListenerPool(catalog, listeners=10_000, seed=1, clock=VirtualClock())
+
+        state = pool.offset.nbytes + pool.play_no.nbytes + pool.started.nbytes
+        assert state / pool.listeners == 20
+
+    def test_same_seed_same_sessions(self, catalog):
+        def session(seed: int) -> list[str]:
+            clock = VirtualClock()
+            pool = ListenerPool(catalog, listeners=50, seed=seed, clock=clock)
+            played = []
+            for minute in range(60):
+                clock.now = minute * 60.0
+                playback = pool.playback(minute % 50)
+                played.append(f"{playback.item.id}@{playback.progress_ms}" if playback else "-")
+            return played
+
+        assert session(3) == session(3)
+        assert session(3) != session(4)
+
+    def test_tracks_follow_their_duration_into_the_queue(self, catalog):
+        clock = VirtualClock()
+        pool = ListenerPool(catalog, listeners=10, seed=1, pause_rate=0.0, clock=clock)
+        start_play(pool, 0, 0)
+        queue = pool.queue(0, size=2)
+
+        clock.now = 10.0
+        playback = pool.playback(0)
+        assert (playback.item.id, playback.progress_ms, playback.is_playing) == (queue.currently_playing.id, 10000, True)
+
+        clock.now = queue.currently_playing.duration_ms / 1000 + queue.queue[0].duration_ms / 1000 + 1
+        assert pool.playback(0).item.id == queue.queue[1].id
+        assert pool.playback(0).progress_ms == 1000
+
+    def test_skip_starts_the_next_track(self, catalog):
+        clock = VirtualClock()
+        pool = ListenerPool(catalog, listeners=10, seed=1, pause_rate=0.0, clock=clock)
+        upcoming = pool.queue(3, size=1).queue[0]
+
+        clock.now = 5.0
+        pool.skip(3)
+
+        playback = pool.playback(3)
+        assert (playback.item.id, playback.progress_ms) == (upcoming.id, 0)
+
+    def test_pause_freezes_progress_then_resumes(self, catalog):
+        clock = VirtualClock()
+        pool = ListenerPool(catalog, listeners=10, seed=1, pause_rate=0.5, device_change_rate=0.0, clock=clock)
+        start_play(pool, 0, find_play(pool, 0, paused=True))
+        _, _, pause_at, pause_length, _ = pool.play(0, int(pool.play_no[0]))
+
+        clock.now = pause_at + pause_length / 2
+        paused = pool.playback(0)
+        clock.now = pause_at + pause_length + 1
+        resumed = pool.playback(0)
+
+        assert (paused.is_playing, paused.progress_ms) == (False, int(pause_at * 1000))
+        assert resumed.is_playing and resumed.progress_ms == pytest.approx(pause_at * 1000 + 1000, abs=1)
+        assert resumed.item.id == paused.item.id
+
+    def test_device_hand_off_reports_nothing_playing(self, catalog):
+        clock = VirtualClock()
+        pool = ListenerPool(catalog, listeners=10, seed=1, pause_rate=0.5, device_change_rate=1.0, clock=clock)
+        start_play(pool, 0, find_play(pool, 0, paused=True))
+        _, _, pause_at, pause_length, _ = pool.play(0, int(pool.play_no[0]))
+
+        clock.now = pause_at + pause_length / 2
+        assert pool.playback(0) is None
+
+
+@pytest.mark.asyncio
+class TestSyntheticSpotify:
+
+    async def test_faults_surface_like_the_prod_client(self, catalog):
+        faults = FaultInjector(rate_429=1.0, retry_after=7)
+        spotify = MockSpotifyService(ListenerPool(catalog, listeners=1, seed=1).listener(0), faults=faults)
+
+        with pytest.raises(httpx.HTTPStatusError) as error:
+            await spotify.get_current_playback()
+
+        assert error.value.response.status_code == 429
+        assert error.value.response.headers["Retry-After"] == "7"
+        faults.rate_429, faults.rate_401 = 0.0, 1.0
+        with pytest.raises(httpx.HTTPStatusError, match="401"):
+            await spotify.skip_next()
+        assert faults.injected == {429: 1, 401: 1}
+
+    async def test_engine_runs_listeners_on_virtual_time(self, catalog):
+        clock = VirtualClock()
+        pool = ListenerPool(catalog, listeners=20, seed=1, clock=clock)
+        faults = FaultInjector(rate_429=0.05, rate_401=0.01, seed=1)
+        engines = [
+            SyncStreamEngine(spotify=MockSpotifyService(pool.listener(listener), latency=0.2, faults=faults,
+                                                        sleep=clock.sleep),
+                             strategy_manager=AsyncMock(), poll_interval=5, strategy_resolver=StaticResolver(),
+                             clock=clock, sleep=clock.sleep)
+            for listener in range(pool.listeners)
+        ]
+
+        await clock.run([engine.run() for engine in engines], until=1800)
+
+        assert clock() == 1800
+        assert sum(engine.skip_stats.rejected for engine in engines) > 0
+        assert faults.injected[429] > 0
+        assert pool.play_no.sum() > pool.listeners * 1800 / 240